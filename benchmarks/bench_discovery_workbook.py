@@ -0,0 +1,89 @@
+"""
+Benchmark: streaming discovery-workbook ingestion
+
+Generates a synthetic discovery questionnaire with N rows and measures wall time and
+peak Python memory for iter_discovery_rows (the streaming reader on its own),
+read_discovery_workbook (which also holds the answered questions it returns) and a full
+in-memory openpyxl load of the same workbook. The reader's own footprint only grows with
+the workbook's shared-string table, not with the number of rows held in memory.
+
+Usage:
+    python -m benchmarks.bench_discovery_workbook --rows 10000 50000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from openpyxl import Workbook, load_workbook
+
+from src.processors.discovery_workbook import iter_discovery_rows, read_discovery_workbook
+
+
+CATEGORIES = ["Site Architecture", "Performance", "Acquisition/Retention", "Governance", "QA"]
+
+
+def make_workbook(path: str, rows: int) -> None:
+    """Write a questionnaire laid out like the Adobe discovery template"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Kickoff Questionnaire")
+    sheet.append([None, "Adobe Analytics Project Discovery (v1.0)"])
+    sheet.append([None, "Company Name", "Benchmark Corp", None, "Consultant(s)", "A. Consultant"])
+    sheet.append([None, "ID", "Type", "Question", "Feedback"])
+    for i in range(1, rows + 1):
+        sheet.append([
+            None, i, CATEGORIES[i % len(CATEGORIES)],
+            f"Question {i}: which tracking requirement applies to feature {i}?",
+            f"Answer {i}: feature {i} is tracked on web and app" if i % 3 else None,
+        ])
+    workbook.save(path)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def stream_only(path: str) -> int:
+    return sum(1 for _ in iter_discovery_rows(path))
+
+
+def full_load(path: str) -> int:
+    """Baseline: load the whole workbook into memory, then walk it"""
+    workbook = load_workbook(path)
+    count = sum(1 for _ in workbook.active.iter_rows(values_only=True))
+    workbook.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark discovery workbook ingestion")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'reader s':>9} {'reader MB':>10} {'to dict s':>10} {'to dict MB':>11} "
+          f"{'full s':>8} {'full MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"discovery_{rows}.xlsx")
+            make_workbook(path, rows)
+
+            _, reader_s, reader_mb = measure(stream_only, path)
+            discovery, dict_s, dict_mb = measure(read_discovery_workbook, path)
+            _, full_s, full_mb = measure(full_load, path)
+
+            answered = sum(len(v) for v in discovery["questionnaire"].values())
+            assert answered == rows - rows // 3
+            print(f"{rows:>8} {reader_s:>9.2f} {reader_mb:>10.1f} {dict_s:>10.2f} {dict_mb:>11.1f} "
+                  f"{full_s:>8.2f} {full_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: reference retrieval latency
+
+Builds the document index over base-docs in a temporary directory, then times
+DocumentIndex.search for step-sized queries (the first RETRIEVAL_QUERY_CHARS characters
+of a step input, as the workflow sends them) and reports p50/p95/max latency and the
+tokens the retrieved chunks add to a prompt, next to the tokens of the whole corpus.
+
+Usage:
+    python -m benchmarks.bench_doc_index --k 4 --queries 200
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+import warnings
+
+from src.core.context import count_tokens
+from src.core.doc_index import BASE_DOCS, DocumentIndex
+from src.prompts.brd_sdr_prompts import BRD_SDR_SECTIONS
+from src.workflows.brd_sdr_workflow import RETRIEVAL_QUERY_CHARS
+
+
+QUERIES = [
+    "Go-live checklist: verify page view beacons, report suite IDs and data layer values",
+    "eVar allocation for login status, customer segment and account type in banking",
+    "Web SDK sendEvent with XDM web.webPageDetails and identityMap ECID",
+    "Mobile Edge SDK eKYC onboarding funnel tracking",
+] + [f"{title}\n{instructions}" for title, instructions in BRD_SDR_SECTIONS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reference retrieval")
+    parser.add_argument("--root", default=BASE_DOCS, help="Reference documents")
+    parser.add_argument("--k", type=int, default=4, help="Chunks per query")
+    parser.add_argument("--queries", type=int, default=200, help="Searches to time")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", module="openpyxl")
+
+    with tempfile.TemporaryDirectory() as path:
+        index = DocumentIndex(path)
+        start = time.perf_counter()
+        stats = index.build(args.root)
+        build_s = time.perf_counter() - start
+
+        corpus = index.collection.get(include=["documents"])["documents"]
+        corpus_tokens = sum(count_tokens(text) for text in corpus)
+
+        latencies, added = [], []
+        for i in range(args.queries):
+            query = QUERIES[i % len(QUERIES)][:RETRIEVAL_QUERY_CHARS]
+            start = time.perf_counter()
+            context = index.context(query, args.k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            added.append(count_tokens(context))
+
+    latencies.sort()
+    print(f"\nIndexed {stats['chunks']} chunks from {stats['added']} documents "
+          f"in {build_s:.1f}s ({corpus_tokens} tokens in total)")
+    print(f"Search k={args.k}: p50 {statistics.median(latencies):.2f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms, "
+          f"max {latencies[-1]:.2f} ms")
+    print(f"Reference tokens added per prompt: mean {statistics.mean(added):.0f}, "
+          f"max {max(added)} ({max(added) / corpus_tokens:.2%} of the corpus)")
+
+
+if __name__ == "__main__":
+    main()
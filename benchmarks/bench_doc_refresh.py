@@ -0,0 +1,101 @@
+"""
+Benchmark: incremental reference index refresh
+
+Writes a synthetic corpus of N markdown documents (several heading sections each, like
+per-client SDR notes), indexes it from scratch, then edits one section in a given share
+of the documents, deletes a few and adds a few, and times DocumentIndex.refresh against
+a full DocumentIndex.build of the same corpus. Both indexes must hold the same chunks.
+
+Usage:
+    python -m benchmarks.bench_doc_refresh --files 500 2000 --changed 0.01
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from src.core.doc_index import DocumentIndex
+
+
+SECTIONS = ("Overview", "Page Tracking", "eVars", "Props", "Events", "Data Layer")
+
+
+def write_document(path: str, seed: int, edited: str = "") -> None:
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for section in SECTIONS:
+            f.write(f"# {section}\n")
+            for line in range(12):
+                number = rng.randint(1, 250)
+                f.write(f"Client {seed} {section.lower()} row {line}: eVar{number} captures "
+                        f"the {rng.choice(['login', 'search', 'product', 'form'])} value "
+                        f"on page type {rng.randint(1, 40)}\n")
+            if section == "eVars" and edited:
+                f.write(edited + "\n")
+
+
+def quiet(function, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental index refresh")
+    parser.add_argument("--files", type=int, nargs="+", default=[500, 2000],
+                        help="Documents in the corpus")
+    parser.add_argument("--changed", type=float, default=0.01,
+                        help="Share of documents edited between refreshes")
+    args = parser.parse_args()
+
+    print(f"{'files':>6} {'build s':>8} {'noop s':>7} {'refresh s':>10} {'rebuild s':>10} "
+          f"{'embedded':>9} {'deleted':>8} {'speedup':>8}")
+    for files in args.files:
+        with tempfile.TemporaryDirectory() as workdir:
+            root = os.path.join(workdir, "docs")
+            os.makedirs(root)
+            for i in range(files):
+                write_document(os.path.join(root, f"client_{i:05d}.md"), i)
+
+            index = DocumentIndex(os.path.join(workdir, "index"))
+            start = time.perf_counter()
+            quiet(index.build, root)
+            build_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            quiet(index.refresh, root)
+            noop_s = time.perf_counter() - start
+
+            rng = random.Random(files)
+            edits = max(1, int(files * args.changed))
+            for i in rng.sample(range(files), edits):
+                write_document(os.path.join(root, f"client_{i:05d}.md"), i, edited="eVar99 added")
+            for i in range(files, files + edits):
+                write_document(os.path.join(root, f"client_{i:05d}.md"), i)
+            for i in rng.sample(range(files), edits):
+                os.remove(os.path.join(root, f"client_{i:05d}.md"))
+
+            start = time.perf_counter()
+            stats = quiet(index.refresh, root)
+            refresh_s = time.perf_counter() - start
+
+            rebuilt = DocumentIndex(os.path.join(workdir, "rebuilt"))
+            start = time.perf_counter()
+            quiet(rebuilt.build, root)
+            rebuild_s = time.perf_counter() - start
+
+            refreshed = index.collection.get(include=["documents"])
+            expected = rebuilt.collection.get(include=["documents"])
+            assert (dict(zip(refreshed["ids"], refreshed["documents"]))
+                    == dict(zip(expected["ids"], expected["documents"])))
+
+        print(f"{files:>6} {build_s:>8.2f} {noop_s:>7.3f} {refresh_s:>10.3f} {rebuild_s:>10.2f} "
+              f"{stats['chunks_embedded']:>9} {stats['chunks_deleted']:>8} "
+              f"{rebuild_s / refresh_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
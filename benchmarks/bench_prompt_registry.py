@@ -0,0 +1,51 @@
+"""
+Benchmark: compiled prompt templates
+
+For every registered prompt, reports the static tokens (literal text), the cacheable
+prefix (tokens before the first field, identical across calls) and the time to render
+with str.format versus the compiled template, using a synthetic discovery document of
+the given size for every field.
+
+Usage:
+    python -m benchmarks.bench_prompt_registry --field-kb 20
+"""
+
+import argparse
+import time
+
+from src.prompts.registry import PROMPTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled prompt templates")
+    parser.add_argument("--field-kb", type=float, default=20,
+                        help="Size of every field value in KB")
+    parser.add_argument("--renders", type=int, default=2000,
+                        help="Renders per template and method")
+    args = parser.parse_args()
+
+    value = ("Track product views, cart adds and purchases across web and app. "
+             * int(args.field_kb * 1024 / 66 + 1))[:int(args.field_kb * 1024)]
+
+    print(f"{'template':>22} {'static':>7} {'prefix':>7} {'format µs':>10} {'compiled µs':>12}")
+    for name in PROMPTS.names():
+        template = PROMPTS.get(name)
+        fields = dict.fromkeys(template.fields, value)
+        assert template.render(**fields) == template.template.format(**fields)
+
+        start = time.perf_counter()
+        for _ in range(args.renders):
+            template.template.format(**fields)
+        format_us = (time.perf_counter() - start) / args.renders * 1e6
+
+        start = time.perf_counter()
+        for _ in range(args.renders):
+            template.render(**fields)
+        compiled_us = (time.perf_counter() - start) / args.renders * 1e6
+
+        print(f"{name:>22} {template.static_tokens():>7} {template.prefix_tokens():>7} "
+              f"{format_us:>10.1f} {compiled_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: writing large SDRs into the Excel template
+
+Generates synthetic SDR JSON with N records per sheet and measures wall time and peak
+Python memory for write_sdr_to_excel (n8n-cloud/v0.4/json_to_excel.py) against the
+previous per-cell writer, which looked up every cell with ws.cell(row, col), called
+dict.get for each one and stored '' for empty fields. Half the example values and most
+notes are left empty, as in typical generated SDRs. "write s" covers filling the sheets
+only; "total s" includes loading and saving the template.
+
+Usage:
+    python -m benchmarks.bench_sdr_excel_writer --records 1000 5000
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "n8n-cloud" / "v0.4" / "json_to_excel.py"
+TEMPLATE = ROOT / "n8n-cloud" / "v0.4" / "AA_BRD_SDR_Test_01122026.xlsx"
+
+
+def load_converter():
+    spec = importlib.util.spec_from_file_location("json_to_excel", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_sdr(records: int) -> dict:
+    def rows(prefix):
+        return [
+            {
+                "Requirement ID": f"REQ-{i:05d}",
+                "Analytics Variable": f"{prefix}{i}",
+                "Business Name": f"{prefix} {i} name",
+                "Business Description": f"Captures attribute {i} of the visitor journey",
+                "Expected Values": "string",
+                "Implementation Trigger": "page load",
+                "Example Value": f"value {i}" if i % 2 else "",
+                "Additional Notes": "Set on every page" if i % 10 == 0 else "",
+            }
+            for i in range(1, records + 1)
+        ]
+    return {"evars": rows("eVar"), "props": rows("prop"), "events": rows("event")}
+
+
+def legacy_fill(wb, sdr_data, converter) -> None:
+    """The previous writer: one ws.cell() lookup and one dict.get per cell"""
+    for key, names in converter.SDR_SHEETS.items():
+        ws = converter.find_sdr_sheet(wb, names)
+        row = converter.SDR_FIRST_ROW
+        for record in sdr_data.get(key, []):
+            for field, column in converter.SDR_COLUMNS.items():
+                ws.cell(row, column).value = record.get(field, '')
+            row += 1
+
+
+def bulk_fill(wb, sdr_data, converter) -> None:
+    for key, names in converter.SDR_SHEETS.items():
+        converter.write_sdr_rows(converter.find_sdr_sheet(wb, names), sdr_data.get(key, []))
+
+
+def measure(fill, sdr_data, converter, output_file):
+    tracemalloc.start()
+    start = time.perf_counter()
+    wb = load_workbook(TEMPLATE)
+    fill_start = time.perf_counter()
+    fill(wb, sdr_data, converter)
+    write_s = time.perf_counter() - fill_start
+    wb.save(output_file)
+    total_s = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return write_s, total_s, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SDR Excel writing")
+    parser.add_argument("--records", type=int, nargs="+", default=[1000, 5000, 20000],
+                        help="Records per SDR sheet")
+    args = parser.parse_args()
+
+    converter = load_converter()
+
+    print(f"{'records':>8} {'writer':>7} {'write s':>8} {'total s':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for records in args.records:
+            sdr_data = make_sdr(records)
+            for name, fill in (("legacy", legacy_fill), ("bulk", bulk_fill)):
+                output_file = os.path.join(tmp, f"sdr_{name}_{records}.xlsx")
+                write_s, total_s, peak_mb = measure(fill, sdr_data, converter, output_file)
+                print(f"{records:>8} {name:>7} {write_s:>8.2f} {total_s:>8.2f} {peak_mb:>8.1f}")
+
+            # The public entry point must produce the same workbook as the bulk fill
+            output_file = os.path.join(tmp, f"sdr_full_{records}.xlsx")
+            with contextlib.redirect_stdout(io.StringIO()):
+                converter.write_sdr_to_excel(str(TEMPLATE), sdr_data, output_file)
+            ws = converter.find_sdr_sheet(load_workbook(output_file, read_only=True),
+                                          converter.SDR_SHEETS["events"])
+            last = converter.SDR_FIRST_ROW + records - 1
+            assert ws.cell(last, 3).value == f"event{records}"
+
+
+if __name__ == "__main__":
+    main()
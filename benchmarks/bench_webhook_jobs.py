@@ -0,0 +1,76 @@
+"""
+Benchmark: synchronous webhook calls vs. the submit/poll job protocol
+
+Runs conversions against the local webhook stand-in with a processing delay longer
+than the client's request timeout, as happens when n8n is under load. Synchronous
+calls time out and lose the finished work; jobs are submitted at once and polled with
+backoff until the SDR is ready. Reports successes and wall time.
+
+Usage:
+    python -m benchmarks.bench_webhook_jobs --files 8 --delay 6 --timeout 4
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_webhook_upload import SCRIPT_DIR, load_converter, mock_server
+
+
+BRD = str(SCRIPT_DIR / "AA_BRD_SDR_Test_01122026.xlsx")
+
+
+def sync_convert(converter, base, session, timeout):
+    converter.call_n8n_webhook(f"{base}/webhook/brd-sdr-json", "Benchmark", BRD,
+                               upload_mode="binary", session=session, timeout=timeout)
+
+
+def job_convert(converter, base, session, timeout):
+    jobs_url = f"{base}/webhook/brd-sdr-json/jobs"
+    job_id = converter.submit_job(jobs_url, "Benchmark", BRD, upload_mode="binary",
+                                  session=session)
+    converter.wait_for_job(jobs_url, job_id, session=session)
+
+
+def run(converter, base, convert, files, timeout):
+    session = converter.create_session(pool_size=files)
+
+    def attempt(_):
+        try:
+            convert(converter, base, session, timeout)
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), \
+            ThreadPoolExecutor(max_workers=files) as pool:
+        ok = sum(pool.map(attempt, range(files)))
+    elapsed = time.perf_counter() - start
+    session.close()
+    return ok, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync calls vs. submit/poll jobs")
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=6.0,
+                        help="Seconds the stand-in takes per conversion")
+    parser.add_argument("--timeout", type=float, default=4.0,
+                        help="Client request timeout for synchronous calls")
+    args = parser.parse_args()
+
+    converter = load_converter()
+    converter.JOB_POLL_INTERVAL = 0.5
+
+    print(f"{'protocol':>10} {'ok':>6} {'wall s':>7}")
+    with mock_server("--delay", str(args.delay)) as base:
+        for name, convert in (("sync", sync_convert), ("job", job_convert)):
+            ok, elapsed = run(converter, base, convert, args.files, args.timeout)
+            print(f"{name:>10} {f'{ok}/{args.files}':>6} {elapsed:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: connection pooling, retries and --parallel for json_to_excel.py
+
+Sends a batch of BRD workbooks to the local webhook stand-in, which answers after a
+fixed delay and fails a share of calls with HTTP 503. Compares one-shot requests
+(the previous behaviour), a pooled session with jittered retry, and the same session
+shared by parallel workers. Reports successes, TCP connections opened (distinct client
+ports seen by the server), requests sent and wall time.
+
+Usage:
+    python -m benchmarks.bench_webhook_pool --files 24 --parallel 8 --fail-rate 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.bench_webhook_upload import SCRIPT_DIR, load_converter, mock_server
+
+
+BRD = str(SCRIPT_DIR / "AA_BRD_SDR_Test_01122026.xlsx")
+
+
+def convert(converter, webhook, session, retries):
+    try:
+        converter.call_n8n_webhook(webhook, "Benchmark", BRD, upload_mode="binary",
+                                   sheet_name="Requirements", session=session, retries=retries)
+        return True
+    except Exception:
+        return False
+
+
+def run_scenario(converter, base, files, parallel, pooled, retries):
+    webhook = f"{base}/webhook/brd-sdr-json"
+    seen = len(requests.get(f"{base}/stats", timeout=10).json()["requests"])
+    session = converter.create_session(pool_size=parallel) if pooled else None
+
+    start = time.perf_counter()
+    # redirect_stdout swaps sys.stdout globally, so it wraps the workers, not each call
+    with contextlib.redirect_stdout(io.StringIO()), \
+            ThreadPoolExecutor(max_workers=parallel) as pool:
+        outcomes = list(pool.map(lambda _: convert(converter, webhook, session, retries),
+                                 range(files)))
+    elapsed = time.perf_counter() - start
+    if session:
+        session.close()
+
+    served = requests.get(f"{base}/stats", timeout=10).json()["requests"][seen:]
+    return sum(outcomes), len({r["peer"] for r in served}), len(served), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled, retrying webhook calls")
+    parser.add_argument("--files", type=int, default=24)
+    parser.add_argument("--parallel", type=int, default=8)
+    parser.add_argument("--fail-rate", type=float, default=0.2)
+    parser.add_argument("--delay", type=float, default=0.2,
+                        help="Seconds the stand-in takes per conversion")
+    args = parser.parse_args()
+
+    converter = load_converter()
+    converter.RETRY_BACKOFF = 0.1  # keep the benchmark short; production default is 2s
+
+    scenarios = [
+        ("one-shot", 1, False, 0),
+        ("pooled+retry", 1, True, converter.DEFAULT_RETRIES),
+        (f"pooled+retry x{args.parallel}", args.parallel, True, converter.DEFAULT_RETRIES),
+    ]
+
+    print(f"{'scenario':>20} {'ok':>6} {'conns':>6} {'requests':>9} {'wall s':>7}")
+    with mock_server("--delay", str(args.delay), "--fail-rate", str(args.fail_rate),
+                     "--seed", "7") as base:
+        for name, parallel, pooled, retries in scenarios:
+            ok, connections, sent, elapsed = run_scenario(
+                converter, base, args.files, parallel, pooled, retries
+            )
+            print(f"{name:>20} {f'{ok}/{args.files}':>6} {connections:>6} {sent:>9} "
+                  f"{elapsed:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: workbook upload modes of json_to_excel.py
+
+Builds synthetic BRD workbooks of a given size, starts the local webhook stand-in
+(n8n-cloud/v0.4/mock_n8n_server.py) in a subprocess and uploads the workbook with
+every upload mode, with and without the originalFileBase64 echo. Reports the client's
+peak Python memory during the call and the request/response bytes seen by the server.
+
+Usage:
+    python -m benchmarks.bench_webhook_upload --size-mb 5 25
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+import requests
+from openpyxl import Workbook
+
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT_DIR = ROOT / "n8n-cloud" / "v0.4"
+
+# Requirements per synthetic BRD (the test BRD has 69)
+REQUIREMENTS = 70
+
+
+def load_converter():
+    spec = importlib.util.spec_from_file_location("json_to_excel", SCRIPT_DIR / "json_to_excel.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_brd(path: str, size_mb: float) -> None:
+    """
+    Requirements sheet laid out like the BRD template, plus an appendix sheet of
+    hard-to-compress reference data that pads the workbook to roughly size_mb
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Requirements")
+    sheet.append([None, "Business Requirements"])
+    sheet.append([])
+    sheet.append([None, "Requirement ID", "Category", "Business Requirement", "Additional Notes"])
+    for i in range(1, REQUIREMENTS + 1):
+        sheet.append([None, f"REQ-{i:03d}", f"Category {i % 12}",
+                      f"Track interaction {i} across web and app", ""])
+
+    appendix = workbook.create_sheet("Appendix")
+    for _ in range(int(size_mb * 4300)):
+        appendix.append([uuid.uuid4().hex for _ in range(10)])
+    workbook.save(path)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def mock_server(*options):
+    """Run mock_n8n_server.py (with extra CLI options) in a subprocess; yields its base URL"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, str(SCRIPT_DIR / "mock_n8n_server.py"), "--port", str(port), *options],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(50):
+            try:
+                requests.get(f"{base}/stats", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        yield base
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark webhook upload modes")
+    parser.add_argument("--size-mb", type=float, nargs="+", default=[5, 25],
+                        help="Approximate BRD workbook sizes to upload")
+    args = parser.parse_args()
+
+    converter = load_converter()
+
+    print(f"{'file MB':>8} {'mode':>10} {'echo':>5} {'sent MB':>8} "
+          f"{'recv MB':>8} {'client MB':>10} {'s':>6}")
+    with mock_server() as base, tempfile.TemporaryDirectory() as tmp:
+        webhook = f"{base}/webhook/brd-sdr-json"
+        for size_mb in args.size_mb:
+            path = os.path.join(tmp, f"brd_{size_mb:g}mb.xlsx")
+            make_brd(path, size_mb)
+            file_mb = os.path.getsize(path) / (1024 * 1024)
+
+            for mode in converter.UPLOAD_MODES:
+                for include_original in (True, False):
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        result = converter.call_n8n_webhook(
+                            webhook, "Benchmark", path, upload_mode=mode,
+                            sheet_name="Requirements", include_original=include_original,
+                        )
+                    elapsed = time.perf_counter() - start
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                    assert result["stats"]["evars"] == REQUIREMENTS
+                    served = requests.get(f"{base}/stats", timeout=10).json()["requests"][-1]
+                    print(f"{file_mb:>8.1f} {mode:>10} {str(include_original):>5} "
+                          f"{served['bytes_in'] / 2**20:>8.1f} {served['bytes_out'] / 2**20:>8.1f} "
+                          f"{peak / 2**20:>10.1f} {elapsed:>6.2f}")
+                    del result
+
+
+if __name__ == "__main__":
+    main()
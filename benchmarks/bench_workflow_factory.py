@@ -0,0 +1,51 @@
+"""
+Benchmark: per-request workflow setup
+
+Compares building a BRDSDRWorkflow per request (two LangGraph graphs compiled each
+time, as run_sample.py and the batch runner used to) with taking the shared instance
+from get_workflow() and passing per-run overrides. Requests run on a thread pool; no
+model is called, only the setup cost is timed.
+
+Usage:
+    python -m benchmarks.bench_workflow_factory --requests 200 --threads 8
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.workflows.brd_sdr_workflow import BRDSDRWorkflow
+from src.workflows.factory import clear_workflows, get_workflow
+
+
+API_KEY = "sk-benchmark"  # never sent; nothing is invoked
+
+
+def per_request(_):
+    workflow = BRDSDRWorkflow(api_key=API_KEY)
+    return workflow._start_run(None, {"temperature": 0.1})
+
+
+def shared(_):
+    workflow = get_workflow(api_key=API_KEY)
+    return workflow._start_run(None, {"temperature": 0.1})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request workflow setup")
+    parser.add_argument("--requests", type=int, default=200, help="Requests to set up")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent requests")
+    args = parser.parse_args()
+
+    clear_workflows()
+    print(f"{'setup':>12} {'total s':>8} {'per request ms':>15}")
+    for label, function in (("per request", per_request), ("shared", shared)):
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            start = time.perf_counter()
+            list(executor.map(function, range(args.requests)))
+            total = time.perf_counter() - start
+        print(f"{label:>12} {total:>8.3f} {total / args.requests * 1000:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
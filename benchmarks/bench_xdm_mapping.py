@@ -0,0 +1,102 @@
+"""
+Benchmark: mapping SDR tables to data layer keys and XDM paths
+
+Builds SDRs with N eVar rows (a third of them covered by
+n8n-cloud/v0.6/xdm_mapping.csv) and compares XDMMapping.map_sdr, which joins the whole
+sheet against the indexed mapping, with a per-row loop that scans the CSV rows for
+every SDR row. Pattern lookups (prefix and wildcard) are timed separately.
+
+Usage:
+    python -m benchmarks.bench_xdm_mapping --rows 10000 50000
+"""
+
+import argparse
+import csv
+import time
+
+from src.processors.xdm_mapping import XDM_MAPPING_CSV, XDMMapping
+
+
+PATTERNS = ["web.webPageDetails.*", "product.*", "*.name", "**.currencyCode", "data-aa-*"]
+
+
+def make_sdr(rows: int) -> dict:
+    variables = ["eVar9", "eVar10", "eVar 20", "merchandising eVar21", "evar22", "eVar11"]
+    return {
+        "evars": [
+            {"Requirement ID": f"REQ-{i:05d}",
+             "Analytics Variable": (variables[i % 18] if i % 18 < len(variables)
+                                    else f"eVar{i % 250 + 1}"),
+             "Business Name": f"attribute {i}"}
+            for i in range(rows)
+        ],
+        "props": [],
+        "events": [],
+    }
+
+
+def naive_map(sdr: dict, csv_rows: list) -> dict:
+    """Per-row scan of the CSV for the variable, then for the XDM paths of its keys"""
+    mapped = {}
+    for sheet, rows in sdr.items():
+        result = []
+        for row in rows:
+            variable = row["Analytics Variable"].replace(" ", "").lower()
+            keys = []
+            for mapping in csv_rows:
+                target = mapping["XDM Variable (Target)"].lower()
+                target = target.replace("merchandising", "").strip()
+                if target == variable and mapping["Variable Name (Key)"] not in keys:
+                    keys.append(mapping["Variable Name (Key)"])
+            paths = []
+            for mapping in csv_rows:
+                target = mapping["XDM Variable (Target)"]
+                if (mapping["Variable Name (Key)"] in keys and target.startswith("xdm.")
+                        and target not in paths):
+                    paths.append(target)
+            result.append(dict(row, **{"Data Layer Key": "; ".join(keys),
+                                       "XDM Path": "; ".join(paths)}))
+        mapped[sheet] = result
+    return mapped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XDM mapping of SDR tables")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000],
+                        help="SDR rows to map")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    mapping = XDMMapping.from_csv()
+    load_s = time.perf_counter() - start
+    with open(XDM_MAPPING_CSV, newline="", encoding="utf-8") as f:
+        csv_rows = list(csv.DictReader(f))
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        for pattern in PATTERNS:
+            mapping.keys(pattern)
+    lookup_us = (time.perf_counter() - start) / (1000 * len(PATTERNS)) * 1e6
+    print(f"load {load_s * 1000:.1f} ms, pattern lookup {lookup_us:.1f} µs")
+
+    print(f"{'rows':>7} {'naive s':>8} {'vector s':>9} {'speedup':>8}")
+    for rows in args.rows:
+        sdr = make_sdr(rows)
+
+        start = time.perf_counter()
+        naive = naive_map(sdr, csv_rows)
+        naive_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mapped = mapping.map_sdr(sdr)
+        vector_s = time.perf_counter() - start
+
+        for expected, actual in zip(naive["evars"], mapped["evars"]):
+            assert expected["Data Layer Key"] == actual["Data Layer Key"], (expected, actual)
+            assert expected["XDM Path"] == actual["XDM Path"], (expected, actual)
+
+        print(f"{rows:>7} {naive_s:>8.3f} {vector_s:>9.3f} {naive_s / vector_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Script to build or refresh the reference document index used for retrieval in the workflows
+
+Usage:
+    python build_doc_index.py
+    python build_doc_index.py --rebuild
+    python build_doc_index.py --root base-docs --index .cache/doc_index --query "go-live checklist"
+"""
+
+import argparse
+import time
+import warnings
+
+from src.core.doc_index import BASE_DOCS, DOC_INDEX_PATH, DocumentIndex
+
+
+def main():
+    """Chunk and embed new or changed reference documents into a local chromadb index"""
+    parser = argparse.ArgumentParser(
+        description="Build the local reference document index (offline embeddings)"
+    )
+    parser.add_argument("--root", "-r", default=BASE_DOCS,
+                        help=f"Directory of reference documents (default: {BASE_DOCS})")
+    parser.add_argument("--index", "-i", default=DOC_INDEX_PATH,
+                        help=f"Index directory (default: {DOC_INDEX_PATH})")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Re-embed every document instead of only the changed ones")
+    parser.add_argument("--query", "-q", default=None,
+                        help="Search the index after building it")
+    parser.add_argument("--k", type=int, default=4, help="Results for --query (default: 4)")
+    args = parser.parse_args()
+
+    # openpyxl warns about workbook extensions it drops; they hold no text
+    warnings.filterwarnings("ignore", module="openpyxl")
+
+    print("=" * 80)
+    print("Adobe Tagging AI - Reference Document Index")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    index = DocumentIndex(args.index)
+    stats = index.build(args.root) if args.rebuild else index.refresh(args.root)
+    print(f"\n✅ Documents: {stats['added']} added, {stats['changed']} changed, "
+          f"{stats['unchanged']} unchanged, {stats['removed']} removed "
+          f"({time.perf_counter() - start:.1f}s)")
+    print(f"🧩 Chunks: {stats['chunks_embedded']} embedded, {stats['chunks_deleted']} deleted, "
+          f"{stats['chunks']} in {args.index}")
+    print(f"💡 Set DOC_INDEX_PATH={args.index} to use it in BRDSDRWorkflow")
+
+    if args.query:
+        start = time.perf_counter()
+        hits = index.search(args.query, args.k)
+        print(f"\n🔎 '{args.query}' ({(time.perf_counter() - start) * 1000:.1f} ms)")
+        for hit in hits:
+            print(f"  {hit['distance']:.3f}  {hit['source']} › {hit['section']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Checks for json_to_excel.py's --async-job mode against the local webhook stand-in
+
+Starts a MockN8nServer in this process and exercises submit/poll, the poll-timeout
+path and resuming a submitted job with --job-id. No n8n instance or AI call is needed.
+Exits non-zero if a check fails.
+
+Usage:
+    python3 check_job_mode.py
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+import json_to_excel
+from mock_n8n_server import MockN8nServer
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BRD = str(SCRIPT_DIR / 'AA_BRD_SDR_Test_01122026.xlsx')
+
+
+@contextlib.contextmanager
+def mock_server(delay=0.0):
+    server = MockN8nServer(('127.0.0.1', 0), delay=delay).start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def posts(server):
+    return [request for request in server.requests if request['status'] == 202]
+
+
+def check_submit_and_poll():
+    """A submitted job is polled until done and returns the webhook result"""
+    with mock_server(delay=0.3) as server:
+        jobs_url = f"{server.url}/jobs"
+        job_id = json_to_excel.submit_job(jobs_url, 'Check', BRD, upload_mode='binary')
+        result = json_to_excel.wait_for_job(jobs_url, job_id, job_timeout=10)
+
+        assert result['success'], result
+        assert result['stats']['evars'] == len(result['sdr']['evars']) > 0, result['stats']
+        assert 'originalFileBase64' not in result
+        assert len(posts(server)) == 1, server.requests
+
+
+def check_poll_timeout():
+    """Polling gives up after --job-timeout and names the job id to resume with"""
+    with mock_server(delay=5) as server:
+        jobs_url = f"{server.url}/jobs"
+        job_id = json_to_excel.submit_job(jobs_url, 'Check', BRD, upload_mode='binary')
+        try:
+            json_to_excel.wait_for_job(jobs_url, job_id, job_timeout=0.5)
+        except TimeoutError as e:
+            assert f"--job-id {job_id}" in str(e), e
+        else:
+            raise AssertionError("wait_for_job did not time out")
+        assert server.job_status(job_id)['status'] in ('queued', 'running')
+
+
+def check_job_id_resume():
+    """--job-id picks up an already submitted job without uploading again"""
+    with mock_server(delay=0.5) as server, tempfile.TemporaryDirectory() as out_dir:
+        jobs_url = f"{server.url}/jobs"
+        job_id = json_to_excel.submit_job(jobs_url, 'Check', BRD, upload_mode='binary')
+        output = str(Path(out_dir) / 'sdr.xlsx')
+
+        argv = sys.argv
+        sys.argv = ['json_to_excel.py', '-i', BRD, '-c', 'Check', '-o', output,
+                    '-w', server.url, '--job-id', job_id]
+        try:
+            assert json_to_excel.main() == 0
+        finally:
+            sys.argv = argv
+
+        assert Path(output).exists()
+        assert len(posts(server)) == 1, server.requests
+
+
+CHECKS = (check_submit_and_poll, check_poll_timeout, check_job_id_resume)
+
+
+def main():
+    json_to_excel.JOB_POLL_INTERVAL = 0.1
+    json_to_excel.JOB_MAX_POLL_INTERVAL = 0.2
+
+    failures = 0
+    for check in CHECKS:
+        log = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(log):
+                check()
+            print(f"✅ {check.__name__}")
+        except Exception:
+            failures += 1
+            print(f"❌ {check.__name__}")
+            print(log.getvalue())
+            traceback.print_exc()
+
+    print(f"\n{len(CHECKS) - failures}/{len(CHECKS)} checks passed")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,17 +10,27 @@ This script:
 
 Usage:
     python3 json_to_excel.py --input AA_BRD_SDR_Test_01122026.xlsx --client "eCommerce Client A"
+    python3 json_to_excel.py -i AA_BRD_SDR_Test_01122026.xlsx -c "Client A" --upload-mode multipart
+    python3 json_to_excel.py -i brds/*.xlsx -c "Client A" -o sdr_out/ --parallel 4
+    python3 json_to_excel.py -i AA_BRD_SDR_Test_01122026.xlsx -c "Client A" --async-job
+    python3 json_to_excel.py -i AA_BRD_SDR_Test_01122026.xlsx -c "Client A" --engine local
 """
 
 import argparse
 import base64
 import json
+import random
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 
 try:
     import requests
+    import urllib3
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print("❌ Error: 'requests' module not found")
     print("Install: pip3 install requests")
@@ -34,6 +44,32 @@ except ImportError:
     sys.exit(1)
 
 
+UPLOAD_MODES = ('base64', 'multipart', 'binary')
+
+# n8n: the webhook converts; local: SDRWorkflow (src/workflows) runs in this process
+ENGINES = ('n8n', 'local')
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Responses worth retrying: rate limiting and gateway/availability errors
+RETRY_STATUSES = {429, 502, 503, 504}
+# For non-idempotent requests (conversion POSTs) only the statuses that mean the server
+# did not start the work; a 502/504 may hide a conversion that is still running
+SAFE_RETRY_STATUSES = {429, 503}
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF = 2.0  # seconds, doubled per attempt
+RETRY_MAX_BACKOFF = 30.0
+
+# Submit/poll job protocol: POST <jobs-url> -> {"jobId"}, GET <jobs-url>/<jobId> ->
+# {"status": "queued" | "running" | "done" | "failed", "result": {...}, "error": "..."}
+JOB_REQUEST_TIMEOUT = 30
+JOB_POLL_INTERVAL = 2.0  # seconds, multiplied by JOB_POLL_BACKOFF after every poll
+JOB_POLL_BACKOFF = 1.5
+JOB_MAX_POLL_INTERVAL = 15.0
+DEFAULT_JOB_TIMEOUT = 900
+
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
 def read_and_encode_file(file_path):
     """Read Excel file and encode to base64"""
     print(f"📂 Reading file: {file_path}")
@@ -53,23 +89,147 @@ def read_and_encode_file(file_path):
     return base64_data
 
 
-def call_n8n_webhook(webhook_url, client_name, file_base64):
+@contextmanager
+def upload_request(file_path, client_name, upload_mode='base64', sheet_name=None,
+                   include_original=False):
+    """
+    Yield the requests.post keyword arguments that upload file_path
+
+    Upload modes:
+        base64:    JSON body with the workbook base64-encoded in fileData (the original
+                   protocol; the whole file is held in memory ~3 times over)
+        multipart: multipart/form-data with the workbook as the "file" field
+        binary:    the workbook streamed from disk as the raw request body, with the other
+                   fields in the query string
+
+    include_original=False asks the webhook not to echo the workbook back as
+    originalFileBase64.
+    """
+    if upload_mode not in UPLOAD_MODES:
+        raise ValueError(f"Unknown upload mode '{upload_mode}' (expected one of {UPLOAD_MODES})")
+
+    fields = {'clientName': client_name}
+    if sheet_name:
+        fields['baseSheetName'] = sheet_name
+    if not include_original:
+        fields['includeOriginal'] = 'false'
+
+    if upload_mode == 'base64':
+        payload = dict(fields, fileData=read_and_encode_file(file_path))
+        if not include_original:
+            payload['includeOriginal'] = False
+        yield {'json': payload}
+        return
+
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    print(f"📂 Uploading file: {file_path} ({path.stat().st_size / 1024:.1f} KB, {upload_mode})")
+
+    with open(path, 'rb') as f:
+        if upload_mode == 'multipart':
+            yield {'data': fields, 'files': {'file': (path.name, f, XLSX_MIME)}}
+        else:
+            yield {'data': f, 'params': fields, 'headers': {'Content-Type': XLSX_MIME}}
+
+
+def create_session(pool_size=10):
+    """Session with a keep-alive connection pool shared by every webhook call"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def retry_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, never shorter than a numeric Retry-After header"""
+    delay = random.uniform(0, min(RETRY_MAX_BACKOFF, RETRY_BACKOFF * 2 ** attempt))
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, float(retry_after))
+    return delay
+
+
+def connect_failed(error):
+    """True if a request failed before a connection was made, so nothing was sent"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def request_with_retry(http, method, url, retries=DEFAULT_RETRIES, timeout=120,
+                       open_request=None, idempotent=True):
+    """
+    Send a request, retrying connection failures and 429/502/503/504 responses
+
+    Retries use jittered exponential backoff. open_request, if given, is a callable
+    returning a context manager that yields the request keyword arguments; it is
+    re-entered for every attempt so upload files are re-opened. Read timeouts are not
+    retried, since the server may still be working on the request.
+
+    With idempotent=False (conversion uploads, which start paid AI work) only failures
+    that prove the server never took the request are retried: connect-phase errors and
+    429/503 responses. A connection dropped after the body was sent, or a 502/504 from
+    a gateway, is returned or raised as is.
+    """
+    statuses = RETRY_STATUSES if idempotent else SAFE_RETRY_STATUSES
+    for attempt in range(retries + 1):
+        try:
+            if open_request is None:
+                response = http.request(method, url, timeout=timeout)
+            else:
+                with open_request() as request_kwargs:
+                    response = http.request(method, url, timeout=timeout, **request_kwargs)
+        except requests.exceptions.ConnectionError as e:
+            if attempt == retries or not (idempotent or connect_failed(e)):
+                raise
+            delay = retry_delay(attempt)
+            print(f"⚠️  Connection failed ({type(e).__name__}), "
+                  f"retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            time.sleep(delay)
+            continue
+
+        if response.status_code in statuses and attempt < retries:
+            delay = retry_delay(attempt, response.headers.get('Retry-After'))
+            print(f"⚠️  HTTP {response.status_code}, "
+                  f"retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            time.sleep(delay)
+            continue
+        return response
+
+
+def parse_webhook_result(result, include_original=False):
+    """Unwrap and check the SDR result returned by the webhook or a finished job"""
+    if isinstance(result, list) and len(result) == 1:  # respondToWebhook wraps items
+        result = result[0]
+
+    if not result.get('success'):
+        raise Exception(f"Webhook returned success=false: {result}")
+
+    if not include_original:
+        result.pop('originalFileBase64', None)  # older workflows echo it regardless
+
+    print(f"✅ Webhook call successful")
+    print(f"📊 Stats: {result.get('stats', {})}")
+
+    return result
+
+
+def call_n8n_webhook(webhook_url, client_name, input_file, upload_mode='base64',
+                     sheet_name=None, include_original=False, session=None,
+                     retries=DEFAULT_RETRIES, timeout=120):
     """Call n8n webhook and get SDR JSON response"""
     print(f"\n🌐 Calling n8n webhook...")
     print(f"   URL: {webhook_url}")
     print(f"   Client: {client_name}")
 
-    payload = {
-        "clientName": client_name,
-        "fileData": file_base64
-    }
-
     try:
-        response = requests.post(
-            webhook_url,
-            json=payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=120  # 2 minutes timeout for AI processing
+        response = request_with_retry(
+            session or requests, 'POST', webhook_url, retries=retries, timeout=timeout,
+            open_request=lambda: upload_request(input_file, client_name, upload_mode,
+                                                sheet_name, include_original),
+            idempotent=False,
         )
 
         print(f"📥 Response status: {response.status_code}")
@@ -78,18 +238,10 @@ def call_n8n_webhook(webhook_url, client_name, file_base64):
             print(f"❌ Error response: {response.text}")
             raise Exception(f"HTTP {response.status_code}: {response.text}")
 
-        result = response.json()
-
-        if not result.get('success'):
-            raise Exception(f"Webhook returned success=false: {result}")
-
-        print(f"✅ Webhook call successful")
-        print(f"📊 Stats: {result.get('stats', {})}")
-
-        return result
+        return parse_webhook_result(response.json(), include_original)
 
     except requests.exceptions.Timeout:
-        print("❌ Request timeout (120 seconds)")
+        print(f"❌ Request timeout ({timeout} seconds)")
         print("   The AI processing might be taking longer than expected.")
         raise
     except requests.exceptions.RequestException as e:
@@ -97,6 +249,130 @@ def call_n8n_webhook(webhook_url, client_name, file_base64):
         raise
 
 
+def submit_job(jobs_url, client_name, input_file, upload_mode='base64', sheet_name=None,
+               include_original=False, session=None, retries=DEFAULT_RETRIES):
+    """
+    Upload a BRD workbook as a conversion job; returns the job id without waiting
+
+    The submit is only retried when the server never took it (see request_with_retry),
+    so a lost response cannot leave a duplicate job running.
+    """
+    print(f"\n🌐 Submitting conversion job...")
+    print(f"   URL: {jobs_url}")
+    print(f"   Client: {client_name}")
+
+    response = request_with_retry(
+        session or requests, 'POST', jobs_url, retries=retries, timeout=JOB_REQUEST_TIMEOUT,
+        open_request=lambda: upload_request(input_file, client_name, upload_mode,
+                                            sheet_name, include_original),
+        idempotent=False,
+    )
+    if response.status_code not in (200, 202):
+        raise Exception(f"HTTP {response.status_code}: {response.text}")
+
+    job_id = response.json()['jobId']
+    print(f"✅ Job submitted: {job_id}")
+    return job_id
+
+
+def wait_for_job(jobs_url, job_id, include_original=False, session=None,
+                 retries=DEFAULT_RETRIES, job_timeout=DEFAULT_JOB_TIMEOUT):
+    """
+    Poll GET <jobs_url>/<job_id> until the job is done, backing off between polls
+
+    The server keeps working if this gives up; the job can be picked up again later
+    with --job-id.
+    """
+    status_url = f"{jobs_url.rstrip('/')}/{job_id}"
+    deadline = time.monotonic() + job_timeout
+    interval = JOB_POLL_INTERVAL
+    http = session or requests
+
+    while True:
+        response = request_with_retry(http, 'GET', status_url, retries=retries,
+                                      timeout=JOB_REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}: {response.text}")
+
+        job = response.json()
+        status = job.get('status')
+        if status == 'done':
+            print(f"📥 Job {job_id} done")
+            return parse_webhook_result(job['result'], include_original)
+        if status == 'failed':
+            raise Exception(f"Job {job_id} failed: {job.get('error')}")
+
+        retry_after = response.headers.get('Retry-After')
+        wait = float(retry_after) if retry_after and retry_after.isdigit() else interval
+        if time.monotonic() + wait > deadline:
+            raise TimeoutError(f"Job {job_id} still {status} after {job_timeout:.0f}s; "
+                               f"resume with --job-id {job_id}")
+        print(f"   ⏳ Job {job_id} {status}, checking again in {wait:.1f}s")
+        time.sleep(wait)
+        interval = min(interval * JOB_POLL_BACKOFF, JOB_MAX_POLL_INTERVAL)
+
+
+# SDR JSON field -> Excel column, shared by every SDR sheet
+SDR_COLUMNS = {
+    'Requirement ID': 2,
+    'Analytics Variable': 3,
+    'Business Name': 4,
+    'Business Description': 5,
+    'Expected Values': 6,
+    'Implementation Trigger': 7,
+    'Example Value': 8,
+    'Additional Notes': 9,
+}
+
+# First data row below the sheet header
+SDR_FIRST_ROW = 7
+
+# SDR JSON key -> accepted sheet names (first one is used in messages)
+SDR_SHEETS = {
+    'evars': ('eVars',),
+    'props': ('Props',),
+    'events': ('Events', 'Custom Events (Metrics)'),
+}
+
+
+def find_sdr_sheet(wb, names):
+    """Return the worksheet matching one of names (case-insensitive), or None"""
+    by_name = {sheet_name.lower(): sheet_name for sheet_name in wb.sheetnames}
+    for name in names:
+        if name.lower() in by_name:
+            return wb[by_name[name.lower()]]
+    return None
+
+
+def write_sdr_rows(ws, records, columns=SDR_COLUMNS, first_row=SDR_FIRST_ROW):
+    """
+    Write SDR records to a worksheet as one block of rows
+
+    The target range is fetched once with iter_rows and filled row by row, instead of
+    looking up every cell with ws.cell(). Missing fields and empty strings clear the cell
+    rather than storing an empty string, so they are not serialized when the workbook is
+    saved; other falsy values such as 0 and False are written as-is.
+    Columns between the mapped ones are left as-is.
+    """
+    if not records:
+        return 0
+
+    min_col, max_col = min(columns.values()), max(columns.values())
+    fields = [None] * (max_col - min_col + 1)
+    for field, column in columns.items():
+        fields[column - min_col] = field
+    offsets = [(offset, field) for offset, field in enumerate(fields) if field is not None]
+
+    block = ws.iter_rows(min_row=first_row, max_row=first_row + len(records) - 1,
+                         min_col=min_col, max_col=max_col)
+    for record, cells in zip(records, block):
+        for offset, field in offsets:
+            value = record.get(field)
+            cells[offset].value = None if value in (None, '') else value
+
+    return len(records)
+
+
 def write_sdr_to_excel(input_file, sdr_data, output_file):
     """Write SDR data to Excel file"""
     print(f"\n📝 Writing SDR data to Excel...")
@@ -107,67 +383,178 @@ def write_sdr_to_excel(input_file, sdr_data, output_file):
     wb = load_workbook(input_file)
 
     # Check required sheets exist
-    required_sheets = ['eVars', 'Props', 'Events']
-    for sheet_name in required_sheets:
-        if sheet_name not in wb.sheetnames:
-            raise ValueError(f"Required sheet '{sheet_name}' not found in Excel file")
-
-    # Write eVars
-    print("   Writing eVars...")
-    ws_evars = wb['eVars']
-    row = 7  # Start from row 7
-    for evar in sdr_data.get('evars', []):
-        ws_evars.cell(row, 2).value = evar.get('Requirement ID', '')
-        ws_evars.cell(row, 3).value = evar.get('Analytics Variable', '')
-        ws_evars.cell(row, 4).value = evar.get('Business Name', '')
-        ws_evars.cell(row, 5).value = evar.get('Business Description', '')
-        ws_evars.cell(row, 6).value = evar.get('Expected Values', '')
-        ws_evars.cell(row, 7).value = evar.get('Implementation Trigger', '')
-        ws_evars.cell(row, 8).value = evar.get('Example Value', '')
-        ws_evars.cell(row, 9).value = evar.get('Additional Notes', '')
-        row += 1
-
-    print(f"   ✅ Wrote {len(sdr_data.get('evars', []))} eVars")
-
-    # Write Props
-    print("   Writing Props...")
-    ws_props = wb['Props']
-    row = 7
-    for prop in sdr_data.get('props', []):
-        ws_props.cell(row, 2).value = prop.get('Requirement ID', '')
-        ws_props.cell(row, 3).value = prop.get('Analytics Variable', '')
-        ws_props.cell(row, 4).value = prop.get('Business Name', '')
-        ws_props.cell(row, 5).value = prop.get('Business Description', '')
-        ws_props.cell(row, 6).value = prop.get('Expected Values', '')
-        ws_props.cell(row, 7).value = prop.get('Implementation Trigger', '')
-        ws_props.cell(row, 8).value = prop.get('Example Value', '')
-        ws_props.cell(row, 9).value = prop.get('Additional Notes', '')
-        row += 1
-
-    print(f"   ✅ Wrote {len(sdr_data.get('props', []))} Props")
-
-    # Write Events
-    print("   Writing Events...")
-    ws_events = wb['Events']
-    row = 7
-    for event in sdr_data.get('events', []):
-        ws_events.cell(row, 2).value = event.get('Requirement ID', '')
-        ws_events.cell(row, 3).value = event.get('Analytics Variable', '')
-        ws_events.cell(row, 4).value = event.get('Business Name', '')
-        ws_events.cell(row, 5).value = event.get('Business Description', '')
-        ws_events.cell(row, 6).value = event.get('Expected Values', '')
-        ws_events.cell(row, 7).value = event.get('Implementation Trigger', '')
-        ws_events.cell(row, 8).value = event.get('Example Value', '')
-        ws_events.cell(row, 9).value = event.get('Additional Notes', '')
-        row += 1
-
-    print(f"   ✅ Wrote {len(sdr_data.get('events', []))} Events")
+    sheets = {}
+    for key, names in SDR_SHEETS.items():
+        ws = find_sdr_sheet(wb, names)
+        if ws is None:
+            raise ValueError(f"Required sheet '{names[0]}' not found in Excel file")
+        sheets[key] = ws
+
+    # Write every SDR sheet in one pass
+    for key, ws in sheets.items():
+        label = SDR_SHEETS[key][0]
+        print(f"   Writing {label}...")
+        written = write_sdr_rows(ws, sdr_data.get(key, []))
+        print(f"   ✅ Wrote {written} {label}")
 
     # Save workbook
     wb.save(output_file)
     print(f"\n✅ Excel file saved: {output_file}")
 
 
+def use_repo_modules():
+    """Make the repository's src package importable (local engine, slot allocator)"""
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+
+def convert_locally(input_file, client_name, sheet_name='Requirements', existing_sdr=None):
+    """
+    Convert a BRD workbook with the in-process SDRWorkflow instead of the webhook
+
+    Needs the repository's dependencies (langgraph, langchain-openai) and OPENAI_API_KEY.
+    Returns a result shaped like the webhook response.
+    """
+    use_repo_modules()
+    from src.workflows.sdr_workflow import SDRWorkflow
+
+    print(f"\n🧠 Converting locally with SDRWorkflow...")
+    state = SDRWorkflow().run_workbook(input_file, client_name, sheet_name=sheet_name,
+                                       existing_sdr=existing_sdr)
+    return {'success': True, 'clientName': client_name, 'sdr': state['sdr'],
+            'stats': state['stats']}
+
+
+def load_existing_slots(existing_sdr):
+    """
+    Index the slots of an existing SDR workbook
+
+    Called before the conversion so an unreadable workbook fails before the paid
+    webhook call. Conflicting rows in the workbook are printed, not raised.
+    """
+    use_repo_modules()
+    from src.core.slot_allocator import SlotAllocator
+
+    allocator = SlotAllocator.from_workbook(existing_sdr)
+    for conflict in allocator.conflicts:
+        print(f"   ⚠️  Existing SDR: {conflict}")
+    return allocator
+
+
+def reconcile_slots(sdr_data, allocator):
+    """
+    Renumber webhook SDR variables against an existing SDR (see load_existing_slots)
+
+    Variables already in the existing SDR keep their slots; the others keep their
+    proposed number if it is free, else take the lowest free slot.
+    """
+    print(f"\n🔢 Reconciling variable slots with the existing SDR...")
+    sdr_data, report = allocator.allocate_sdr(sdr_data)
+    for key in SDR_SHEETS:
+        print(f"   {key}: {len(report['renumbered'][key])} renumbered, "
+              f"{report['merged'][key]} duplicate rows merged")
+        if report['overflow'][key]:
+            print(f"   ⚠️  {key} dropped, no free slot: {', '.join(report['overflow'][key])}")
+    return sdr_data
+
+
+def convert_file(args, input_file, output_file, session=None):
+    """Run one BRD workbook through the webhook and write the SDR; returns the SDR data"""
+    allocator = None
+    if args.existing_sdr and args.engine == 'n8n':
+        allocator = load_existing_slots(args.existing_sdr)
+
+    # Step 1: Upload file to n8n webhook
+    if args.engine == 'local':
+        result = convert_locally(input_file, args.client, sheet_name=args.sheet,
+                                 existing_sdr=args.existing_sdr)
+    elif args.async_job:
+        jobs_url = args.jobs_url or f"{args.webhook.rstrip('/')}/jobs"
+        job_id = args.job_id or submit_job(
+            jobs_url, args.client, input_file, upload_mode=args.upload_mode,
+            sheet_name=args.sheet, include_original=args.include_original,
+            session=session, retries=args.retries,
+        )
+        result = wait_for_job(jobs_url, job_id, include_original=args.include_original,
+                              session=session, retries=args.retries,
+                              job_timeout=args.job_timeout)
+    else:
+        print(f"\n⏳ Please wait 30-60 seconds for AI processing...")
+        result = call_n8n_webhook(args.webhook, args.client, input_file,
+                                  upload_mode=args.upload_mode, sheet_name=args.sheet,
+                                  include_original=args.include_original, session=session,
+                                  retries=args.retries)
+
+    # Step 2: Extract SDR data
+    if 'sdr' not in result:
+        raise ValueError("Response does not contain 'sdr' field")
+
+    sdr_data = result['sdr']
+
+    # Validate SDR data
+    stats = result.get('stats') or {}
+    for key in SDR_SHEETS:
+        if not sdr_data.get(key):
+            raise ValueError(f"SDR data missing '{key}'")
+        # The workflow counts the stats on the parsed SDR; a mismatch means rows were
+        # lost between parsing and the response
+        if isinstance(stats.get(key), int) and stats[key] != len(sdr_data[key]):
+            raise ValueError(f"SDR data looks truncated: stats report {stats[key]} {key}, "
+                             f"response has {len(sdr_data[key])}")
+
+    if allocator is not None:
+        sdr_data = reconcile_slots(sdr_data, allocator)
+
+    # Step 3: Write to Excel
+    write_sdr_to_excel(input_file, sdr_data, output_file)
+    return sdr_data
+
+
+def output_path(args, input_file):
+    """Output file for input_file (--output is a directory when several inputs are given)"""
+    timestamp = datetime.now().strftime('%Y%m%d')
+    client_safe = args.client.replace(' ', '_').replace('/', '_')
+    if len(args.input) == 1:
+        return args.output or f"SDR_{client_safe}_{timestamp}.xlsx"
+    name = f"SDR_{client_safe}_{Path(input_file).stem}_{timestamp}.xlsx"
+    return str(Path(args.output) / name) if args.output else name
+
+
+def convert_many(args):
+    """Convert every input file, args.parallel at a time, over one pooled session"""
+    if args.parallel < 1:
+        raise ValueError(f"--parallel must be at least 1 (got {args.parallel})")
+    if args.output:
+        Path(args.output).mkdir(parents=True, exist_ok=True)
+
+    session = create_session(pool_size=args.parallel)
+    failures = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+        futures = {
+            pool.submit(convert_file, args, input_file, output_path(args, input_file), session):
+                input_file
+            for input_file in args.input
+        }
+        for future in as_completed(futures):
+            input_file = futures[future]
+            try:
+                future.result()
+                print(f"✅ {input_file} -> {output_path(args, input_file)}")
+            except Exception as e:
+                failures[input_file] = e
+                print(f"❌ {input_file}: {e}")
+    session.close()
+
+    print("\n" + "=" * 60)
+    print(f"📊 Converted {len(args.input) - len(failures)}/{len(args.input)} files "
+          f"in {time.perf_counter() - start:.1f}s")
+    for input_file, error in failures.items():
+        print(f"   - {input_file}: {error}")
+    print("=" * 60)
+    return 1 if failures else 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert BRD to SDR using n8n webhook and write to Excel'
@@ -176,7 +563,8 @@ def main():
         '--input',
         '-i',
         required=True,
-        help='Input Excel file (BRD with Requirements)'
+        nargs='+',
+        help='Input Excel file(s) (BRD with Requirements)'
     )
     parser.add_argument(
         '--client',
@@ -187,7 +575,71 @@ def main():
     parser.add_argument(
         '--output',
         '-o',
-        help='Output Excel file (default: SDR_<client>_<date>.xlsx)'
+        help='Output Excel file (default: SDR_<client>_<date>.xlsx); '
+             'output directory when several inputs are given'
+    )
+    parser.add_argument(
+        '--sheet',
+        '-s',
+        default='Requirements',
+        help='Name of the requirements sheet in the input file (default: Requirements)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='n8n',
+        help='n8n: convert through the webhook (default); local: run the SDR workflow '
+             'in-process (needs OPENAI_API_KEY)'
+    )
+    parser.add_argument(
+        '--existing-sdr',
+        help='SDR workbook already in production: its variables keep their slot numbers '
+             'and new variables take free slots'
+    )
+    parser.add_argument(
+        '--upload-mode',
+        choices=UPLOAD_MODES,
+        default='base64',
+        help='How the workbook is sent: base64 JSON (default), multipart form or raw binary body'
+    )
+    parser.add_argument(
+        '--include-original',
+        action='store_true',
+        help='Let the webhook echo the uploaded workbook back as originalFileBase64'
+    )
+    parser.add_argument(
+        '--parallel',
+        '-p',
+        type=int,
+        default=1,
+        help='Number of input files converted concurrently (default: 1)'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f'Retries for connection errors and HTTP 429/502/503/504; conversion uploads '
+             f'are only retried when the server never took them (default: {DEFAULT_RETRIES})'
+    )
+    parser.add_argument(
+        '--async-job',
+        action='store_true',
+        help='Submit the conversion as a job and poll for the result instead of '
+             'holding one request open'
+    )
+    parser.add_argument(
+        '--jobs-url',
+        help='Job endpoint for --async-job (default: <webhook>/jobs)'
+    )
+    parser.add_argument(
+        '--job-id',
+        help='Resume polling an already submitted job (implies --async-job, single input)'
+    )
+    parser.add_argument(
+        '--job-timeout',
+        type=float,
+        default=DEFAULT_JOB_TIMEOUT,
+        help=f'Seconds to keep polling a job (default: {DEFAULT_JOB_TIMEOUT})'
     )
     parser.add_argument(
         '--webhook',
@@ -198,47 +650,50 @@ def main():
 
     args = parser.parse_args()
 
-    # Determine output file name
-    if args.output:
-        output_file = args.output
-    else:
-        timestamp = datetime.now().strftime('%Y%m%d')
-        client_safe = args.client.replace(' ', '_').replace('/', '_')
-        output_file = f"SDR_{client_safe}_{timestamp}.xlsx"
+    if args.parallel < 1:
+        parser.error('--parallel must be at least 1')
+
+    if args.job_id:
+        if len(args.input) > 1:
+            parser.error('--job-id takes a single input file')
+        args.async_job = True
+    if args.engine == 'local' and args.async_job:
+        parser.error('--async-job/--job-id apply to the n8n engine only')
+
+    if len(args.input) > 1:
+        print("=" * 60)
+        print("🚀 BRD to SDR - JSON to Excel Converter")
+        print("=" * 60)
+        print(f"Input files: {len(args.input)}")
+        print(f"Client: {args.client}")
+        print(f"Parallel: {args.parallel}")
+        print(f"Engine: {args.engine}")
+        print(f"Webhook: {args.webhook}")
+        print(f"Upload mode: {args.upload_mode}")
+        print("=" * 60)
+        try:
+            return convert_many(args)
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Interrupted by user")
+            return 1
+
+    input_file = args.input[0]
+    output_file = output_path(args, input_file)
 
     print("=" * 60)
     print("🚀 BRD to SDR - JSON to Excel Converter")
     print("=" * 60)
-    print(f"Input file: {args.input}")
+    print(f"Input file: {input_file}")
     print(f"Client: {args.client}")
     print(f"Output file: {output_file}")
+    print(f"Engine: {args.engine}")
     print(f"Webhook: {args.webhook}")
+    print(f"Upload mode: {args.upload_mode}")
     print("=" * 60)
 
     try:
-        # Step 1: Read and encode file
-        file_base64 = read_and_encode_file(args.input)
-
-        # Step 2: Call n8n webhook
-        print(f"\n⏳ Please wait 30-60 seconds for AI processing...")
-        result = call_n8n_webhook(args.webhook, args.client, file_base64)
-
-        # Step 3: Extract SDR data
-        if 'sdr' not in result:
-            raise ValueError("Response does not contain 'sdr' field")
-
-        sdr_data = result['sdr']
-
-        # Validate SDR data
-        if not sdr_data.get('evars'):
-            raise ValueError("SDR data missing 'evars'")
-        if not sdr_data.get('props'):
-            raise ValueError("SDR data missing 'props'")
-        if not sdr_data.get('events'):
-            raise ValueError("SDR data missing 'events'")
-
-        # Step 4: Write to Excel
-        write_sdr_to_excel(args.input, sdr_data, output_file)
+        with create_session(1) as session:
+            sdr_data = convert_file(args, input_file, output_file, session=session)
 
         # Success summary
         print("\n" + "=" * 60)
@@ -246,10 +701,9 @@ def main():
         print("=" * 60)
         print(f"📄 Output file: {output_file}")
         print(f"📊 Statistics:")
-        print(f"   - eVars: {len(sdr_data['evars'])}")
-        print(f"   - Props: {len(sdr_data['props'])}")
-        print(f"   - Events: {len(sdr_data['events'])}")
-        print(f"   - Total: {len(sdr_data['evars']) + len(sdr_data['props']) + len(sdr_data['events'])}")
+        for key, names in SDR_SHEETS.items():
+            print(f"   - {names[0]}: {len(sdr_data[key])}")
+        print(f"   - Total: {sum(len(sdr_data[key]) for key in SDR_SHEETS)}")
         print("=" * 60)
 
         return 0
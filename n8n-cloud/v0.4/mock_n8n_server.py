@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the BRD to SDR n8n webhook
+
+Accepts the same uploads as the v0.6 workflow (base64 JSON, multipart form or raw
+binary body), reads the requirements sheet of the uploaded workbook and answers with a
+deterministic SDR in the webhook's response format. No AI call is made, so
+json_to_excel.py can be exercised end to end without an n8n instance. GET /stats lists
+the upload mode, bytes received/sent, status and client port (one per connection) of
+every request served. --fail-rate injects 503 responses to exercise client retries.
+Conversions can also be submitted as jobs (see MockWebhookHandler) to exercise
+json_to_excel.py --async-job.
+
+Usage:
+    python3 mock_n8n_server.py --port 8765
+    python3 json_to_excel.py -i AA_BRD_SDR_Test_01122026.xlsx -c "Client A" \
+        --webhook http://127.0.0.1:8765/webhook/brd-sdr-json --upload-mode binary
+"""
+
+import argparse
+import base64
+import io
+import json
+import random
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from openpyxl import load_workbook
+
+
+def read_requirements(file_bytes, sheet_name=None):
+    """Return the requirement rows below the 'Requirement ID' header of the sheet"""
+    wb = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name in wb.sheetnames else wb.worksheets[0]
+        requirements = []
+        header = None
+        for row in ws.iter_rows(values_only=True):
+            cells = [str(v).strip() if v is not None else '' for v in row]
+            if header is None:
+                if 'Requirement ID' in cells:
+                    header = cells
+                continue
+            record = dict(zip(header, cells))
+            if record.get('Business Requirement') or record.get('Category'):
+                requirements.append(record)
+        return requirements
+    finally:
+        wb.close()
+
+
+def build_sdr(requirements):
+    """
+    One eVar per requirement, a prop for every second one and an event for every third,
+    capped at the report suite limits (250 eVars, 75 props, 1000 events)
+    """
+    def entry(prefix, number, requirement):
+        return {
+            'Requirement ID': requirement.get('Requirement ID', ''),
+            'Analytics Variable': f"{prefix}{number}",
+            'Business Name': requirement.get('Category', ''),
+            'Business Description': requirement.get('Business Requirement', ''),
+            'Expected Values': 'string',
+            'Implementation Trigger': 'page load',
+            'Example Value': '',
+            'Additional Notes': requirement.get('Additional Notes', ''),
+        }
+
+    return {
+        'evars': [entry('eVar', i + 1, r) for i, r in enumerate(requirements[:250])],
+        'props': [entry('prop', i + 1, r) for i, r in enumerate(requirements[:150:2])],
+        'events': [entry('event', i + 1, r) for i, r in enumerate(requirements[:3000:3])],
+    }
+
+
+def build_result(fields, file_bytes, requirements):
+    """Webhook response body for a conversion"""
+    sdr = build_sdr(requirements)
+    result = {
+        'success': True,
+        'clientName': fields.get('clientName', ''),
+        'sdr': sdr,
+        'stats': {key: len(value) for key, value in sdr.items()},
+    }
+    if str(fields.get('includeOriginal', 'true')).lower() != 'false':
+        result['originalFileBase64'] = base64.b64encode(file_bytes).decode('ascii')
+    return result
+
+
+class MockWebhookHandler(BaseHTTPRequestHandler):
+    """
+    Handles POST /webhook/<path> like the BRD to SDR workflow, plus the job protocol:
+    POST /webhook/<path>/jobs returns {"jobId"} at once and GET
+    /webhook/<path>/jobs/<jobId> reports the job status and, once done, its result
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b''.join(chunks)
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _parse_upload(self, body, query):
+        """Return (fields, workbook bytes, upload mode) for any supported upload"""
+        content_type = self.headers.get('Content-Type', '')
+        fields = {key: values[0] for key, values in query.items()}
+
+        if content_type.startswith('application/json'):
+            payload = json.loads(body)
+            fields.update({k: v for k, v in payload.items() if k != 'fileData'})
+            return fields, base64.b64decode(payload.get('fileData', '')), 'base64'
+
+        if content_type.startswith('multipart/form-data'):
+            message = BytesParser(policy=default_policy).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode() + body
+            )
+            file_bytes = b''
+            for part in message.iter_parts():
+                name = part.get_param('name', header='content-disposition')
+                if part.get_filename():
+                    file_bytes = part.get_payload(decode=True)
+                else:
+                    fields[name] = part.get_content().strip()
+            return fields, file_bytes, 'multipart'
+
+        return fields, body, 'binary'
+
+    def _send_json(self, status, payload, record=None):
+        data = json.dumps(payload).encode('utf-8')
+        if record is not None:  # before writing, so the client never sees a stale /stats
+            self.server.record(bytes_out=len(data), **record)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/stats':
+            with self.server._lock:
+                self._send_json(200, {'requests': list(self.server.requests)})
+            return
+
+        head, _, job_id = path.rpartition('/')
+        if head.startswith('/webhook/') and head.endswith('/jobs'):
+            job = self.server.job_status(job_id)
+            if job is None:
+                self._send_json(404, {'success': False, 'error': f"Unknown job {job_id}"})
+            else:
+                self._send_json(200, job)
+            return
+
+        self._send_json(404, {'success': False, 'error': 'Not found'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if not url.path.startswith('/webhook/'):
+            self._send_json(404, {'success': False, 'error': 'Not found'})
+            return
+
+        body = self._read_body()
+        peer = self.client_address[1]
+        if self.server.should_fail():
+            self._send_json(503, {'success': False, 'error': 'Service unavailable (injected)'},
+                            record={'mode': None, 'bytes_in': len(body), 'peer': peer,
+                                    'status': 503})
+            return
+
+        try:
+            fields, file_bytes, mode = self._parse_upload(body, parse_qs(url.query))
+            requirements = read_requirements(file_bytes, fields.get('baseSheetName'))
+        except Exception as e:
+            self._send_json(400, {'success': False, 'error': f"{type(e).__name__}: {e}"})
+            return
+
+        record = {'mode': mode, 'bytes_in': len(body), 'peer': peer}
+        if url.path.rstrip('/').endswith('/jobs'):
+            job_id = self.server.submit_job(fields, file_bytes, requirements)
+            self._send_json(202, {'jobId': job_id, 'status': 'queued'},
+                            record=dict(record, status=202))
+            return
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        result = build_result(fields, file_bytes, requirements)
+        self._send_json(200, result, record=dict(record, status=200))
+
+
+class MockN8nServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that records the size of every upload and response"""
+
+    daemon_threads = True
+
+    def __init__(self, address, delay=0.0, fail_rate=0.0, seed=None, quiet=True):
+        super().__init__(address, MockWebhookHandler)
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.quiet = quiet
+        self.requests = []
+        self.jobs = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def submit_job(self, fields, file_bytes, requirements):
+        """Queue a conversion that finishes after `delay` seconds; returns its id"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self.jobs[job_id] = {'jobId': job_id, 'status': 'queued'}
+
+        def run():
+            with self._lock:
+                self.jobs[job_id]['status'] = 'running'
+            time.sleep(self.delay)
+            result = build_result(fields, file_bytes, requirements)
+            with self._lock:
+                self.jobs[job_id].update(status='done', result=result)
+
+        threading.Thread(target=run, daemon=True).start()
+        return job_id
+
+    def job_status(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def should_fail(self):
+        """Whether to answer the next webhook call with an injected 503"""
+        with self._lock:
+            return self._random.random() < self.fail_rate
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/webhook/brd-sdr-json"
+
+    def record(self, **request):
+        with self._lock:
+            self.requests.append(request)
+
+    def start(self):
+        """Serve from a background thread (for scripts and benchmarks)"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the BRD to SDR webhook')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help='Seconds to wait before answering (or finishing a job), '
+                             'to mimic AI processing')
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help='Fraction of webhook calls answered with HTTP 503 (retry testing)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed for --fail-rate')
+    args = parser.parse_args()
+
+    server = MockN8nServer((args.host, args.port), delay=args.delay, fail_rate=args.fail_rate,
+                           seed=args.seed, quiet=False)
+    print(f"🚀 Mock n8n webhook listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⚠️  Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Batch script to run the BRD/SDR generation workflow over many discovery documents
+
+Usage:
+    python run_batch.py --input discovery_docs/ --concurrency 8 --timeout 900
+    python run_batch.py --input portfolio.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+from datetime import datetime
+from dotenv import load_dotenv
+
+from src.core.batch_runner import load_batch_inputs, run_batch
+from src.workflows.factory import get_workflow
+
+
+def output_name(result, index: int, used: set) -> str:
+    """
+    File name stem for one document's results, unique within the run
+
+    Documents whose names sanitize to one already used (e.g. duplicate JSONL ids) get
+    their batch index appended instead of overwriting the earlier results.
+    """
+    safe_name = re.sub(r"[^\w.-]+", "_", result.name)
+    if safe_name.lower() in used:
+        unique_name = f"{safe_name}_{index:04d}"
+        print(f"⚠️  Output name '{safe_name}' already used; saving item {index} as "
+              f"'{unique_name}'")
+        safe_name = unique_name
+    used.add(safe_name.lower())
+    return safe_name
+
+
+def save_result(output_dir: str, safe_name: str, result) -> None:
+    """Save the final BRD/SDR and validation result of one document"""
+    state = result.state
+
+    brd_sdr_output = state.get("brd_sdr_final") or state.get("brd_sdr_draft")
+    with open(os.path.join(output_dir, f"{safe_name}_BRD_SDR_final.md"), "w",
+              encoding="utf-8") as f:
+        f.write(brd_sdr_output)
+
+    with open(os.path.join(output_dir, f"{safe_name}_validation_result.json"), "w",
+              encoding="utf-8") as f:
+        json.dump(state["validation_result"], f, indent=2)
+
+
+def main():
+    """Run the workflow over a directory or JSONL file of discovery documents"""
+    parser = argparse.ArgumentParser(
+        description="Generate BRD/SDR documents for many discovery documents in parallel"
+    )
+    parser.add_argument("--input", "-i", required=True,
+                        help="Directory of *.json/*.xlsx discovery files, a JSONL file "
+                             "or a single discovery workbook")
+    parser.add_argument("--concurrency", "-n", type=int, default=4,
+                        help="Maximum number of documents processed at once (default: 4)")
+    parser.add_argument("--timeout", "-t", type=float, default=None,
+                        help="Per-document timeout in seconds (default: no limit)")
+    parser.add_argument("--output", "-o", default=None,
+                        help="Output directory (default: output/batch_<timestamp>)")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("❌ Error: OPENAI_API_KEY not found in environment variables")
+        return 1
+
+    items = load_batch_inputs(args.input)
+    if not items:
+        print(f"❌ No discovery documents found in {args.input}")
+        return 1
+
+    output_dir = args.output or os.path.join(
+        "output", f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+    os.makedirs(output_dir, exist_ok=True)
+
+    print("=" * 80)
+    print("Adobe Tagging AI - Batch BRD/SDR Generation")
+    print("=" * 80)
+    print(f"📋 Documents: {len(items)}")
+    print(f"⚙️  Concurrency: {args.concurrency}")
+    print(f"⏱️  Timeout: {args.timeout or 'none'}")
+    print()
+
+    workflow = get_workflow()
+    results, summary = asyncio.run(
+        run_batch(workflow, items, concurrency=args.concurrency, timeout=args.timeout)
+    )
+
+    used_names = set()
+    for index, result in enumerate(results):
+        if result.status == "ok":
+            save_result(output_dir, output_name(result, index, used_names), result)
+
+    with open(os.path.join(output_dir, "batch_summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary.to_dict(), f, indent=2)
+
+    print("\n" + "=" * 80)
+    print("📊 Batch Summary")
+    print("=" * 80)
+    print(f"✅ Succeeded: {summary.succeeded}/{summary.total}")
+    print(f"❌ Failed: {summary.failed}")
+    print(f"⏱️  Timed out: {summary.timed_out}")
+    print(f"🕒 Wall time: {summary.wall_time:.1f}s")
+    print(f"🚀 Throughput: {summary.throughput_per_min:.2f} docs/min")
+    print(f"📈 Latency p50/p95/max: {summary.latency_p50:.1f}s / "
+          f"{summary.latency_p95:.1f}s / {summary.latency_max:.1f}s")
+    for failure in summary.failures:
+        print(f"   - [{failure['index']}] {failure['name']}: {failure['error']}")
+    print(f"\n📁 Results saved to {output_dir}/")
+
+    return 0 if summary.succeeded == summary.total else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,12 +2,14 @@
 Sample script to run the BRD/SDR generation workflow
 """
 
+import argparse
+import asyncio
 import os
 import json
 from datetime import datetime
 from dotenv import load_dotenv
 
-from src.workflows.brd_sdr_workflow import BRDSDRWorkflow
+from src.workflows.factory import get_workflow
 from src.utils.sample_data import SAMPLE_ECOMMERCE_DISCOVERY
 
 
@@ -24,9 +26,32 @@ def save_output(content: str, filename: str):
     return filepath
 
 
+async def stream_workflow(workflow, discovery, filename: str) -> dict:
+    """Run the workflow in streaming mode, writing the BRD/SDR to file as it arrives"""
+    output_dir = "output"
+    os.makedirs(output_dir, exist_ok=True)
+
+    filepath = os.path.join(output_dir, filename)
+    print(f"📡 Streaming BRD/SDR to: {filepath}")
+
+    final_state = None
+    async for event in workflow.astream(discovery, output_path=filepath):
+        if event["event"] == "end":
+            final_state = event["state"]
+    return final_state
+
+
 def main():
     """Run the sample workflow"""
 
+    parser = argparse.ArgumentParser(description="Run the BRD/SDR generation demo")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write the BRD/SDR to the output file incrementally as it is generated"
+    )
+    args = parser.parse_args()
+
     # Load environment variables
     load_dotenv()
 
@@ -56,14 +81,20 @@ def main():
     print()
 
     # Initialize workflow
-    workflow = BRDSDRWorkflow(api_key=api_key, model=model)
+    workflow = get_workflow(api_key=api_key, model=model)
 
     # Run workflow
     try:
-        result = workflow.run(SAMPLE_ECOMMERCE_DISCOVERY)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        if args.stream:
+            result = asyncio.run(stream_workflow(
+                workflow, SAMPLE_ECOMMERCE_DISCOVERY, f"{timestamp}_4_BRD_SDR_final.md"
+            ))
+        else:
+            result = workflow.run(SAMPLE_ECOMMERCE_DISCOVERY)
 
         # Save all outputs
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         print("\n" + "=" * 80)
         print("📊 Saving results...")
@@ -89,10 +120,11 @@ def main():
 
         # Save final BRD/SDR
         brd_sdr_output = result.get("brd_sdr_final") or result.get("brd_sdr_draft")
-        save_output(
-            brd_sdr_output,
-            f"{timestamp}_4_BRD_SDR_final.md"
-        )
+        if not args.stream:  # already written incrementally when streaming
+            save_output(
+                brd_sdr_output,
+                f"{timestamp}_4_BRD_SDR_final.md"
+            )
 
         # Save validation results
         save_output(
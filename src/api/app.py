@@ -0,0 +1,232 @@
+"""
+HTTP service for the BRD/SDR workflows
+
+    uvicorn src.api.app:app --host 0.0.0.0 --port 8000
+
+Discovery documents (JSON or questionnaire workbooks) and BRD workbooks are queued as
+jobs on a bounded in-process worker pool (see src/api/jobs.py). Submitting returns a job
+id right away; progress is streamed per LangGraph node as server-sent events, and when
+the queue is full the service answers 429 with a Retry-After header rather than taking
+on work it cannot start soon.
+
+Settings (environment): API_WORKERS (default 4), API_QUEUE_SIZE (default 32) and
+API_JOB_TIMEOUT (seconds, default no limit), plus the workflow settings of .env.
+GET /metrics serves the run and per-node metrics in the Prometheus text format.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+from typing import Optional, Union
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from src.api.jobs import Job, JobQueue, QueueFullError
+from src.core.metrics import METRICS
+from src.processors.brd_workbook import REQUIREMENTS_SHEET, read_brd_requirements
+from src.processors.discovery_workbook import read_discovery_workbook
+
+
+class DiscoveryJobRequest(BaseModel):
+    """A discovery document to turn into a BRD/SDR"""
+    discovery: Union[dict, str]
+    name: Optional[str] = None
+    model: Optional[str] = None  # per-run LLM overrides of the shared workflow
+    temperature: Optional[float] = None
+
+
+def _job_accepted(job: Job) -> dict:
+    return {"job_id": job.id, "status": job.status,
+            "events": f"/jobs/{job.id}/events", "result": f"/jobs/{job.id}/result"}
+
+
+async def _save_upload(upload: UploadFile) -> str:
+    """Copy an uploaded workbook to a temporary .xlsx file and return its path"""
+    if not (upload.filename or "").lower().endswith(".xlsx"):
+        raise HTTPException(400, f"Expected an .xlsx workbook, got '{upload.filename}'")
+    handle, path = tempfile.mkstemp(suffix=".xlsx")
+    with os.fdopen(handle, "wb") as f:
+        await asyncio.to_thread(shutil.copyfileobj, upload.file, f)
+    return path
+
+
+def _remove(*paths: Optional[str]) -> None:
+    for path in paths:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+def create_app(brd_workflow=None, sdr_workflow=None, workers: int = None,
+               queue_size: int = None, job_timeout: float = None) -> FastAPI:
+    """
+    Build the service
+
+    Args:
+        brd_workflow: BRDSDRWorkflow for discovery jobs (if None, the shared one from
+            get_workflow() is used)
+        sdr_workflow: SDRWorkflow for BRD workbook jobs (likewise, get_sdr_workflow())
+        workers: Jobs run at once (default: API_WORKERS or 4)
+        queue_size: Jobs waiting at most (default: API_QUEUE_SIZE or 32)
+        job_timeout: Per-job run time limit in seconds (default: API_JOB_TIMEOUT or none)
+    """
+    if job_timeout is None and os.getenv("API_JOB_TIMEOUT"):
+        job_timeout = float(os.getenv("API_JOB_TIMEOUT"))
+    jobs = JobQueue(
+        workers=workers or int(os.getenv("API_WORKERS", "4")),
+        queue_size=queue_size or int(os.getenv("API_QUEUE_SIZE", "32")),
+        timeout=job_timeout
+    )
+    workflows = {"brd_sdr": brd_workflow, "sdr": sdr_workflow}
+
+    def workflow(kind: str):
+        if workflows[kind] is None:
+            from src.workflows.factory import get_sdr_workflow, get_workflow
+            workflows[kind] = get_workflow() if kind == "brd_sdr" else get_sdr_workflow()
+        return workflows[kind]
+
+    def ensure_capacity() -> None:
+        """Refuse early, before reading an upload, when no job can be queued"""
+        if jobs.stats()["queued"] >= jobs.queue_size:
+            raise HTTPException(429, "Job queue is full",
+                                headers={"Retry-After": str(jobs.retry_after())})
+
+    def submit(kind: str, name: str, run, cleanup=None) -> dict:
+        try:
+            job = jobs.submit(kind, name, run, cleanup)
+        except QueueFullError as e:
+            if cleanup is not None:
+                cleanup()
+            raise HTTPException(429, str(e), headers={"Retry-After": str(e.retry_after)})
+        return _job_accepted(job)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await jobs.start()
+        print(f"🌐 Job queue ready ({jobs.workers} workers, {jobs.queue_size} queued max)")
+        yield
+        await jobs.stop()
+        # Shared workflows keep a checkpoint connection open on this loop
+        for shared in workflows.values():
+            if hasattr(shared, "aclose"):
+                await shared.aclose()
+
+    app = FastAPI(title="Adobe Tagging AI", lifespan=lifespan)
+    app.state.jobs = jobs
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", **jobs.stats()}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        """Wall time, tokens, cache hits, retries and cost of finished runs, per node"""
+        return PlainTextResponse(METRICS.prometheus(), media_type="text/plain; version=0.0.4")
+
+    @app.post("/jobs/discovery", status_code=202)
+    async def submit_discovery(request: DiscoveryJobRequest):
+        """Queue a discovery document (dict or text) for BRD/SDR generation"""
+        ensure_capacity()
+        name = request.name or "discovery"
+        if isinstance(request.discovery, dict):
+            client_info = request.discovery.get("client_info")
+            if isinstance(client_info, dict):
+                name = request.name or client_info.get("company_name") or name
+        overrides = {"model": request.model, "temperature": request.temperature}
+        return submit("brd_sdr", name, lambda: workflow("brd_sdr").astream(
+            request.discovery, tokens=False, overrides=overrides))
+
+    @app.post("/jobs/discovery/workbook", status_code=202)
+    async def submit_discovery_workbook(file: UploadFile = File(...)):
+        """Queue a discovery questionnaire workbook for BRD/SDR generation"""
+        ensure_capacity()
+        path = await _save_upload(file)
+        try:
+            discovery = await asyncio.to_thread(read_discovery_workbook, path)
+        except Exception as e:
+            raise HTTPException(400, f"Could not read discovery workbook: {e}")
+        finally:
+            _remove(path)
+        if not discovery["questionnaire"]:
+            raise HTTPException(400, "The workbook has no answered discovery questions")
+        return submit("brd_sdr", file.filename, lambda: workflow("brd_sdr").astream(
+            discovery, tokens=False))
+
+    @app.post("/jobs/brd", status_code=202)
+    async def submit_brd_workbook(file: UploadFile = File(...),
+                                  client_name: str = Form(""),
+                                  sheet_name: str = Form(REQUIREMENTS_SHEET),
+                                  existing_sdr: Optional[UploadFile] = File(None)):
+        """
+        Queue a BRD workbook for SDR generation
+
+        An existing SDR workbook of the report suite may be attached; its variables
+        keep their slots.
+        """
+        ensure_capacity()
+        path = await _save_upload(file)
+        try:
+            requirements = await asyncio.to_thread(read_brd_requirements, path, sheet_name)
+        except Exception as e:
+            raise HTTPException(400, f"Could not read BRD workbook: {e}")
+        finally:
+            _remove(path)
+        if not requirements:
+            raise HTTPException(400, f"No requirements found in sheet '{sheet_name}'")
+
+        existing_path = await _save_upload(existing_sdr) if existing_sdr else None
+        return submit(
+            "sdr", client_name or file.filename,
+            lambda: workflow("sdr").astream(requirements, client_name, existing_path),
+            cleanup=lambda: _remove(existing_path)
+        )
+
+    def get_job(job_id: str) -> Job:
+        job = jobs.get(job_id)
+        if job is None:
+            raise HTTPException(404, f"Unknown job '{job_id}'")
+        return job
+
+    @app.get("/jobs/{job_id}")
+    async def job_status(job_id: str):
+        return get_job(job_id).summary()
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str):
+        """Server-sent events: queued, started, node_end per graph node, then the outcome"""
+        job = get_job(job_id)
+
+        async def stream():
+            async for event in jobs.events(job):
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+
+    @app.get("/jobs/{job_id}/result")
+    async def job_result(job_id: str):
+        """Final workflow state of a succeeded job"""
+        job = get_job(job_id)
+        if job.status == "failed":
+            raise HTTPException(409, f"Job failed: {job.error}")
+        if not job.done:
+            raise HTTPException(409, f"Job is {job.status}")
+        return {"job_id": job.id, "state": job.result}
+
+    return app
+
+
+load_dotenv()
+app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("API_HOST", "127.0.0.1"),
+                port=int(os.getenv("API_PORT", "8000")))
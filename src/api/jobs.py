@@ -0,0 +1,214 @@
+"""
+In-process job queue for the HTTP service
+
+Jobs wait in a bounded asyncio queue and are run by a fixed number of worker tasks on
+the service's event loop, so at most `workers` workflows are in flight and at most
+`queue_size` more are waiting; submit() refuses anything beyond that instead of letting
+latency grow without bound. Every job records the progress events of its run (one per
+LangGraph node), which any number of subscribers can replay and follow live.
+"""
+
+import asyncio
+import math
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, List, Optional
+
+
+class QueueFullError(Exception):
+    """The job queue is at capacity"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    """One queued workflow run"""
+    id: str
+    kind: str  # "brd_sdr" (discovery → BRD/SDR) or "sdr" (BRD → SDR)
+    name: str
+    run: Callable[[], AsyncIterator[dict]]  # starts the workflow's astream()
+    cleanup: Optional[Callable[[], None]] = None  # e.g. removes uploaded files
+    status: str = "queued"  # queued, running, succeeded or failed
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    events: List[dict] = field(default_factory=list)
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    _updated: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def summary(self) -> dict:
+        """Status, timings and progress of the job (without the result)"""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "name": self.name,
+            "status": self.status,
+            "created": self.created,
+            "queued_seconds": round((self.started or time.time()) - self.created, 3),
+            "run_seconds": (round((self.finished or time.time()) - self.started, 3)
+                            if self.started else None),
+            "nodes_completed": [e["node"] for e in self.events if e["event"] == "node_end"],
+            "error": self.error
+        }
+
+
+class JobQueue:
+    """Bounded queue of workflow jobs served by a fixed pool of worker tasks"""
+
+    def __init__(self, workers: int = 4, queue_size: int = 32, timeout: float = None,
+                 max_jobs: int = 1000):
+        """
+        Args:
+            workers: Jobs run at once
+            queue_size: Jobs waiting at most; submit() raises QueueFullError beyond it
+            timeout: Per-job run time limit in seconds (None for no limit)
+            max_jobs: Finished jobs kept for status and result queries (oldest dropped)
+        """
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be at least 1")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.max_jobs = max_jobs
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._durations = deque(maxlen=50)  # run seconds of recent jobs
+        self._running = 0
+
+    async def start(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued and running jobs are marked failed"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self._jobs.values():
+            if not job.done:
+                self._finish(job, "failed", error="Service stopped")
+
+    # ------------------------------------------------------------------
+    # Submission and queries
+    # ------------------------------------------------------------------
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up (from recent run times)"""
+        if not self._durations:
+            return 30
+        average = sum(self._durations) / len(self._durations)
+        return max(1, math.ceil(average / self.workers))
+
+    def submit(self, kind: str, name: str, run: Callable[[], AsyncIterator[dict]],
+               cleanup: Callable[[], None] = None) -> Job:
+        """
+        Queue a job
+
+        Raises:
+            QueueFullError: If queue_size jobs are already waiting
+        """
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() has not been called")
+        job = Job(id=uuid.uuid4().hex, kind=kind, name=name, run=run, cleanup=cleanup)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(self.retry_after()) from None
+
+        self._jobs[job.id] = job
+        self._emit(job, {"event": "queued", "position": self._queue.qsize()})
+        self._evict()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "jobs": len(self._jobs)
+        }
+
+    async def events(self, job: Job) -> AsyncIterator[dict]:
+        """Replay the job's events so far, then follow it until it finishes"""
+        index = 0
+        while True:
+            while index < len(job.events):
+                yield job.events[index]
+                index += 1
+            if job.done:
+                return
+            await job._updated.wait()
+
+    def _evict(self) -> None:
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _emit(self, job: Job, event: dict) -> None:
+        event["elapsed"] = round(time.time() - job.created, 3)
+        job.events.append(event)
+        updated, job._updated = job._updated, asyncio.Event()
+        updated.set()
+
+    def _finish(self, job: Job, status: str, error: str = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished = time.time()
+        self._emit(job, {"event": status, **({"error": error} if error else {})})
+        if job.cleanup is not None:
+            job.cleanup()
+
+    async def _consume(self, job: Job) -> None:
+        async for event in job.run():
+            if event["event"] == "node_end":
+                self._emit(job, {"event": "node_end", "node": event["node"]})
+            elif event["event"] == "end":
+                job.result = event["state"]
+
+    async def _execute(self, job: Job) -> None:
+        job.status = "running"
+        job.started = time.time()
+        self._emit(job, {"event": "started"})
+        print(f"▶️  Job {job.id} ({job.kind}: {job.name}) started")
+        try:
+            await asyncio.wait_for(self._consume(job), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._finish(job, "failed", error=f"Timed out after {self.timeout}s")
+        except Exception as e:  # isolate failures so the worker keeps serving
+            self._finish(job, "failed", error=f"{type(e).__name__}: {e}")
+        else:
+            self._finish(job, "succeeded")
+        self._durations.append(job.finished - job.started)
+        print(f"{'✅' if job.status == 'succeeded' else '❌'} Job {job.id} {job.status} "
+              f"({job.finished - job.started:.1f}s)")
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._running += 1
+            try:
+                await self._execute(job)
+            finally:
+                self._running -= 1
+                self._queue.task_done()
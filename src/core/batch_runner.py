@@ -0,0 +1,192 @@
+"""
+Batch runner that fans many discovery documents through the BRD/SDR workflow
+"""
+
+import asyncio
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Union
+
+from src.processors.discovery_workbook import read_discovery_workbook
+
+
+@dataclass
+class BatchItem:
+    """A single discovery document queued for processing"""
+    name: str
+    discovery: Union[dict, str, None]
+    error: Optional[str] = None  # set when the document could not be loaded
+
+
+@dataclass
+class BatchResult:
+    """Outcome of processing one BatchItem"""
+    name: str
+    status: str  # "ok", "failed" or "timeout"
+    latency: float
+    state: Optional[dict] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    """Throughput and latency figures for a whole batch"""
+    total: int
+    succeeded: int
+    failed: int
+    timed_out: int
+    wall_time: float
+    throughput_per_min: float
+    latency_p50: float
+    latency_p95: float
+    latency_max: float
+    failures: List[dict] = field(default_factory=list)  # {index, name, status, error}
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def load_batch_inputs(path: str) -> List[BatchItem]:
+    """
+    Load discovery documents from a directory, a JSONL file or a single workbook
+
+    A directory may hold ``*.json`` discovery files and ``*.xlsx`` discovery
+    questionnaire workbooks. JSONL records may carry an ``id`` or ``name`` field;
+    otherwise the client's company name (or the line number) is used to label the item.
+
+    A file, workbook or JSONL line that cannot be loaded does not abort the batch: it
+    becomes an item with ``error`` set, which run_batch reports as failed.
+    """
+    source = Path(path)
+    if not source.exists():
+        raise FileNotFoundError(f"Batch input not found: {path}")
+
+    if source.suffix.lower() == ".xlsx":
+        return [_load_item(source.stem, read_discovery_workbook, str(source))]
+
+    items = []
+    if source.is_dir():
+        for file_path in sorted(source.iterdir()):
+            if file_path.suffix.lower() == ".json":
+                items.append(_load_item(file_path.stem, _read_json, file_path))
+            elif file_path.suffix.lower() == ".xlsx" and not file_path.name.startswith("~$"):
+                item = _load_item(file_path.stem, read_discovery_workbook, str(file_path))
+                if item.error or item.discovery["questionnaire"]:  # skip unanswered ones
+                    items.append(item)
+        return items
+
+    with open(source, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            item = _load_item(f"{line_number:04d}", _parse_record, line)
+            if item.error is None:
+                item.name = _item_name(item.discovery, line_number)
+            items.append(item)
+    return items
+
+
+def _load_item(name: str, load, source) -> BatchItem:
+    """Load one document, recording the error instead of raising"""
+    try:
+        return BatchItem(name=name, discovery=load(source))
+    except Exception as e:
+        return BatchItem(name=name, discovery=None, error=f"{type(e).__name__}: {e}")
+
+
+def _read_json(file_path: Path) -> dict:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _parse_record(line: str) -> dict:
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("JSONL record is not a JSON object")
+    return record
+
+
+def _item_name(record: dict, line_number: int) -> str:
+    for key in ("id", "name"):
+        if record.get(key):
+            return str(record[key])
+    client_info = record.get("client_info")
+    company = client_info.get("company_name") if isinstance(client_info, dict) else None
+    return f"{line_number:04d}_{company}" if company else f"{line_number:04d}"
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile (0.0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def _run_one(workflow, item: BatchItem, semaphore: asyncio.Semaphore,
+                   timeout: Optional[float]) -> BatchResult:
+    if item.error is not None:
+        return BatchResult(item.name, "failed", 0.0, error=item.error)
+
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            state = await asyncio.wait_for(workflow.arun(item.discovery), timeout=timeout)
+        except asyncio.TimeoutError:
+            return BatchResult(item.name, "timeout", time.perf_counter() - start,
+                               error=f"Timed out after {timeout}s")
+        except Exception as e:  # isolate failures so the rest of the batch continues
+            return BatchResult(item.name, "failed", time.perf_counter() - start,
+                               error=f"{type(e).__name__}: {e}")
+        return BatchResult(item.name, "ok", time.perf_counter() - start, state=state)
+
+
+async def run_batch(workflow, items: List[BatchItem], concurrency: int = 4,
+                    timeout: Optional[float] = None):
+    """
+    Process discovery documents concurrently through ``workflow.arun``
+
+    Args:
+        workflow: A BRDSDRWorkflow (anything exposing an ``arun`` coroutine)
+        items: Documents to process
+        concurrency: Maximum number of documents in flight at once
+        timeout: Per-document timeout in seconds (None for no limit)
+
+    Returns:
+        Tuple of (results in input order, BatchSummary)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+
+    results = await asyncio.gather(
+        *(_run_one(workflow, item, semaphore, timeout) for item in items)
+    )
+
+    wall_time = time.perf_counter() - start
+    latencies = [r.latency for r in results if r.status == "ok"]
+    succeeded = len(latencies)
+
+    summary = BatchSummary(
+        total=len(results),
+        succeeded=succeeded,
+        failed=sum(1 for r in results if r.status == "failed"),
+        timed_out=sum(1 for r in results if r.status == "timeout"),
+        wall_time=wall_time,
+        throughput_per_min=(succeeded / wall_time * 60) if wall_time > 0 else 0.0,
+        latency_p50=_percentile(latencies, 50),
+        latency_p95=_percentile(latencies, 95),
+        latency_max=max(latencies, default=0.0),
+        failures=[
+            {"index": index, "name": r.name, "status": r.status, "error": r.error}
+            for index, r in enumerate(results) if r.status != "ok"
+        ],
+    )
+    return list(results), summary
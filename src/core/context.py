@@ -0,0 +1,124 @@
+"""
+Prompt-context compaction and token counting
+
+The discovery document and the outputs of earlier steps are re-sent to every later
+step. These helpers shrink them before they are embedded in a prompt: the discovery
+becomes compact canonical JSON, and prior outputs are stripped of markdown padding and,
+when over a token budget, reduced to their most informative lines.
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Optional
+
+
+# Token budgets for prior-step outputs embedded in later prompts
+SUMMARY_TOKEN_BUDGETS = {
+    "analysis": 2000,
+    "reasoning": 4000,
+}
+
+_VARIABLE_RE = re.compile(r"\b(eVar|prop|event|list)\d+\b", re.IGNORECASE)
+_FENCE_RE = re.compile(r"^```\w*\s*$", re.MULTILINE)
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """tiktoken encoding for model, or None when tiktoken or its BPE files are unavailable"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:  # BPE files are downloaded on first use; offline hosts fall back
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count tokens with tiktoken, or estimate at ~4 characters per token without it"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _drop_empty(value):
+    if isinstance(value, dict):
+        compacted = {k: _drop_empty(v) for k, v in value.items()}
+        return {k: v for k, v in compacted.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_drop_empty(v) for v in value if v not in (None, "", [], {})]
+    return value
+
+
+@lru_cache(maxsize=32)
+def compact_discovery(discovery_content: str) -> str:
+    """
+    Return a compact canonical form of the discovery document
+
+    JSON input is re-serialized without indentation and with empty fields dropped;
+    anything else has its whitespace collapsed.
+    """
+    try:
+        data = json.loads(discovery_content)
+    except (TypeError, ValueError):
+        return re.sub(r"[ \t]+", " ", re.sub(r"\n\s*\n+", "\n", discovery_content)).strip()
+    return json.dumps(_drop_empty(data), separators=(",", ":"), ensure_ascii=False)
+
+
+def _strip_markdown(text: str) -> str:
+    text = _FENCE_RE.sub("", text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"\1", text)
+    text = re.sub(r"^\s*([-*_])\1{2,}\s*$", "", text, flags=re.MULTILINE)  # rules
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def _line_priority(line: str) -> int:
+    """Higher is more important to keep"""
+    if line.startswith("#") or _VARIABLE_RE.search(line):
+        return 3
+    if line.startswith(("-", "*", "|")) or re.match(r"^\d+[.)]", line):
+        return 2
+    return 1
+
+
+@lru_cache(maxsize=32)
+def summarize_output(text: str, max_tokens: Optional[int] = None, model: str = "gpt-4o") -> str:
+    """
+    Compact a prior step's output for use as context in a later prompt
+
+    JSON output is re-serialized compactly. Markdown is stripped of emphasis, rules,
+    fences and blank lines. If the result is still over max_tokens, the least
+    informative lines are dropped, last ones first: prose, then list items; headings
+    and lines naming eVars/props/events are kept.
+    """
+    fenced = re.search(r"```(?:json)?\s*(\{.*\})\s*```", text, re.DOTALL)
+    candidate = fenced.group(1) if fenced else text.strip()
+    try:
+        return json.dumps(json.loads(candidate), separators=(",", ":"), ensure_ascii=False)
+    except ValueError:
+        pass
+
+    compacted = _strip_markdown(text)
+    if max_tokens is None:
+        return compacted
+
+    lines = compacted.splitlines()
+    costs = [count_tokens(line, model) + 1 for line in lines]
+    total = sum(costs)
+    keep = [True] * len(lines)
+    for priority in (1, 2):
+        for index in range(len(lines) - 1, -1, -1):
+            if total <= max_tokens:
+                break
+            if keep[index] and _line_priority(lines[index]) == priority:
+                keep[index] = False
+                total -= costs[index]
+    return "\n".join(line for line, kept in zip(lines, keep) if kept)
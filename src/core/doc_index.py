@@ -0,0 +1,305 @@
+"""
+Reference document index
+
+Chunks of the base-docs reference artifacts (see src/processors/reference_docs.py) are
+embedded locally and stored in a persistent chromadb collection, so workflow steps can
+pull the few chunks relevant to them instead of carrying no reference material or
+inlining whole documents.
+
+Embeddings come from HashingEmbedder: word and word-bigram features hashed into a fixed
+number of signed buckets and L2-normalized. It needs no model download or network
+access, embeds a query in well under a millisecond, and is deterministic across
+processes, so an index built on one machine can be queried on another.
+
+A JSON manifest next to the collection records the mtime, size and content hash of
+every indexed file and the hash of each of its sheets or heading sections. refresh()
+only re-reads files whose mtime or size moved, re-embeds only the sections whose text
+changed, and deletes the vectors of removed sections and files, so keeping the index
+current costs time proportional to the change rather than to the corpus.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zlib
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from src.processors.reference_docs import (
+    ReferenceChunk,
+    chunk_part,
+    document_parts,
+    find_reference_documents
+)
+
+
+BASE_DOCS = "base-docs"
+DOC_INDEX_PATH = ".cache/doc_index"
+COLLECTION_NAME = "reference_docs"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _chunk_ids(source: str, part: str, start: int, end: int) -> List[str]:
+    """Ids of chunks start..end-1 of a part (see ReferenceChunk.id)"""
+    return [f"{source}::{part}::{index}" for index in range(start, end)]
+
+
+class HashingEmbedder:
+    """Offline text embedding: signed feature hashing of words and word bigrams"""
+
+    def __init__(self, dimensions: int = 1024):
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, text: str) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode("utf-8")) for feature in self._features(text)),
+            dtype=np.uint32
+        )
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+        vector = np.bincount(hashes % self.dimensions, weights=signs,
+                             minlength=self.dimensions)
+        vector = np.sign(vector) * np.log1p(np.abs(vector))  # damp repeated terms
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def __call__(self, texts: Iterable[str]) -> np.ndarray:
+        """Embed a batch of texts into a (len(texts), dimensions) float32 array"""
+        vectors = [self.embed(text) for text in texts]
+        if not vectors:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return np.vstack(vectors).astype(np.float32)
+
+
+class DocumentIndex:
+    """Persistent chromadb index of reference document chunks"""
+
+    def __init__(self, path: str = DOC_INDEX_PATH, collection: str = COLLECTION_NAME,
+                 embedder: HashingEmbedder = None):
+        """
+        Args:
+            path: Directory of the chromadb store (created if missing)
+            collection: Collection name
+            embedder: Embedding function (default: HashingEmbedder())
+        """
+        import chromadb
+        from chromadb.config import Settings
+
+        self.path = path
+        self.collection_name = collection
+        self.embedder = embedder or HashingEmbedder()
+        os.makedirs(path, exist_ok=True)
+        self.client = chromadb.PersistentClient(
+            path=path, settings=Settings(anonymized_telemetry=False)
+        )
+        self.collection = self._open_collection()
+        self.manifest_path = os.path.join(path, f"{collection}.manifest.json")
+
+    def _open_collection(self):
+        collection = self.client.get_or_create_collection(
+            self.collection_name,
+            metadata={"hnsw:space": "cosine", "embedding": self.embedder.name},
+            embedding_function=None
+        )
+        built_with = (collection.metadata or {}).get("embedding")
+        if built_with != self.embedder.name:
+            raise ValueError(f"Index at {self.path} was built with '{built_with}' embeddings, "
+                             f"not '{self.embedder.name}'; rebuild it")
+        return collection
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def load_manifest(self) -> dict:
+        """{source: {"mtime_ns", "size", "hash", "parts": {part: {"hash", "chunks"}}}}"""
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: dict) -> None:
+        # A temp file of its own, so concurrent refreshes of one index never share it
+        handle, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(self.manifest_path) or ".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def add_chunks(self, chunks: List[ReferenceChunk], batch_size: int = 256) -> None:
+        """Embed and upsert chunks, batch_size at a time"""
+        batch_size = min(batch_size, self.client.get_max_batch_size())
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+            self.collection.upsert(
+                ids=[chunk.id for chunk in batch],
+                embeddings=self.embedder([chunk.text for chunk in batch]),
+                documents=[chunk.text for chunk in batch],
+                metadatas=[{"source": chunk.source, "part": chunk.part,
+                            "section": chunk.section, "index": chunk.index} for chunk in batch]
+            )
+
+    def delete_chunks(self, ids: List[str], batch_size: int = 5000) -> None:
+        for start in range(0, len(ids), batch_size):
+            self.collection.delete(ids=ids[start:start + batch_size])
+
+    def build(self, root: str = BASE_DOCS) -> dict:
+        """Rebuild the index from scratch (see refresh() for the returned counts)"""
+        self.client.delete_collection(self.collection_name)
+        self.collection = self._open_collection()
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        return self.refresh(root)
+
+    def refresh(self, root: str = BASE_DOCS, batch_size: int = 256) -> dict:
+        """
+        Bring the index up to date with the reference documents under root
+
+        Files whose mtime and size match the manifest are skipped without being read;
+        files whose bytes are unchanged (e.g. only touched) are not parsed. Of the
+        rest, only sheets or sections whose content hash changed are re-chunked and
+        re-embedded, batch_size chunks per embedding and upsert call. Vectors of
+        removed sections and files are deleted. An index holds one root; files
+        indexed from elsewhere are removed.
+
+        Returns:
+            Counts of "documents" by status ("added", "changed", "unchanged",
+            "removed"), "parts_embedded", "chunks_embedded", "chunks_deleted" and
+            "chunks" (stored in total)
+        """
+        manifest = self.load_manifest()
+        indexed_before = self.count() > 0
+        documents = {
+            os.path.relpath(path, root).replace(os.sep, "/"): path
+            for path in find_reference_documents(root)
+        }
+        stats = dict.fromkeys(("added", "changed", "unchanged", "removed", "parts_embedded",
+                               "chunks_embedded", "chunks_deleted"), 0)
+        pending, stale = [], []
+
+        for source in sorted(set(manifest) - set(documents)):
+            for part, entry in manifest.pop(source)["parts"].items():
+                stale += _chunk_ids(source, part, 0, entry["chunks"])
+            stats["removed"] += 1
+            print(f"🗑️  {source}: removed")
+
+        for source, path in documents.items():
+            entry = manifest.get(source)
+            stat = os.stat(path)
+            if entry and (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size):
+                stats["unchanged"] += 1
+                continue
+            content_hash = file_hash(path)
+            if entry and entry["hash"] == content_hash:
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                stats["unchanged"] += 1
+                continue
+
+            if entry is None and indexed_before:
+                # Chunks of this file may exist without a manifest entry (interrupted run)
+                self.collection.delete(where={"source": source})
+            old_parts = entry["parts"] if entry else {}
+            parts, embedded = {}, 0
+            for part in document_parts(path):
+                part_hash = part.hash
+                old = old_parts.get(part.key)
+                if old and old["hash"] == part_hash:
+                    parts[part.key] = old
+                    continue
+                chunks = chunk_part(source, part)
+                if old:  # upsert replaces the first len(chunks); drop the rest
+                    stale += _chunk_ids(source, part.key, len(chunks), old["chunks"])
+                pending += chunks
+                parts[part.key] = {"hash": part_hash, "chunks": len(chunks)}
+                embedded += 1
+            for key in old_parts.keys() - parts.keys():
+                stale += _chunk_ids(source, key, 0, old_parts[key]["chunks"])
+
+            manifest[source] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                                "hash": content_hash, "parts": parts}
+            stats["changed" if entry else "added"] += 1
+            stats["parts_embedded"] += embedded
+            print(f"📚 {source}: {embedded} of {len(parts)} sections embedded")
+
+            full = len(pending) - len(pending) % batch_size
+            if full:
+                self.add_chunks(pending[:full], batch_size)
+                stats["chunks_embedded"] += full
+                del pending[:full]
+
+        self.add_chunks(pending, batch_size)
+        stats["chunks_embedded"] += len(pending)
+        self.delete_chunks(stale)
+        stats["chunks_deleted"] = len(stale)
+        self._save_manifest(manifest)
+        stats["chunks"] = self.count()
+        return stats
+
+    # ------------------------------------------------------------------
+    # Retrieval
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, k: int = 4, source: Optional[str] = None) -> List[dict]:
+        """
+        Top-k chunks most similar to the query
+
+        Args:
+            query: Free text
+            k: Number of chunks to return
+            source: Only chunks of this document (relative path)
+
+        Returns:
+            Dicts with id, source, section, text and distance (cosine), closest first
+        """
+        if not query.strip() or self.count() == 0:
+            return []
+        result = self.collection.query(
+            query_embeddings=self.embedder([query]),
+            n_results=k,
+            where={"source": source} if source else None,
+            include=["documents", "metadatas", "distances"]
+        )
+        return [
+            {"id": chunk_id, "source": metadata["source"], "section": metadata["section"],
+             "text": text, "distance": distance}
+            for chunk_id, text, metadata, distance in zip(
+                result["ids"][0], result["documents"][0], result["metadatas"][0],
+                result["distances"][0]
+            )
+        ]
+
+    def context(self, query: str, k: int = 4) -> str:
+        """Top-k chunk texts joined for embedding in a prompt ("" when none match)"""
+        return "\n\n".join(hit["text"] for hit in self.search(query, k))
+
+
+@lru_cache(maxsize=4)
+def open_doc_index(path: str = DOC_INDEX_PATH) -> DocumentIndex:
+    """Open an index once per process (chromadb clients are shared per path anyway)"""
+    return DocumentIndex(path)
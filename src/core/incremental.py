@@ -0,0 +1,162 @@
+"""
+Incremental re-generation support for the BRD/SDR workflow
+
+Compares a revised discovery document with the input of the previous run and works
+out which workflow stages and BRD/SDR sections have to be regenerated. Everything
+else is reused from the snapshot stored after that run.
+"""
+
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+
+
+# Discovery fields that shape the overall solution strategy. A change here invalidates
+# the analysis and reasoning steps, and with them every section.
+STRATEGY_FIELDS = (
+    "client_info.company_name",
+    "client_info.industry",
+    "client_info.vertical",
+    "client_info.website",
+    "business_objectives",
+    "technical_context",
+    # Questionnaire workbooks (see read_discovery_workbook): revenue model, KBRs and
+    # the business problems to solve
+    "questionnaire.Performance",
+)
+
+# Discovery fields each BRD/SDR section (keyed by section number) is written from.
+# Questionnaire workbooks (see read_discovery_workbook) are diffed per category, named
+# as in the Adobe discovery template; other categories force a full regeneration.
+SECTION_DEPENDENCIES = {
+    "1": ("client_info", "business_objectives", "key_kpis", "success_criteria"),
+    "2": ("business_objectives", "key_kpis", "user_journeys", "success_criteria"),
+    "3": ("client_info.platforms", "technical_context", "data_requirements",
+          "marketing_channels", "questionnaire.Site Architecture",
+          "questionnaire.Acquisition/Retention", "questionnaire.Privacy",
+          "questionnaire.Report Suite Architecture"),
+    "4": ("client_info.platforms", "key_kpis", "critical_events", "data_requirements",
+          "user_journeys", "marketing_channels", "questionnaire.Site Architecture",
+          "questionnaire.Acquisition/Retention", "questionnaire.Privacy",
+          "questionnaire.Report Suite Architecture"),
+    "5": ("client_info.platforms", "critical_events", "data_requirements", "user_journeys",
+          "questionnaire.Site Architecture"),
+    "6": ("client_info.platforms", "technical_context", "success_criteria",
+          "questionnaire.Site Architecture", "questionnaire.Governance",
+          "questionnaire.Privacy", "questionnaire.QA"),
+    "7": ("business_objectives", "key_kpis", "marketing_channels", "success_criteria",
+          "questionnaire.Acquisition/Retention", "questionnaire.Governance",
+          "questionnaire.Report Suite Architecture"),
+}
+
+
+@dataclass
+class RegenerationPlan:
+    """What to regenerate for a revised discovery document"""
+    changed_fields: Set[str] = field(default_factory=set)
+    rerun_analysis: bool = True
+    stale_sections: Set[str] = field(default_factory=set)
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.changed_fields
+
+
+def diff_discovery(old: dict, new: dict, prefix: str = "") -> Set[str]:
+    """
+    Return the dotted paths of every field that was added, removed or changed
+
+    Nested dicts are compared field by field; lists and scalars are compared as a
+    whole, so a new KPI in ``key_kpis`` is reported as ``key_kpis``.
+    """
+    changed = set()
+    for key in set(old) | set(new):
+        path = f"{prefix}{key}"
+        old_value, new_value = old.get(key), new.get(key)
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            changed |= diff_discovery(old_value, new_value, prefix=f"{path}.")
+        elif old_value != new_value:
+            changed.add(path)
+    return changed
+
+
+def _affects(changed_field: str, dependency: str) -> bool:
+    """True if a change at changed_field touches the dependency path (either direction)"""
+    return (
+        changed_field == dependency
+        or changed_field.startswith(dependency + ".")
+        or dependency.startswith(changed_field + ".")
+    )
+
+
+def _is_known(changed_field: str) -> bool:
+    dependencies = set(STRATEGY_FIELDS)
+    for section_fields in SECTION_DEPENDENCIES.values():
+        dependencies.update(section_fields)
+    return any(_affects(changed_field, dependency) for dependency in dependencies)
+
+
+def plan_regeneration(old: Optional[dict], new: dict) -> RegenerationPlan:
+    """
+    Work out which stages and sections a revised discovery document invalidates
+
+    Fields the dependency tables do not know about are treated as strategic, so an
+    unexpected change always falls back to a full regeneration.
+    """
+    all_sections = set(SECTION_DEPENDENCIES)
+    if old is None:
+        return RegenerationPlan(changed_fields=set(new), stale_sections=all_sections)
+
+    changed = diff_discovery(old, new)
+    if not changed:
+        return RegenerationPlan(rerun_analysis=False)
+
+    rerun_analysis = any(
+        not _is_known(path) or any(_affects(path, dep) for dep in STRATEGY_FIELDS)
+        for path in changed
+    )
+    if rerun_analysis:
+        return RegenerationPlan(changed_fields=changed, stale_sections=all_sections)
+
+    stale = {
+        number
+        for number, dependencies in SECTION_DEPENDENCIES.items()
+        if any(_affects(path, dep) for path in changed for dep in dependencies)
+    }
+    return RegenerationPlan(changed_fields=changed, rerun_analysis=False, stale_sections=stale)
+
+
+class RunSnapshotStore:
+    """Stores the input and outputs of the last run per project as JSON files"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, project_id: str) -> str:
+        safe_id = re.sub(r"[^\w.-]+", "_", project_id)
+        return os.path.join(self.directory, f"{safe_id}.json")
+
+    def load(self, project_id: str) -> Optional[Dict]:
+        """Return the last snapshot for project_id, or None if there is none"""
+        path = self._path(project_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, project_id: str, snapshot: Dict) -> None:
+        """Atomically replace the snapshot for project_id"""
+        path = self._path(project_id)
+        # A temp file of its own, so concurrent saves of one project never share it
+        handle, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
@@ -0,0 +1,185 @@
+"""
+Persistent, content-addressed cache for LLM responses
+
+Responses are stored in a local SQLite file keyed by a SHA-256 hash of the
+rendered prompt together with the model name, temperature and max_tokens, so
+re-running the workflow on an unchanged document skips the paid LLM calls.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+
+# Hits are recorded in memory and their last_access written in one batch after this many
+ACCESS_FLUSH_SIZE = 64
+
+
+class LLMCache:
+    """
+    On-disk LLM response cache with a size cap and LRU eviction
+
+    get/set block on SQLite; coroutines use aget/aset, which run them in a worker thread
+    so a lookup never stalls the event loop.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, bypass: bool = False):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file to store responses in (created if missing)
+            max_bytes: Total size of stored responses before least-recently-used
+                entries are evicted
+            bypass: If True, lookups always miss (responses are still stored)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+        self._touched: Dict[str, float] = {}  # key -> last_access not yet written
+        self._total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, max_tokens: int) -> str:
+        """Hash the rendered prompt and generation settings into a cache key"""
+        payload = json.dumps(
+            {
+                "prompt": prompt,
+                "model": model,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        if self.bypass:
+            self.misses += 1
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            # No write per hit; access times are flushed in batches (and before eviction)
+            self._touched[key] = time.time()
+            if len(self._touched) >= ACCESS_FLUSH_SIZE:
+                self._flush_access()
+                self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    async def aget(self, key: str) -> Optional[str]:
+        """get() without blocking the event loop"""
+        return await asyncio.to_thread(self.get, key)
+
+    def set(self, key: str, content: str) -> None:
+        """Store a response and evict least-recently-used entries over the size cap"""
+        size = len(content.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            replaced = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, content, size, time.time()),
+            )
+            self._touched.pop(key, None)
+            self._total += size - (replaced[0] if replaced else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    async def aset(self, key: str, content: str) -> None:
+        """set() without blocking the event loop"""
+        await asyncio.to_thread(self.set, key, content)
+
+    def _flush_access(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the stored responses fit max_bytes"""
+        self._flush_access()
+        # The running total only counts this process's writes; recount before evicting
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._total = total
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+        self._total = total
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._touched.clear()
+            self._total = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            self._conn.close()
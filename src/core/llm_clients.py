@@ -0,0 +1,76 @@
+"""
+Shared LLM clients
+
+Every ChatOpenAI built here sends its requests through one pooled httpx transport per
+process (one sync and one async client), so concurrent runs and threads reuse open
+keep-alive connections to the model endpoint instead of each workflow opening its
+own. Chat models are cached per settings, so building a workflow does not construct a
+new API client either. Both clients count their requests into the current run's metrics
+(src/core/metrics.py), which is how retries of the OpenAI SDK become visible.
+"""
+
+import os
+import threading
+from functools import lru_cache
+from typing import Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from src.core.metrics import arecord_http_request, record_http_request
+
+
+# Connection pool of the shared transport (LLM_MAX_CONNECTIONS overrides the size)
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_KEEPALIVE_SECONDS = 60.0
+
+# Per-run LLM settings a workflow accepts as overrides
+LLM_SETTINGS = ("model", "temperature", "max_tokens")
+
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """The process-wide (sync, async) httpx clients behind every shared chat model"""
+    max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_connections,
+                          keepalive_expiry=DEFAULT_KEEPALIVE_SECONDS)
+    timeout = httpx.Timeout(600.0, connect=10.0)
+    return (httpx.Client(limits=limits, timeout=timeout,
+                         event_hooks={"request": [record_http_request]}),
+            httpx.AsyncClient(limits=limits, timeout=timeout,
+                              event_hooks={"request": [arecord_http_request]}))
+
+
+@lru_cache(maxsize=32)
+def _chat_model(api_key: str, model: str, temperature: float, max_tokens: int) -> ChatOpenAI:
+    client, async_client = http_clients()
+    return ChatOpenAI(
+        api_key=api_key,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        http_client=client,
+        http_async_client=async_client
+    )
+
+
+def chat_model(api_key: str, model: str, temperature: float, max_tokens: int) -> ChatOpenAI:
+    """ChatOpenAI on the shared transport, built once per distinct settings"""
+    with _lock:  # lru_cache does not stop two threads from building the same model
+        return _chat_model(api_key, model, temperature, max_tokens)
+
+
+def check_overrides(overrides: dict) -> dict:
+    """
+    Validate per-run LLM overrides, dropping unset (None) values
+
+    Raises:
+        ValueError: For a setting other than LLM_SETTINGS
+    """
+    unknown = set(overrides or {}) - set(LLM_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown LLM settings {sorted(unknown)}; expected {LLM_SETTINGS}")
+    return {key: value for key, value in (overrides or {}).items() if value is not None}
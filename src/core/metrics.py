@@ -0,0 +1,350 @@
+"""
+Run and node instrumentation
+
+A RunMetrics collects, per graph node: executions and wall time, LLM calls sent,
+cache hits, prompt/completion tokens, HTTP retries and estimated cost. The run and the
+node being executed are held in context variables, which LangGraph copies into every
+node (thread or task), so the LLM helpers record against the right node without
+passing anything around. Retries are the HTTP requests beyond one per LLM call, counted
+by a hook on the shared httpx clients (see src/core/llm_clients.py).
+
+Finished runs can be appended to a JSON lines file (one record per node plus one per
+run) and are aggregated into a process-wide registry that renders the Prometheus text
+format, served by start_metrics_server() or the HTTP service's /metrics route.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+
+# USD per 1M tokens (input, output); a dated model name uses its family's price
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4-turbo": (10.00, 30.00),
+    "o3-mini": (1.10, 4.40),
+}
+
+_current_run: contextvars.ContextVar = contextvars.ContextVar("current_run", default=None)
+_current_node: contextvars.ContextVar = contextvars.ContextVar("current_node", default="")
+
+
+def model_price(model: str) -> Optional[tuple]:
+    """(input, output) USD per 1M tokens of the longest matching model name, or None"""
+    matches = [name for name in MODEL_PRICES if model == name or model.startswith(name + "-")]
+    return MODEL_PRICES[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of one call (0.0 for models without a known price)"""
+    price = model_price(model)
+    if price is None:
+        return 0.0
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+
+@dataclass
+class NodeMetrics:
+    """Counters of one graph node within a run"""
+    node: str
+    executions: int = 0
+    wall_seconds: float = 0.0
+    llm_calls: int = 0  # calls sent to the model (cache hits excluded)
+    cache_hits: int = 0
+    http_requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.http_requests - self.llm_calls) if self.http_requests else 0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "wall_seconds": round(self.wall_seconds, 4),
+                "cost": round(self.cost, 6), "retries": self.retries}
+
+
+class RunMetrics:
+    """Per-node and total measurements of one workflow run (thread-safe)"""
+
+    def __init__(self, workflow: str, model: str, run_id: str = None):
+        self.workflow = workflow
+        self.model = model
+        self.run_id = run_id
+        self.started = time.time()
+        self.wall_seconds = 0.0
+        self.status = "running"
+        self.nodes: Dict[str, NodeMetrics] = {}
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _node(self, node: str) -> NodeMetrics:
+        if node not in self.nodes:
+            self.nodes[node] = NodeMetrics(node)
+        return self.nodes[node]
+
+    def record_node(self, node: str, seconds: float) -> None:
+        with self._lock:
+            metrics = self._node(node)
+            metrics.executions += 1
+            metrics.wall_seconds += seconds
+
+    def record_llm_call(self, node: str, model: str, prompt_tokens: int,
+                        completion_tokens: int) -> None:
+        with self._lock:
+            metrics = self._node(node)
+            metrics.llm_calls += 1
+            metrics.prompt_tokens += prompt_tokens
+            metrics.completion_tokens += completion_tokens
+            metrics.cost += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    def record_cache_hit(self, node: str) -> None:
+        with self._lock:
+            self._node(node).cache_hits += 1
+
+    def record_http_request(self, node: str) -> None:
+        with self._lock:
+            self._node(node).http_requests += 1
+
+    def finish(self, status: str = "succeeded") -> "RunMetrics":
+        self.wall_seconds = time.perf_counter() - self._start
+        self.status = status
+        return self
+
+    def totals(self) -> dict:
+        with self._lock:
+            nodes = list(self.nodes.values())
+        fields = ("llm_calls", "cache_hits", "prompt_tokens", "completion_tokens", "retries")
+        totals = {field: sum(getattr(node, field) for node in nodes) for field in fields}
+        totals["cost"] = round(sum(node.cost for node in nodes), 6)
+        return totals
+
+    def to_dict(self) -> dict:
+        """Timing breakdown: run wall time, totals and per-node counters"""
+        with self._lock:
+            nodes = {name: node.to_dict() for name, node in self.nodes.items()}
+        return {
+            "run_id": self.run_id,
+            "workflow": self.workflow,
+            "model": self.model,
+            "status": self.status,
+            "started": self.started,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "totals": self.totals(),
+            "nodes": nodes
+        }
+
+    def summary(self) -> str:
+        totals = self.totals()
+        slowest = max(self.nodes.values(), key=lambda node: node.wall_seconds, default=None)
+        return (f"⏱️  {self.wall_seconds:.1f}s, {totals['llm_calls']} LLM calls "
+                f"({totals['cache_hits']} cached, {totals['retries']} retries), "
+                f"{totals['prompt_tokens'] + totals['completion_tokens']} tokens, "
+                f"~${totals['cost']:.4f}"
+                + (f"; slowest node: {slowest.node} ({slowest.wall_seconds:.1f}s)"
+                   if slowest else ""))
+
+
+# ----------------------------------------------------------------------
+# Recording from workflow code
+# ----------------------------------------------------------------------
+
+@contextmanager
+def track_run(metrics: RunMetrics):
+    """Make metrics the current run for the code (and graph nodes) inside the block"""
+    token = _current_run.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_run.reset(token)
+
+
+def instrument_node(node: str, function: Callable) -> Callable:
+    """
+    Wrap a graph node so its wall time is recorded and its LLM calls are attributed
+    to it; the wrapper keeps the signature LangGraph inspects for config/writer
+    """
+    def record(start: float) -> None:
+        metrics = _current_run.get()
+        if metrics is not None:
+            metrics.record_node(node, time.perf_counter() - start)
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def async_wrapper(*args, **kwargs):
+            token = _current_node.set(node)
+            start = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                record(start)
+                _current_node.reset(token)
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        token = _current_node.set(node)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(start)
+            _current_node.reset(token)
+    return wrapper
+
+
+def record_llm_call(model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """Record a model call against the current node (no-op outside a tracked run)"""
+    metrics = _current_run.get()
+    if metrics is not None:
+        metrics.record_llm_call(_current_node.get(), model, prompt_tokens, completion_tokens)
+
+
+def record_cache_hit() -> None:
+    metrics = _current_run.get()
+    if metrics is not None:
+        metrics.record_cache_hit(_current_node.get())
+
+
+def record_http_request(request=None) -> None:
+    """httpx request hook: count a request (first attempt or retry) to the model API"""
+    metrics = _current_run.get()
+    if metrics is not None:
+        metrics.record_http_request(_current_node.get())
+
+
+async def arecord_http_request(request=None) -> None:
+    """Async httpx request hook (see record_http_request)"""
+    record_http_request(request)
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+
+_export_lock = threading.Lock()
+
+
+def export_jsonl(path: str, metrics: RunMetrics) -> None:
+    """Append one "node" record per node and one "run" record to a JSON lines file"""
+    data = metrics.to_dict()
+    base = {"run_id": data["run_id"], "workflow": data["workflow"], "model": data["model"],
+            "started": data["started"]}
+    lines = [json.dumps({"record": "node", **base, **node}) for node in data["nodes"].values()]
+    lines.append(json.dumps({"record": "run", **base, "status": data["status"],
+                             "wall_seconds": data["wall_seconds"], **data["totals"]}))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _export_lock, open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+class MetricsRegistry:
+    """Process-wide totals of finished runs, rendered in the Prometheus text format"""
+
+    _NODE_COUNTERS = (
+        ("node_executions_total", "executions", "Graph node executions"),
+        ("node_seconds_total", "wall_seconds", "Wall time spent in the node"),
+        ("node_llm_calls_total", "llm_calls", "LLM calls sent (cache hits excluded)"),
+        ("node_cache_hits_total", "cache_hits", "LLM response cache hits"),
+        ("node_retries_total", "retries", "HTTP retries of LLM calls"),
+        ("node_prompt_tokens_total", "prompt_tokens", "Prompt tokens"),
+        ("node_completion_tokens_total", "completion_tokens", "Completion tokens"),
+        ("node_cost_usd_total", "cost", "Estimated LLM cost in USD"),
+    )
+
+    def __init__(self, prefix: str = "tagging_ai"):
+        self.prefix = prefix
+        self._nodes: Dict[tuple, Dict[str, float]] = {}  # (workflow, node) -> counters
+        self._runs: Dict[tuple, Dict[str, float]] = {}  # (workflow, status) -> counters
+        self._lock = threading.Lock()
+
+    def observe(self, metrics: RunMetrics) -> None:
+        data = metrics.to_dict()
+        with self._lock:
+            for name, node in data["nodes"].items():
+                counters = self._nodes.setdefault((data["workflow"], name), {})
+                for _, field, _ in self._NODE_COUNTERS:
+                    counters[field] = counters.get(field, 0) + node[field]
+            run = self._runs.setdefault((data["workflow"], data["status"]), {})
+            run["count"] = run.get("count", 0) + 1
+            run["seconds"] = run.get("seconds", 0) + data["wall_seconds"]
+
+    def prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for metric, field, description in self._NODE_COUNTERS:
+                name = f"{self.prefix}_{metric}"
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+                for (workflow, node), counters in sorted(self._nodes.items()):
+                    lines.append(f'{name}{{workflow="{workflow}",node="{node}"}} '
+                                 f"{counters[field]:g}")
+            for metric, field, description in (("runs_total", "count", "Finished runs"),
+                                               ("run_seconds_total", "seconds",
+                                                "Wall time of finished runs")):
+                name = f"{self.prefix}_{metric}"
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+                for (workflow, status), counters in sorted(self._runs.items()):
+                    lines.append(f'{name}{{workflow="{workflow}",status="{status}"}} '
+                                 f"{counters[field]:g}")
+        return "\n".join(lines) + "\n"
+
+
+# Registry the workflows report to
+METRICS = MetricsRegistry()
+
+
+def finish_run(metrics: RunMetrics, status: str = "succeeded", jsonl_path: str = None) -> dict:
+    """Close a run: record it in METRICS, append it to jsonl_path if set, return to_dict()"""
+    metrics.finish(status)
+    METRICS.observe(metrics)
+    if jsonl_path:
+        export_jsonl(jsonl_path, metrics)
+    return metrics.to_dict()
+
+
+_servers: Dict[int, ThreadingHTTPServer] = {}
+
+
+def start_metrics_server(port: int = 9464, host: str = "127.0.0.1",
+                         registry: MetricsRegistry = METRICS) -> ThreadingHTTPServer:
+    """Serve GET /metrics from a daemon thread (once per port)"""
+    with _export_lock:
+        if port in _servers:
+            return _servers[port]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # keep scrapes out of the console
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        _servers[port] = server
+        print(f"📈 Metrics at http://{host}:{port}/metrics")
+        return server
@@ -0,0 +1,290 @@
+"""
+Deterministic eVar/prop/event slot allocation
+
+SlotAllocator keeps an index of the used and free variable slots of one report suite,
+so SDR variable numbers are assigned and checked locally instead of being left to the
+LLM. Looking up or claiming a slot is a dict operation; handing out the lowest free
+slot advances a per-kind cursor past used slots (amortized O(1)), with a small heap for
+slots freed below the cursor. An allocator loaded from an existing SDR workbook keeps
+the numbers already in production when a new SDR is reconciled against it.
+"""
+
+import heapq
+import re
+from typing import Dict, List, Optional, Tuple
+
+from src.core.validation import VARIABLE_LIMITS
+
+
+# SDR key -> Analytics Variable prefix
+SDR_KINDS = {"evars": "eVar", "props": "prop", "events": "event"}
+
+# Report suite limits per SDR key
+SDR_LIMITS = {key: VARIABLE_LIMITS[prefix.lower()] for key, prefix in SDR_KINDS.items()}
+
+_VARIABLE_RE = re.compile(r"^(evar|prop|event)\s*(\d+)$", re.IGNORECASE)
+_KIND_BY_PREFIX = {prefix.lower(): key for key, prefix in SDR_KINDS.items()}
+
+
+class SlotError(ValueError):
+    """A slot is out of range, taken by another variable, or none is free"""
+
+
+def name_key(name: str) -> str:
+    """Normalize a Business Name for comparison ("Page  name" == "page-name")"""
+    return " ".join(re.findall(r"[a-z0-9]+", name.lower()))
+
+
+def merge_requirement_ids(ids: str, other: str) -> str:
+    """Combine two comma-separated requirement ID lists, keeping first-seen order"""
+    merged = [i.strip() for i in ids.split(",") if i.strip()]
+    for requirement_id in other.split(","):
+        if requirement_id.strip() and requirement_id.strip() not in merged:
+            merged.append(requirement_id.strip())
+    return ", ".join(merged)
+
+
+def parse_variable(variable: str) -> Optional[Tuple[str, int]]:
+    """Return (SDR key, number) for e.g. "eVar12", or None if it is not a numbered slot"""
+    match = _VARIABLE_RE.match(variable.strip())
+    if not match:
+        return None
+    return _KIND_BY_PREFIX[match.group(1).lower()], int(match.group(2))
+
+
+class SlotAllocator:
+    """Index of the used and free eVar/prop/event slots of one report suite"""
+
+    def __init__(self, limits: Dict[str, int] = None):
+        """
+        Args:
+            limits: Highest slot number per SDR key (default: report suite limits)
+        """
+        self.limits = dict(SDR_LIMITS, **(limits or {}))
+        self._owners = {key: {} for key in SDR_KINDS}  # number -> name
+        self._slots = {key: {} for key in SDR_KINDS}  # name key -> number
+        self._cursor = {key: 1 for key in SDR_KINDS}  # no free slot below, except _freed
+        self._freed = {key: [] for key in SDR_KINDS}  # heap of released slots < cursor
+        self.conflicts: List[str] = []  # rows of a loaded SDR that could not be indexed
+
+    @classmethod
+    def from_sdr(cls, sdr: dict, limits: Dict[str, int] = None) -> "SlotAllocator":
+        """
+        Index the variables of an existing SDR
+
+        Production SDRs often reuse a slot or a Business Name. Such rows do not raise:
+        the first row holding a slot or name keeps it, and each row that could not be
+        indexed (out of range, slot or name already taken) is described in
+        allocator.conflicts.
+        """
+        allocator = cls(limits)
+        for key in SDR_KINDS:
+            for row in sdr.get(key, []):
+                parsed = parse_variable(row.get("Analytics Variable", ""))
+                if parsed and parsed[0] == key and row.get("Business Name"):
+                    try:
+                        allocator.claim(key, parsed[1], row["Business Name"])
+                    except SlotError as e:
+                        allocator.conflicts.append(f"{row['Analytics Variable']}: {e}")
+        return allocator
+
+    @classmethod
+    def from_workbook(cls, path: str, limits: Dict[str, int] = None) -> "SlotAllocator":
+        """Index the variables of an existing SDR workbook (see read_sdr_workbook)"""
+        from src.processors.sdr_workbook import read_sdr_workbook
+        return cls.from_sdr(read_sdr_workbook(path), limits)
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _check_range(self, key: str, number: int) -> None:
+        if not 1 <= number <= self.limits[key]:
+            raise SlotError(f"{SDR_KINDS[key]}{number} is outside the available range "
+                            f"(1-{self.limits[key]})")
+
+    def owner(self, key: str, number: int) -> Optional[str]:
+        """Business Name holding the slot, or None if it is free"""
+        return self._owners[key].get(number)
+
+    def slot_of(self, key: str, name: str) -> Optional[int]:
+        """Slot number held by the Business Name, or None"""
+        return self._slots[key].get(name_key(name))
+
+    def used(self, key: str) -> List[int]:
+        return sorted(self._owners[key])
+
+    def free_count(self, key: str) -> int:
+        return self.limits[key] - len(self._owners[key])
+
+    # ------------------------------------------------------------------
+    # Allocation
+    # ------------------------------------------------------------------
+
+    def claim(self, key: str, number: int, name: str) -> int:
+        """
+        Reserve a specific slot for a Business Name
+
+        Claiming a slot the name already holds is a no-op.
+
+        Raises:
+            SlotError: If the slot is out of range or held by another name, or the name
+                already holds another slot
+        """
+        self._check_range(key, number)
+        normalized = name_key(name)
+        owner = self._owners[key].get(number)
+        if owner is not None:
+            if name_key(owner) == normalized:
+                return number
+            raise SlotError(f"{SDR_KINDS[key]}{number} is already allocated to '{owner}'")
+        held = self._slots[key].get(normalized)
+        if held is not None:
+            raise SlotError(f"'{name}' is already allocated to {SDR_KINDS[key]}{held}")
+
+        self._owners[key][number] = name
+        self._slots[key][normalized] = number
+        return number
+
+    def assign(self, key: str, name: str) -> int:
+        """
+        Slot for a Business Name: the one it already holds, else the lowest free slot
+
+        Raises:
+            SlotError: If every slot is taken
+        """
+        held = self._slots[key].get(name_key(name))
+        if held is not None:
+            return held
+
+        freed = self._freed[key]
+        while freed:
+            number = heapq.heappop(freed)
+            if number not in self._owners[key]:
+                return self.claim(key, number, name)
+
+        number = self._cursor[key]
+        while number in self._owners[key]:
+            number += 1
+        if number > self.limits[key]:
+            raise SlotError(f"No free {SDR_KINDS[key]} slot for '{name}' "
+                            f"(all {self.limits[key]} allocated)")
+        self._cursor[key] = number + 1
+        return self.claim(key, number, name)
+
+    def release(self, key: str, number: int) -> None:
+        """Free a slot so assign() can hand it out again"""
+        name = self._owners[key].pop(number, None)
+        if name is None:
+            return
+        del self._slots[key][name_key(name)]
+        if number < self._cursor[key]:
+            heapq.heappush(self._freed[key], number)
+
+    # ------------------------------------------------------------------
+    # SDRs
+    # ------------------------------------------------------------------
+
+    def allocate_sdr(self, sdr: dict, keep_numbers: bool = True) -> Tuple[dict, dict]:
+        """
+        Number the variables of an SDR against this index
+
+        A Business Name that already holds a slot keeps it. With keep_numbers, a row
+        whose number is free (or already its own) keeps its number too; every other row
+        gets the lowest free slot. Rows with the same Business Name become one row with
+        their requirement IDs combined; rows that find no free slot are dropped.
+
+        Args:
+            sdr: {evars, props, events} rows
+            keep_numbers: Keep the numbers proposed by the SDR where possible
+
+        Returns:
+            Tuple of (renumbered SDR, report with per-key "renumbered" changes, "merged"
+            row counts and "overflow" names)
+        """
+        result = {}
+        report = {"renumbered": {}, "merged": {}, "overflow": {}}
+        for key in SDR_KINDS:
+            renumbered, overflow = [], []
+            pending = []
+            for row in sdr.get(key, []):
+                name = row.get("Business Name") or row.get("Analytics Variable", "")
+                number = self.slot_of(key, name)
+                parsed = parse_variable(row.get("Analytics Variable", ""))
+                if number is None and keep_numbers and parsed and parsed[0] == key:
+                    try:
+                        number = self.claim(key, parsed[1], name)
+                    except SlotError:
+                        number = None
+                pending.append((row, name, number))
+
+            kept = {}  # number -> row
+            requirement_ids = {}  # number -> ordered set of requirement IDs
+            merged = 0
+            for row, name, number in pending:
+                if number is None:
+                    try:
+                        number = self.assign(key, name)
+                    except SlotError:
+                        overflow.append(name)
+                        continue
+                ids = requirement_ids.setdefault(number, {})
+                ids.update(dict.fromkeys(
+                    i.strip() for i in row.get("Requirement ID", "").split(",") if i.strip()
+                ))
+                if number in kept:
+                    merged += 1
+                    continue
+                variable = f"{SDR_KINDS[key]}{number}"
+                if row.get("Analytics Variable") != variable:
+                    renumbered.append(f"{row.get('Analytics Variable') or '?'} -> {variable}")
+                kept[number] = dict(row, **{"Analytics Variable": variable})
+
+            for number, row in kept.items():
+                row["Requirement ID"] = ", ".join(requirement_ids[number])
+            result[key] = [kept[number] for number in sorted(kept)]
+            report["renumbered"][key] = renumbered
+            report["merged"][key] = merged
+            report["overflow"][key] = overflow
+        return result, report
+
+    def validate_sdr(self, sdr: dict) -> List[str]:
+        """
+        Check the numbering of an SDR without changing it
+
+        Reports malformed or out-of-range variables, slots used for several Business
+        Names, names spread over several slots, and slots held by another name in this
+        index (e.g. one loaded from the production SDR).
+        """
+        issues = []
+        for key in SDR_KINDS:
+            names: Dict[int, set] = {}
+            slots: Dict[str, set] = {}
+            for row in sdr.get(key, []):
+                variable = row.get("Analytics Variable", "")
+                parsed = parse_variable(variable)
+                if not parsed or parsed[0] != key:
+                    issues.append(f"{key}: '{variable}' is not a valid "
+                                  f"{SDR_KINDS[key]} variable")
+                    continue
+                number = parsed[1]
+                if not 1 <= number <= self.limits[key]:
+                    issues.append(f"{variable} is outside the available range "
+                                  f"(1-{self.limits[key]})")
+                    continue
+                name = row.get("Business Name", "")
+                names.setdefault(number, set()).add(name_key(name))
+                slots.setdefault(name_key(name), set()).add(number)
+                owner = self._owners[key].get(number)
+                if owner is not None and name_key(owner) != name_key(name):
+                    issues.append(f"{variable} is allocated to '{owner}', not '{name}'")
+
+            for number, defined_as in sorted(names.items()):
+                if len(defined_as) > 1:
+                    issues.append(f"{SDR_KINDS[key]}{number} is allocated to several "
+                                  f"purposes: {', '.join(sorted(defined_as))}")
+            for name, numbers in sorted(slots.items()):
+                if len(numbers) > 1:
+                    issues.append(f"'{name}' is allocated to several {key}: " + ", ".join(
+                        f"{SDR_KINDS[key]}{number}" for number in sorted(numbers)))
+        return issues
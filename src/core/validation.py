@@ -0,0 +1,208 @@
+"""
+Structured validation of generated BRD/SDR documents
+
+Provides the typed report returned by the structured validation prompt and a cheap
+rule-based pre-validator that can reject clearly broken drafts without an LLM call.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from src.utils.sections import section_number, split_sections
+
+
+# Highest variable numbers available in an Adobe Analytics report suite
+VARIABLE_LIMITS = {"evar": 250, "prop": 75, "event": 1000}
+
+# Minimum length for a section to count as written rather than stubbed
+MIN_SECTION_CHARS = 200
+
+_VARIABLE_RE = re.compile(r"^(evar|prop|event)(\d+)$", re.IGNORECASE)
+_PLACEHOLDER_RE = re.compile(r"\b(TBD|TODO|lorem ipsum)\b|\[(insert|placeholder)[^\]]*\]",
+                             re.IGNORECASE)
+
+
+class ValidationIssue(BaseModel):
+    """A single problem found in the document"""
+    section: str = Field(default="", description="Section number, e.g. '4'")
+    description: str
+    severity: str = Field(default="medium", description="high, medium or low")
+
+
+class ValidationReport(BaseModel):
+    """Typed validation result"""
+    score: int = Field(ge=1, le=10)
+    issues: List[ValidationIssue] = Field(default_factory=list)
+    sections_affected: List[str] = Field(default_factory=list)
+    summary: str = ""
+    source: str = "llm"  # "llm" or "rules"
+
+    def feedback(self) -> str:
+        """Render the report as plain-text feedback for the revision step"""
+        lines = [f"Quality score: {self.score}/10"]
+        if self.summary:
+            lines.append(self.summary)
+        for issue in self.issues:
+            where = f"Section {issue.section}" if issue.section else "General"
+            lines.append(f"- [{issue.severity}] {where}: {issue.description}")
+        return "\n".join(lines)
+
+
+def _extract_json(text: str) -> str:
+    """Return the JSON object in a response, tolerating code fences and preamble"""
+    fenced = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
+    if fenced:
+        return fenced.group(1)
+    start, end = text.find("{"), text.rfind("}")
+    return text[start:end + 1] if start != -1 and end > start else text
+
+
+def parse_validation_report(text: str) -> Optional[ValidationReport]:
+    """Parse the structured validation response, or return None if it is not valid JSON"""
+    try:
+        report = ValidationReport.model_validate_json(_extract_json(text))
+    except (ValidationError, json.JSONDecodeError, ValueError):
+        return None
+
+    # Make sure every section mentioned by an issue is listed as affected
+    affected = list(dict.fromkeys(
+        report.sections_affected + [issue.section for issue in report.issues if issue.section]
+    ))
+    return report.model_copy(update={"sections_affected": affected, "source": "llm"})
+
+
+# Header keywords that identify the column holding a variable's business name
+_NAME_HEADERS = ("name", "purpose", "description", "label")
+_SEPARATOR_RE = re.compile(r"^:?-{3,}:?$")
+
+
+def _markdown_tables(text: str) -> List[List[List[str]]]:
+    """Split markdown text into tables, each a list of rows of stripped cells"""
+    tables: List[List[List[str]]] = []
+    current: List[List[str]] = []
+    for line in text.splitlines() + [""]:
+        if line.lstrip().startswith("|"):
+            cells = [cell.strip().strip("`*").strip() for cell in line.strip().strip("|").split("|")]
+            if not all(_SEPARATOR_RE.match(cell) for cell in cells if cell):
+                current.append(cells)
+        elif current:
+            tables.append(current)
+            current = []
+    return tables
+
+
+def _name_column(header: List[str], variable_column: int) -> Optional[int]:
+    """Return the index of the business-name column in a table header, if any"""
+    for keyword in _NAME_HEADERS:
+        for index, title in enumerate(header):
+            if index != variable_column and keyword in title.lower():
+                return index
+    return None
+
+
+def _variable_collisions(section_text: str) -> List[ValidationIssue]:
+    """
+    Find out-of-range slots and variables defined more than once with different names
+
+    Names are only compared within a variables table, i.e. a table whose header has a
+    name/purpose column; other tables (data layer mappings, page matrices) that merely
+    reference the same variable are not definitions.
+    """
+    issues = []
+    for table in _markdown_tables(section_text):
+        header, rows = table[0], table[1:]
+        variable_column = None
+        for row in rows:
+            for index, cell in enumerate(row):
+                match = _VARIABLE_RE.match(cell)
+                if not match:
+                    continue
+                kind, number = match.group(1).lower(), int(match.group(2))
+                if number < 1 or number > VARIABLE_LIMITS[kind]:
+                    issues.append(ValidationIssue(
+                        section="4", severity="high",
+                        description=f"{cell} is outside the available range "
+                                    f"(1-{VARIABLE_LIMITS[kind]})"
+                    ))
+                if variable_column is None:
+                    variable_column = index
+                break
+
+        if variable_column is None:
+            continue
+        name_column = _name_column(header, variable_column)
+        if name_column is None:
+            continue
+
+        names: Dict[str, set] = {}
+        for row in rows:
+            if max(variable_column, name_column) >= len(row):
+                continue
+            match = _VARIABLE_RE.match(row[variable_column])
+            name = row[name_column].lower()
+            if match and name:
+                variable = f"{match.group(1).lower()}{int(match.group(2))}"
+                names.setdefault(variable, set()).add(name)
+
+        for variable, defined_as in sorted(names.items()):
+            if len(defined_as) > 1:
+                issues.append(ValidationIssue(
+                    section="4", severity="high",
+                    description=f"{variable} is allocated to several purposes: "
+                                f"{', '.join(sorted(defined_as))}"
+                ))
+    return issues
+
+
+def prevalidate(document: str, section_titles: List[str]) -> Optional[ValidationReport]:
+    """
+    Run local rule checks on a BRD/SDR draft
+
+    Returns a report only when the draft is clearly broken (missing sections, variable
+    collisions or out-of-range slots). Passing the rules is not evidence of quality, so
+    every other draft returns None and still gets an LLM review.
+    """
+    sections = split_sections(document)
+    errors: List[ValidationIssue] = []
+    warnings: List[ValidationIssue] = []
+
+    for title in section_titles:
+        number = section_number(title)
+        text = sections.get(number)
+        if text is None:
+            errors.append(ValidationIssue(
+                section=number, severity="high", description=f"Section '{title}' is missing"
+            ))
+        elif len(text) < MIN_SECTION_CHARS:
+            warnings.append(ValidationIssue(
+                section=number, severity="medium", description=f"Section '{title}' is too brief"
+            ))
+
+    for number, text in sections.items():
+        if _PLACEHOLDER_RE.search(text):
+            warnings.append(ValidationIssue(
+                section=number, severity="medium",
+                description="Contains placeholder text (TBD/TODO/[insert ...])"
+            ))
+
+    tracking_spec = sections.get("4", "")
+    errors.extend(_variable_collisions(tracking_spec))
+    if "4" in sections and not re.search(r"\b(eVar|prop)\d+\b", tracking_spec, re.IGNORECASE):
+        warnings.append(ValidationIssue(
+            section="4", severity="medium", description="No eVar/prop allocations found"
+        ))
+
+    if errors:
+        issues = errors + warnings
+        return ValidationReport(
+            score=max(1, min(7, 10 - 2 * len(errors) - len(warnings))),
+            issues=issues,
+            sections_affected=list(dict.fromkeys(issue.section for issue in issues)),
+            summary="Rule-based checks found structural problems.",
+            source="rules",
+        )
+
+    return None
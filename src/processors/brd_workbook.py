@@ -0,0 +1,114 @@
+"""
+BRD workbook processor
+
+Reads the business requirement rows of a BRD workbook (see the "Requirements" sheet
+of n8n-cloud/v0.4/AA_BRD_SDR_Test_01122026.xlsx) for SDRWorkflow. The sheet is
+streamed with openpyxl's read-only mode, like the discovery workbook processor.
+"""
+
+from typing import Iterator, List, NamedTuple, Optional
+
+from openpyxl import load_workbook
+
+
+REQUIREMENTS_SHEET = "Requirements"
+
+# Header labels of the requirements table
+ID_HEADER = "requirement id"
+CATEGORY_HEADER = "category"
+REQUIREMENT_HEADER = "business requirement"
+NOTES_HEADER = "additional notes"
+
+
+class BRDRequirement(NamedTuple):
+    """One business requirement row"""
+    id: str
+    category: str
+    requirement: str
+    notes: str
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "category": self.category,
+            "requirement": self.requirement,
+            "notes": self.notes,
+        }
+
+
+def _text(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip() if value is not None else ""
+
+
+def _cell(row: tuple, column: Optional[int]) -> str:
+    return _text(row[column]) if column is not None and column < len(row) else ""
+
+
+def _next_id(previous: str, index: int) -> str:
+    """ID for a row whose ID cell is empty or an uncached formula (e.g. =B7+1)"""
+    return str(int(previous) + 1) if previous.isdigit() else f"REQ-{index}"
+
+
+def iter_brd_requirements(path: str,
+                          sheet_name: str = REQUIREMENTS_SHEET) -> Iterator[BRDRequirement]:
+    """
+    Stream the requirement rows below the "Requirement ID" header of a BRD sheet
+
+    Rows with neither a category nor a requirement are skipped; a missing category
+    becomes "General".
+
+    Args:
+        path: Path to the .xlsx workbook
+        sheet_name: Requirements sheet (the first sheet is used if it does not exist)
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_name in workbook.sheetnames:
+            sheet = workbook[sheet_name]
+        else:
+            sheet = workbook.worksheets[0]
+        columns = None
+        previous_id = ""
+        index = 0
+        for row in sheet.iter_rows(values_only=True):
+            if columns is None:
+                header = [_text(v).lower() for v in row]
+                if ID_HEADER in header:
+                    columns = {
+                        label: header.index(label) if label in header else None
+                        for label in (ID_HEADER, CATEGORY_HEADER, REQUIREMENT_HEADER,
+                                      NOTES_HEADER)
+                    }
+                continue
+
+            category = _cell(row, columns[CATEGORY_HEADER])
+            requirement = _cell(row, columns[REQUIREMENT_HEADER])
+            requirement_id = _cell(row, columns[ID_HEADER])
+            index += 1
+            if not requirement_id or requirement_id.startswith("="):
+                requirement_id = _next_id(previous_id, index)
+            previous_id = requirement_id
+
+            if not category and not requirement:
+                continue
+
+            yield BRDRequirement(
+                id=requirement_id,
+                category=category or "General",
+                requirement=requirement,
+                notes=_cell(row, columns[NOTES_HEADER]),
+            )
+    finally:
+        workbook.close()
+
+
+def read_brd_requirements(path: str, sheet_name: str = REQUIREMENTS_SHEET) -> List[dict]:
+    """
+    Read the requirements of a BRD workbook as dicts for SDRWorkflow.run
+
+    Returns:
+        [{"id": ..., "category": ..., "requirement": ..., "notes": ...}, ...]
+    """
+    return [row.to_dict() for row in iter_brd_requirements(path, sheet_name)]
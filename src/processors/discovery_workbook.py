@@ -0,0 +1,148 @@
+"""
+Discovery workbook processor
+
+Turns a discovery questionnaire workbook (see
+base-docs/1_discovery/AA_Project-Discovery-Template_Internal_en-us.xlsx) into the
+discovery dict accepted by BRDSDRWorkflow.run. The workbook is read with openpyxl's
+read-only streaming mode, one row at a time, so memory stays flat regardless of how
+many rows a sheet has.
+"""
+
+from typing import Iterator, NamedTuple, Optional
+
+from openpyxl import load_workbook
+
+
+# Header labels that identify the question table (matched case-insensitively)
+QUESTION_HEADER = "question"
+ANSWER_HEADERS = ("feedback", "answer", "response")
+ID_HEADERS = ("id", "#", "no")
+CATEGORY_HEADERS = ("type", "category", "section")
+
+# Labels in the block above the question table, mapped to client_info keys
+METADATA_LABELS = {
+    "company name": "company_name",
+    "consultant(s)": "consultants",
+    "consultants": "consultants",
+    "industry": "industry",
+    "website": "website",
+}
+
+
+class DiscoveryRow(NamedTuple):
+    """One question of the discovery questionnaire"""
+    sheet: str
+    row: int
+    id: Optional[str]
+    category: str
+    question: str
+    answer: str
+
+
+def _text(value) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def _cell(row: tuple, column: Optional[int]) -> str:
+    return _text(row[column]) if column is not None and column < len(row) else ""
+
+
+def _find_column(header: list, labels) -> Optional[int]:
+    for index, value in enumerate(header):
+        if value in labels:
+            return index
+    return None
+
+
+def _metadata(row: tuple) -> dict:
+    """Pick 'Label | value' pairs out of a metadata row"""
+    found = {}
+    cells = [_text(v) for v in row]
+    for index, cell in enumerate(cells):
+        key = METADATA_LABELS.get(cell.lower())
+        if key is None:
+            continue
+        value = next((c for c in cells[index + 1:] if c), "")
+        if value and value.lower() not in METADATA_LABELS:
+            found[key] = value
+    return found
+
+
+def iter_discovery_rows(path: str, client_info: dict = None) -> Iterator[DiscoveryRow]:
+    """
+    Stream the questions of every questionnaire sheet in a discovery workbook
+
+    Sheets without a "Question" header row are skipped. Metadata found above the
+    header (company name, consultants) is written into client_info if given.
+
+    Args:
+        path: Path to the .xlsx workbook
+        client_info: Optional dict to collect workbook metadata into
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            columns = None
+            for row_number, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                if columns is None:
+                    header = [_text(v).lower() for v in row]
+                    question = _find_column(header, (QUESTION_HEADER,))
+                    if question is None:
+                        if client_info is not None:
+                            client_info.update(_metadata(row))
+                        continue
+                    columns = (
+                        _find_column(header, ID_HEADERS),
+                        _find_column(header, CATEGORY_HEADERS),
+                        question,
+                        _find_column(header, ANSWER_HEADERS),
+                    )
+                    continue
+
+                id_col, category_col, question_col, answer_col = columns
+                question_text = _cell(row, question_col)
+                if not question_text:
+                    continue
+
+                yield DiscoveryRow(
+                    sheet=sheet.title,
+                    row=row_number,
+                    id=_cell(row, id_col) or None,
+                    category=_cell(row, category_col) or sheet.title,
+                    question=question_text,
+                    answer=_cell(row, answer_col),
+                )
+    finally:
+        workbook.close()
+
+
+def read_discovery_workbook(path: str, include_unanswered: bool = False) -> dict:
+    """
+    Convert a discovery questionnaire workbook into a discovery dict
+
+    Returns:
+        {
+            "client_info": {"company_name": ..., "consultants": ...},
+            "questionnaire": {
+                "<category>": [{"id": ..., "question": ..., "answer": ...}, ...],
+                ...
+            }
+        }
+
+    Args:
+        path: Path to the .xlsx workbook
+        include_unanswered: Keep questions with an empty answer (dropped by default,
+            since they carry no client information and only cost prompt tokens)
+    """
+    client_info = {}
+    questionnaire = {}
+    for row in iter_discovery_rows(path, client_info):
+        if not row.answer and not include_unanswered:
+            continue
+        entry = {"id": row.id, "question": row.question, "answer": row.answer}
+        questionnaire.setdefault(row.category, []).append(entry)
+
+    return {
+        "client_info": client_info,
+        "questionnaire": questionnaire,
+    }
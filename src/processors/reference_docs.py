@@ -0,0 +1,205 @@
+"""
+Reference document processor
+
+Splits the reference artifacts under base-docs (BRD/SDR and discovery workbooks, the
+WebSDK TechSpec, go-live checklists, agent prompt notes) into small text chunks for the
+document index (src/core/doc_index.py). Workbooks are chunked per sheet, one row per
+line; Word documents per heading, with tables flattened to one row per line; markdown
+and text files per heading. Chunks never cross a sheet or heading, so each one carries
+the location it came from, and each sheet or heading section ("part") can be re-chunked
+on its own when only it has changed.
+"""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple
+
+from openpyxl import load_workbook
+
+
+REFERENCE_EXTENSIONS = (".xlsx", ".docx", ".md", ".txt")
+
+# Upper bound on the characters of one chunk (~250 tokens)
+CHUNK_CHARS = 1000
+
+_HEADING_RE = re.compile(r"^#{1,6}\s+(.+)$")
+
+
+class ReferenceChunk(NamedTuple):
+    """One chunk of a reference document"""
+    source: str  # path relative to the corpus root, with "/" separators
+    part: str  # sheet name or heading, numbered when it repeats ("Login Start#2")
+    section: str  # sheet name or heading ("" before the first heading)
+    index: int  # position within the section
+    text: str
+
+    @property
+    def id(self) -> str:
+        return f"{self.source}::{self.part}::{self.index}"
+
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return " ".join(str(value).split())
+
+
+def pack_lines(lines: Iterable[str], size: int = CHUNK_CHARS) -> List[str]:
+    """Group lines into chunks of at most size characters (longer lines are split)"""
+    chunks, current, length = [], [], 0
+    for line in lines:
+        while len(line) > size:
+            if current:
+                chunks.append("\n".join(current))
+                current, length = [], 0
+            chunks.append(line[:size])
+            line = line[size:]
+        if not line:
+            continue
+        if current and length + len(line) + 1 > size:
+            chunks.append("\n".join(current))
+            current, length = [], 0
+        current.append(line)
+        length += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def workbook_sections(path: str) -> Iterator[tuple]:
+    """Yield (sheet name, lines) per sheet; a line joins the non-empty cells of a row"""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            lines = []
+            for values in sheet.iter_rows(values_only=True):
+                cells = [text for text in map(_cell_text, values) if text]
+                if cells:
+                    lines.append(" | ".join(cells))
+            yield sheet.title, lines
+    finally:
+        workbook.close()
+
+
+def docx_sections(path: str) -> Iterator[tuple]:
+    """Yield (heading, lines) per heading of a Word document, tables included in order"""
+    from docx import Document
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = Document(path)
+    heading, lines = "", []
+    for element in document.element.body.iterchildren():
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "p":
+            paragraph = Paragraph(element, document)
+            text = " ".join(paragraph.text.split())
+            if not text:
+                continue
+            style = paragraph.style.name if paragraph.style is not None else ""
+            if style.lower().startswith(("heading", "title")):
+                if lines:
+                    yield heading, lines
+                heading, lines = text, []
+            else:
+                lines.append(text)
+        elif tag == "tbl":
+            for row in Table(element, document).rows:
+                cells = [" ".join(cell.text.split()) for cell in row.cells]
+                cells = [text for text in dict.fromkeys(cells) if text]  # merged cells repeat
+                if cells:
+                    lines.append(" | ".join(cells))
+    if lines:
+        yield heading, lines
+
+
+def text_sections(path: str) -> Iterator[tuple]:
+    """Yield (heading, lines) per markdown heading of a text file"""
+    heading, lines = "", []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            line = raw.strip()
+            match = _HEADING_RE.match(line)
+            if match:
+                if lines:
+                    yield heading, lines
+                heading, lines = match.group(1).strip(), []
+            elif line:
+                lines.append(line)
+    if lines:
+        yield heading, lines
+
+
+def document_sections(path: str) -> Iterator[tuple]:
+    """Yield (section, lines) of any supported reference document"""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".xlsx":
+        return workbook_sections(path)
+    if suffix == ".docx":
+        return docx_sections(path)
+    return text_sections(path)
+
+
+class DocumentPart(NamedTuple):
+    """One sheet or heading section of a reference document"""
+    key: str  # unique within the document (see ReferenceChunk.part)
+    section: str
+    lines: List[str]
+
+    @property
+    def hash(self) -> str:
+        """Content hash of the section name and text"""
+        digest = hashlib.sha256(self.section.encode("utf-8"))
+        for line in self.lines:
+            digest.update(b"\n" + line.encode("utf-8"))
+        return digest.hexdigest()
+
+
+def document_parts(path: str) -> List[DocumentPart]:
+    """Sheet or heading sections of a document, keyed uniquely in document order"""
+    parts, seen = [], {}
+    for section, lines in document_sections(path):
+        seen[section] = seen.get(section, 0) + 1
+        key = section if seen[section] == 1 else f"{section}#{seen[section]}"
+        parts.append(DocumentPart(key, section, lines))
+    return parts
+
+
+def chunk_part(source: str, part: DocumentPart, size: int = CHUNK_CHARS) -> List[ReferenceChunk]:
+    """Split one part into chunks, each starting with a "[document › section]" line"""
+    title = Path(source).stem
+    header = f"[{title} › {part.section}]" if part.section else f"[{title}]"
+    return [
+        ReferenceChunk(source, part.key, part.section, index, f"{header}\n{text}")
+        for index, text in enumerate(pack_lines(part.lines, size))
+    ]
+
+
+def chunk_document(path: str, source: str, size: int = CHUNK_CHARS) -> List[ReferenceChunk]:
+    """
+    Split one reference document into chunks
+
+    Args:
+        path: Path to the document
+        source: Name recorded on the chunks (usually the path relative to the corpus)
+        size: Maximum characters per chunk
+
+    Returns:
+        Chunks in document order
+    """
+    return [chunk for part in document_parts(path) for chunk in chunk_part(source, part, size)]
+
+
+def find_reference_documents(root: str) -> List[str]:
+    """Supported documents under root in sorted order, skipping Office lock files (~$*)"""
+    paths = []
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name.startswith(("~$", ".")) or not name.lower().endswith(REFERENCE_EXTENSIONS):
+                continue
+            paths.append(os.path.join(directory, name))
+    return sorted(paths)
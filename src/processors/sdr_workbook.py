@@ -0,0 +1,74 @@
+"""
+SDR workbook processor
+
+Reads the eVar/prop/event rows of a filled SDR workbook (the layout written by
+n8n-cloud/v0.4/json_to_excel.py) back into the {evars, props, events} structure, so a
+new SDR can be reconciled against the variables a report suite already uses.
+"""
+
+from openpyxl import load_workbook
+
+from src.prompts.sdr_prompts import SDR_FIELDS
+
+
+# SDR key -> accepted sheet names (matched case-insensitively)
+SDR_SHEETS = {
+    "evars": ("eVars",),
+    "props": ("Props",),
+    "events": ("Events", "Custom Events (Metrics)"),
+}
+
+# SDR_FIELDS fill columns B..I from this row down
+SDR_FIRST_ROW = 7
+SDR_FIRST_COLUMN = 2
+
+
+def _find_sheet(workbook, names: tuple):
+    lowered = {name.lower() for name in names}
+    for sheet_name in workbook.sheetnames:
+        if sheet_name.lower() in lowered:
+            return workbook[sheet_name]
+    return None
+
+
+def _text(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip() if value is not None else ""
+
+
+def read_sdr_workbook(path: str, first_row: int = SDR_FIRST_ROW) -> dict:
+    """
+    Read the allocated variables of an SDR workbook
+
+    Template rows that only pre-list a variable (no Business Name) are skipped, as are
+    missing sheets.
+
+    Args:
+        path: Path to the .xlsx workbook
+        first_row: First data row of every SDR sheet
+
+    Returns:
+        {"evars": [...], "props": [...], "events": [...]} with SDR_FIELDS per row
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sdr = {}
+        for key, names in SDR_SHEETS.items():
+            sheet = _find_sheet(workbook, names)
+            sdr[key] = [] if sheet is None else _read_rows(sheet, first_row)
+        return sdr
+    finally:
+        workbook.close()
+
+
+def _read_rows(sheet, first_row: int) -> list:
+    rows = []
+    for values in sheet.iter_rows(min_row=first_row, min_col=SDR_FIRST_COLUMN,
+                                  max_col=SDR_FIRST_COLUMN + len(SDR_FIELDS) - 1,
+                                  values_only=True):
+        row = {field: _text(value) for field, value in zip(SDR_FIELDS, values)}
+        if row.get("Analytics Variable") and row.get("Business Name"):
+            rows.append(row)
+    return rows
+
@@ -0,0 +1,187 @@
+"""
+XDM mapping processor
+
+Loads the data layer → XDM / Analytics variable mapping (n8n-cloud/v0.6/xdm_mapping.csv)
+once into an indexed pandas table and applies it to whole SDR tables with joins rather
+than per-row lookups, so mapping large SDRs takes no LLM call.
+
+Keys are dotted data layer paths (web.webPageDetails.name, productListItems[].SKU) or
+element attributes (data-aa-product-id). A key can map to several targets: XDM paths
+(xdm.*) and Analytics variables (eVar10, "merchandising eVar20").
+"""
+
+import bisect
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+
+ROOT = Path(__file__).resolve().parents[2]
+XDM_MAPPING_CSV = ROOT / "n8n-cloud" / "v0.6" / "xdm_mapping.csv"
+
+# CSV header -> column name in the mapping table
+CSV_COLUMNS = {
+    "Variable Name (Key)": "key",
+    "Type": "type",
+    "XDM Variable (Target)": "target",
+    "Logic / Description": "description",
+}
+
+_VARIABLE_RE = r"^(?P<merchandising>merchandising\s+)?(?P<variable>(?:evar|prop|event)\d+)$"
+
+
+def _pattern_regex(pattern: str) -> re.Pattern:
+    """
+    Compile a key pattern: "*" matches within one path segment, "**" across segments;
+    everything else (including "[]") is literal
+    """
+    parts = re.split(r"(\*\*|\*)", pattern)
+    regex = "".join(
+        ".*" if part == "**" else "[^.]*" if part == "*" else re.escape(part)
+        for part in parts
+    )
+    return re.compile(f"^{regex}$")
+
+
+class XDMMapping:
+    """Indexed data layer key → XDM / Analytics variable mapping"""
+
+    def __init__(self, table: pd.DataFrame):
+        """
+        Args:
+            table: Mapping rows with key, type, target and description columns
+        """
+        table = table.fillna("").astype(str).apply(lambda column: column.str.strip())
+        table = table[(table["key"] != "") & (table["target"] != "")].reset_index(drop=True)
+
+        variables = table["target"].str.lower().str.extract(_VARIABLE_RE)
+        table["variable"] = variables["variable"].fillna("")
+        table["merchandising"] = variables["merchandising"].notna()
+        table["kind"] = "other"
+        table.loc[table["target"].str.startswith("xdm."), "kind"] = "xdm"
+        table.loc[table["variable"] != "", "kind"] = "analytics"
+        self.table = table
+
+        self._rows = table.groupby("key", sort=False).indices  # key -> row positions
+        self._keys = sorted(self._rows)
+        self._by_variable = self._variable_table()
+
+    @classmethod
+    def from_csv(cls, path=XDM_MAPPING_CSV) -> "XDMMapping":
+        table = pd.read_csv(path, dtype=str, keep_default_na=False)
+        return cls(table.rename(columns=CSV_COLUMNS)[list(CSV_COLUMNS.values())])
+
+    def _variable_table(self) -> pd.DataFrame:
+        """One row per Analytics variable: its data layer keys and their XDM paths"""
+        analytics = self.table.loc[self.table["kind"] == "analytics",
+                                   ["variable", "key", "merchandising"]]
+        xdm = self.table.loc[self.table["kind"] == "xdm", ["key", "target"]]
+        joined = analytics.merge(xdm, on="key", how="left").fillna({"target": ""})
+
+        def unique(values):
+            return "; ".join(dict.fromkeys(value for value in values if value))
+
+        return joined.groupby("variable", sort=False).agg(
+            data_layer_keys=("key", unique),
+            xdm_paths=("target", unique),
+            merchandising=("merchandising", "any"),
+        )
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def keys(self, pattern: str) -> List[str]:
+        """
+        Keys matching a pattern, in sorted order
+
+        Args:
+            pattern: An exact key; a dotted prefix ending in "." or ".*"
+                ("web.webPageDetails.*" → every key below it); or a pattern with
+                "*" (one path segment) / "**" (any number of segments)
+        """
+        if pattern in self._rows:
+            return [pattern]
+        if pattern.endswith(".*") and "*" not in pattern[:-2]:
+            pattern = pattern[:-1]
+        if "*" not in pattern:
+            if not pattern.endswith("."):
+                return []
+            start = bisect.bisect_left(self._keys, pattern)
+            end = bisect.bisect_left(self._keys, pattern[:-1] + "/")  # "/" sorts after "."
+            return self._keys[start:end]
+
+        regex = _pattern_regex(pattern)
+        return [key for key in self._keys if regex.match(key)]
+
+    def lookup(self, pattern: str, kind: Optional[str] = None) -> pd.DataFrame:
+        """
+        Mapping rows for the keys matching a pattern (see keys())
+
+        Args:
+            pattern: Key or key pattern
+            kind: Only "xdm", "analytics" or "other" targets (default: all)
+        """
+        positions = [position for key in self.keys(pattern) for position in self._rows[key]]
+        rows = self.table.iloc[sorted(positions)]
+        return rows if kind is None else rows[rows["kind"] == kind]
+
+    def targets(self, key: str) -> List[str]:
+        """Every target of an exact key, in CSV order"""
+        return self.table["target"].iloc[self._rows.get(key, [])].tolist()
+
+    # ------------------------------------------------------------------
+    # Vectorized mapping
+    # ------------------------------------------------------------------
+
+    def map_keys(self, keys: Iterable[str]) -> pd.DataFrame:
+        """Join data layer keys to their targets (one output row per key and target)"""
+        frame = pd.DataFrame({"key": list(keys)})
+        return frame.merge(self.table[["key", "kind", "target", "variable"]],
+                           on="key", how="left").fillna("")
+
+    def map_sdr_frame(self, frame: pd.DataFrame,
+                      variable_column: str = "Analytics Variable") -> pd.DataFrame:
+        """
+        Add "Data Layer Key" and "XDM Path" columns to an SDR table
+
+        Rows are matched on their Analytics Variable (case and spacing ignored);
+        variables the mapping does not cover get empty strings.
+        """
+        variables = (frame[variable_column].fillna("").astype(str)
+                     .str.replace(r"\s+", "", regex=True).str.lower())
+        mapped = self._by_variable.reindex(variables)
+        result = frame.copy()
+        result["Data Layer Key"] = mapped["data_layer_keys"].fillna("").to_numpy()
+        result["XDM Path"] = mapped["xdm_paths"].fillna("").to_numpy()
+        return result
+
+    def map_sdr(self, sdr: dict) -> dict:
+        """
+        Map every sheet of an {evars, props, events} SDR (see map_sdr_frame)
+
+        Returns:
+            A new SDR whose rows carry "Data Layer Key" and "XDM Path"
+        """
+        mapped = {}
+        for key, rows in sdr.items():
+            if not rows:
+                mapped[key] = []
+                continue
+            frame = self.map_sdr_frame(pd.DataFrame(
+                {"Analytics Variable": [row.get("Analytics Variable", "") for row in rows]}
+            ))
+            mapped[key] = [
+                dict(row, **{"Data Layer Key": keys, "XDM Path": paths})
+                for row, keys, paths in zip(rows, frame["Data Layer Key"], frame["XDM Path"])
+            ]
+        return mapped
+
+
+@lru_cache(maxsize=8)
+def load_xdm_mapping(path: str = str(XDM_MAPPING_CSV)) -> XDMMapping:
+    """Load a mapping CSV once per process"""
+    return XDMMapping.from_csv(path)
@@ -1,13 +1,14 @@
 """
 Prompts for BRD/SDR generation from Discovery document
+
+The static instructions of every prompt come before its first field, so repeated calls
+start with an identical prefix that provider-side prompt caching can reuse; the inputs
+that change per call follow at the end. See src/prompts/registry.py.
 """
 
 ANALYSIS_PROMPT = """You are an Adobe Analytics expert consultant analyzing a client's discovery document.
 
-DISCOVERY DOCUMENT:
-{discovery_content}
-
-Your task is to analyze this discovery document and extract:
+Your task is to analyze the discovery document below and extract:
 
 1. Business Context
    - What is the client trying to achieve?
@@ -29,17 +30,14 @@ Your task is to analyze this discovery document and extract:
    - What are the acceptance criteria?
 
 Provide a structured analysis in JSON format with these sections.
+
+DISCOVERY DOCUMENT:
+{discovery_content}
 """
 
 REASONING_PROMPT = """You are an Adobe Analytics solution architect designing an implementation strategy.
 
-ANALYSIS:
-{analysis}
-
-DISCOVERY CONTEXT:
-{discovery_content}
-
-Think step-by-step to design an Adobe Analytics solution:
+Based on the analysis and discovery context below, think step-by-step to design an Adobe Analytics solution:
 
 Step 1: Event Design
 - What events need to be tracked for this business?
@@ -63,20 +61,17 @@ Step 4: Implementation Strategy
 
 Provide your reasoning with clear justifications for each decision.
 Focus on e-commerce best practices for Adobe Analytics.
-"""
 
-BRD_SDR_GENERATION_PROMPT = """You are creating a Business Requirements Document (BRD) and Solution Design Reference (SDR) for Adobe Analytics implementation.
-
-DISCOVERY DOCUMENT:
+DISCOVERY CONTEXT:
 {discovery_content}
 
 ANALYSIS:
 {analysis}
+"""
 
-REASONING & DESIGN DECISIONS:
-{reasoning}
+BRD_SDR_GENERATION_PROMPT = """You are creating a Business Requirements Document (BRD) and Solution Design Reference (SDR) for Adobe Analytics implementation.
 
-Create a comprehensive BRD/SDR document with the following structure:
+Using the discovery document, analysis and design decisions below, create a comprehensive BRD/SDR document with the following structure:
 
 ## 1. EXECUTIVE SUMMARY
 - Project overview
@@ -138,15 +133,105 @@ Create a table showing what variables are captured on each page type
 
 Make this detailed, specific to e-commerce, and follow Adobe Analytics best practices.
 Use realistic variable allocations (e.g., eVar1, eVar2, prop1, event1, etc.).
+
+DISCOVERY DOCUMENT:
+{discovery_content}
+
+ANALYSIS:
+{analysis}
+
+REASONING & DESIGN DECISIONS:
+{reasoning}
 """
 
-VALIDATION_PROMPT = """Review the generated BRD/SDR document for quality and completeness.
+# Sections of the BRD/SDR in canonical order: (heading, what the section must cover).
+# Used by the section-parallel generation mode, which renders each one independently.
+BRD_SDR_SECTIONS = [
+    ("1. EXECUTIVE SUMMARY", """- Project overview
+- Business objectives
+- Expected outcomes"""),
+    ("2. BUSINESS REQUIREMENTS", """- Key business questions to answer
+- Critical KPIs and metrics
+- User journeys to track
+- Success criteria"""),
+    ("3. SOLUTION DESIGN OVERVIEW", """- Adobe Analytics configuration approach
+- Tracking methodology
+- Data collection strategy"""),
+    ("4. DETAILED TRACKING SPECIFICATIONS", """### 4.1 Events Tracking
+For each event, specify:
+- Event name
+- Trigger condition
+- Business purpose
+- Priority (P0/P1/P2)
 
-ORIGINAL DISCOVERY:
+### 4.2 Variables (eVars & Props)
+For each variable, specify:
+- Variable name
+- Variable type (eVar/prop)
+- Allocation type (Most Recent, Original Value, Linear, etc.)
+- Expiration
+- Purpose and usage
+- Sample values
+
+### 4.3 Success Events
+- Custom event definitions
+- Counter vs numeric events
+- Event serialization requirements
+
+### 4.4 Data Layer Specification
+- Page-level data layer structure
+- Event-level data layer structure
+- Naming conventions"""),
+    ("5. PAGE/SCREEN TRACKING MATRIX", """Create a table showing what variables are captured on each page type"""),
+    ("6. IMPLEMENTATION APPROACH", """- Recommended implementation phases
+- Prerequisites and dependencies
+- Testing strategy
+- Rollout plan"""),
+    ("7. REPORTING REQUIREMENTS", """- Key reports needed
+- Dashboard requirements
+- Segmentation strategy"""),
+]
+
+BRD_SDR_SECTION_PROMPT = """You are writing one section of a Business Requirements Document (BRD) and Solution Design Reference (SDR) for Adobe Analytics implementation.
+
+Make it detailed, specific to e-commerce, and follow Adobe Analytics best practices.
+Use exactly the variable allocations (eVar, prop, event numbers) decided in the reasoning below
+so the section stays consistent with the other sections.
+
+DISCOVERY DOCUMENT:
 {discovery_content}
 
-GENERATED BRD/SDR:
-{brd_sdr}
+ANALYSIS:
+{analysis}
+
+REASONING & DESIGN DECISIONS:
+{reasoning}
+
+The document has these sections, each written separately:
+{section_list}
+
+Write ONLY the following section, starting with its heading exactly as shown:
+
+## {section_title}
+{section_instructions}
+"""
+
+# Appended to BRD_SDR_SECTION_PROMPT when only part of a discovery document changed and the
+# analysis/reasoning from the previous run are reused
+BRD_SDR_SECTION_CHANGES_NOTE = """
+NOTE: The discovery document was updated after the analysis and reasoning above were written.
+Changed fields: {changed_fields}
+Cover these changes in this section. If they need new variables, allocate numbers after the
+highest eVar, prop and event numbers already used in the reasoning.
+"""
+
+REFERENCE_NOTE = """
+REFERENCE MATERIAL (excerpts from our templates and past deliverables, retrieved for this step;
+follow their conventions and naming where they apply and ignore excerpts that do not):
+{reference}
+"""
+
+VALIDATION_PROMPT = """Review the generated BRD/SDR document below for quality and completeness.
 
 Check the following:
 
@@ -175,4 +260,70 @@ Provide:
 - List of issues found (if any)
 - Suggestions for improvement
 - A revised version if score < 8
+
+ORIGINAL DISCOVERY:
+{discovery_content}
+
+GENERATED BRD/SDR:
+{brd_sdr}
+"""
+
+STRUCTURED_VALIDATION_PROMPT = """Review the generated BRD/SDR document below for quality and completeness.
+
+Check the following:
+
+1. Completeness - are all discovery requirements, tracking specifications and critical user journeys covered?
+2. Technical Accuracy - are variable allocations appropriate, the data layer design sound and event definitions clear?
+3. Best Practices - does it follow Adobe Analytics best practices, scale for future needs and use consistent naming?
+4. Clarity - is it clear and unambiguous enough for developers to implement?
+
+Respond with ONLY a JSON object, no other text, in exactly this shape:
+{{
+  "score": <integer quality score 1-10>,
+  "issues": [
+    {{"section": "<section number, e.g. 4>", "description": "<what is wrong and how to fix it>", "severity": "high|medium|low"}}
+  ],
+  "sections_affected": ["<section numbers that need revision>"],
+  "summary": "<one or two sentence overall assessment>"
+}}
+
+Do not include a revised version of the document.
+
+ORIGINAL DISCOVERY:
+{discovery_content}
+
+GENERATED BRD/SDR:
+{brd_sdr}
+"""
+
+SECTION_REVISION_PROMPT = """You are revising one section of a Business Requirements Document (BRD) and Solution Design Reference (SDR) for Adobe Analytics implementation.
+
+Rewrite ONLY the section below so that it addresses every issue listed. Keep everything that is
+already correct, keep the heading exactly as shown, and keep the existing eVar, prop and event
+numbers unless an issue says they collide. Return only the revised section.
+
+CURRENT SECTION:
+{section_text}
+
+ISSUES FOUND IN THIS SECTION:
+{issues}
+
+OVERALL REVIEW SUMMARY:
+{summary}
+"""
+
+REVISION_PROMPT = """Revise the BRD/SDR document below based on the validation feedback.
+Provide an improved version addressing all the issues mentioned.
+
+ORIGINAL DOCUMENT:
+{brd_sdr}
+
+VALIDATION FEEDBACK:
+{feedback}
+"""
+
+# Prefixed to the document in the validation prompts when only revised sections are re-checked
+PARTIAL_VALIDATION_NOTE = """(Only the sections revised in response to the previous review are shown below.
+The remaining sections were already validated; judge only these sections.)
+
 """
@@ -0,0 +1,183 @@
+"""
+Prompt registry
+
+Every prompt template is parsed once into literal text and field slots, so rendering is
+a join instead of a str.format parse per call. Token counts of the literal text are
+cached per model, which makes the token count of a rendered prompt cheap to report:
+cached literal tokens plus the tokens of the field values (an estimate that can differ
+from the exact count by a few tokens at the seams).
+
+Templates keep their static instructions ahead of the first field, so repeated calls
+share a byte-identical prefix that provider-side prompt caching can reuse.
+"""
+
+import threading
+from string import Formatter
+from typing import Dict, List, Tuple
+
+from src.core.context import count_tokens
+from src.prompts.brd_sdr_prompts import (
+    ANALYSIS_PROMPT,
+    BRD_SDR_GENERATION_PROMPT,
+    BRD_SDR_SECTION_CHANGES_NOTE,
+    BRD_SDR_SECTION_PROMPT,
+    REASONING_PROMPT,
+    REFERENCE_NOTE,
+    REVISION_PROMPT,
+    SECTION_REVISION_PROMPT,
+    STRUCTURED_VALIDATION_PROMPT,
+    VALIDATION_PROMPT
+)
+from src.prompts.sdr_prompts import SDR_FIELDS, SDR_GUIDE, SDR_MAPPING_PROMPT
+
+
+class PromptTemplate:
+    """A str.format template parsed once into literal text and field slots"""
+
+    def __init__(self, name: str, template: str):
+        self.name = name
+        self.template = template
+        self._parts: List[Tuple[str, str]] = []  # (literal, field name or "")
+        literal_run = ""
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if spec or conversion:
+                raise ValueError(f"Prompt '{name}': format specs are not supported ({field})")
+            literal_run += literal
+            if field is not None:  # escaped braces split the literal text without a field
+                self._parts.append((literal_run, field))
+                literal_run = ""
+        if literal_run or not self._parts:
+            self._parts.append((literal_run, ""))
+        self.fields = tuple(dict.fromkeys(field for _, field in self._parts if field))
+        self.static_prefix = self._parts[0][0] if self._parts else ""
+        self._literal_tokens: Dict[str, int] = {}
+        self._prefix_tokens: Dict[str, int] = {}
+
+    def partial(self, **fields) -> "PromptTemplate":
+        """Template with some fields (e.g. constant guidelines) baked into the literal text"""
+        def escape(text):
+            return str(text).replace("{", "{{").replace("}", "}}")
+
+        template = "".join(
+            escape(literal) + (
+                "" if not field else escape(fields[field]) if field in fields else f"{{{field}}}"
+            )
+            for literal, field in self._parts
+        )
+        return PromptTemplate(self.name, template)
+
+    def render(self, **fields) -> str:
+        """Fill in the fields (like str.format; extra fields are ignored)"""
+        try:
+            return "".join(
+                literal + (str(fields[field]) if field else "") for literal, field in self._parts
+            )
+        except KeyError as e:
+            raise KeyError(f"Prompt '{self.name}' needs field {e}") from None
+
+    def static_tokens(self, model: str = "gpt-4o") -> int:
+        """Tokens of all literal text (the part of every call that never changes)"""
+        if model not in self._literal_tokens:
+            self._literal_tokens[model] = sum(
+                count_tokens(literal, model) for literal, _ in self._parts
+            )
+        return self._literal_tokens[model]
+
+    def prefix_tokens(self, model: str = "gpt-4o") -> int:
+        """Tokens before the first field (shared verbatim by every call)"""
+        if model not in self._prefix_tokens:
+            self._prefix_tokens[model] = count_tokens(self.static_prefix, model)
+        return self._prefix_tokens[model]
+
+    def count(self, model: str = "gpt-4o", **fields) -> int:
+        """Estimated tokens of the rendered prompt (cached literal tokens + field values)"""
+        return self.static_tokens(model) + sum(
+            count_tokens(str(fields[field]), model) for _, field in self._parts if field
+        )
+
+
+class PromptRegistry:
+    """Named prompt templates with per-template call and token accounting"""
+
+    def __init__(self):
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._usage: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, template: str, **static_fields) -> PromptTemplate:
+        """
+        Compile and register a template
+
+        Args:
+            name: Registry name
+            template: str.format template
+            static_fields: Fields whose value never changes; they are rendered into the
+                template once, so they count towards the static prefix
+        """
+        compiled = PromptTemplate(name, template)
+        if static_fields:
+            compiled = compiled.partial(**static_fields)
+        self._templates[name] = compiled
+        self._usage[name] = {"calls": 0, "tokens": 0}
+        return compiled
+
+    def get(self, name: str) -> PromptTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise KeyError(f"Unknown prompt '{name}'") from None
+
+    def names(self) -> List[str]:
+        return list(self._templates)
+
+    def render(self, name: str, model: str = "gpt-4o", **fields) -> Tuple[str, dict]:
+        """
+        Render a registered template and record its token usage
+
+        Returns:
+            Tuple of (prompt, {"template", "tokens", "static_tokens", "prefix_tokens"})
+        """
+        template = self.get(name)
+        prompt = template.render(**fields)
+        stats = {
+            "template": name,
+            "tokens": template.count(model, **fields),
+            "static_tokens": template.static_tokens(model),
+            "prefix_tokens": template.prefix_tokens(model)
+        }
+        with self._lock:
+            self._usage[name]["calls"] += 1
+            self._usage[name]["tokens"] += stats["tokens"]
+        return prompt, stats
+
+    def report(self, model: str = "gpt-4o") -> Dict[str, dict]:
+        """Per template: static and prefix tokens, calls and rendered tokens so far"""
+        with self._lock:
+            usage = {name: dict(counts) for name, counts in self._usage.items()}
+        return {
+            name: {
+                "static_tokens": template.static_tokens(model),
+                "prefix_tokens": template.prefix_tokens(model),
+                **usage[name]
+            }
+            for name, template in self._templates.items()
+        }
+
+
+# Registry used by the workflows
+PROMPTS = PromptRegistry()
+PROMPTS.register("analysis", ANALYSIS_PROMPT)
+PROMPTS.register("reasoning", REASONING_PROMPT)
+PROMPTS.register("generation", BRD_SDR_GENERATION_PROMPT)
+PROMPTS.register("section", BRD_SDR_SECTION_PROMPT)
+PROMPTS.register("section_changes", BRD_SDR_SECTION_CHANGES_NOTE)
+PROMPTS.register("reference", REFERENCE_NOTE)
+PROMPTS.register("validation", VALIDATION_PROMPT)
+PROMPTS.register("structured_validation", STRUCTURED_VALIDATION_PROMPT)
+PROMPTS.register("revision", REVISION_PROMPT)
+PROMPTS.register("section_revision", SECTION_REVISION_PROMPT)
+PROMPTS.register(
+    "sdr_mapping", SDR_MAPPING_PROMPT,
+    sdr_guide=SDR_GUIDE,
+    fields=", ".join(f'"{field}": "..."' for field in SDR_FIELDS)
+)
@@ -0,0 +1,74 @@
+"""
+Prompts for SDR generation from BRD requirements
+"""
+
+# Conversion guidelines (same rules as the get_sdr_guide tool of the n8n workflow)
+SDR_GUIDE = """## Variable Types
+- eVars: persistent conversion variables (Campaign ID, User Type)
+- Props: page-level traffic variables (Page Name, Device Type)
+- Events: countable actions or numeric/currency metrics (Purchase, Form Submit)
+
+## Mandatory Variables
+- eVars: eVar1 (Page Name), eVar2 (Site Section), eVar3 (ECID)
+- Props: prop1 (Page Name), prop2 (Site Section), prop3 (ECID)
+- Events: event1 (Custom Page View)
+
+## Rules
+- MECE principle: every data point is captured by exactly one variable of each type
+- Limits: 250 eVars, 75 Props, 1000 Events
+- Target for a full BRD: 30-50 eVars, 20-30 Props, 15-25 Events
+"""
+
+# Fields of every SDR row (the columns write_sdr_to_excel fills)
+SDR_FIELDS = [
+    "Requirement ID",
+    "Analytics Variable",
+    "Business Name",
+    "Business Description",
+    "Expected Values",
+    "Implementation Trigger",
+    "Example Value",
+    "Additional Notes",
+]
+
+SDR_MAPPING_PROMPT = """You are an expert Adobe Analytics consultant converting BRD requirements into a Solution Design Reference (SDR).
+
+SDR GUIDELINES:
+{sdr_guide}
+
+Map every requirement below to the eVars, props and/or events that capture it. Every
+requirement must be covered by at least one variable; a variable that serves several
+requirements lists their IDs separated by commas.
+
+The requirements are mapped in batches whose results are merged afterwards, so:
+- Give every data point its standard Business Name (e.g. "Page Name", "Site Section"),
+  the same in every batch; variables with the same Business Name are merged.
+- Number variables from 1 within this batch (eVar1, prop1, event1, ...); final numbers
+  are assigned when the batches are merged.
+- The mandatory variables always exist; reference them by their Business Name when a
+  requirement needs them.
+
+Output ONLY valid JSON, without markdown or explanations, in this shape:
+{{
+  "evars": [{{{fields}}}],
+  "props": [{{{fields}}}],
+  "events": [{{{fields}}}]
+}}
+
+Field rules:
+- "Requirement ID": ID(s) from the requirements below
+- "Analytics Variable": e.g. eVar4, prop5, event3
+- "Business Name": short name, e.g. Page Name
+- "Business Description": what the variable captures and why
+- "Expected Values": value format, e.g. string, lowercase; or Counter / Numeric / Currency for events
+- "Implementation Trigger": when it is set, e.g. every page load, on form submit
+- "Example Value": a realistic example
+- "Additional Notes": eVar allocation/expiration, merchandising, or other notes ("" if none)
+
+If a requirement is ambiguous, make a reasonable best-practice assumption; do not ask questions.
+
+CLIENT: {client_name}
+
+REQUIREMENTS TO MAP ({requirement_count} of {total_requirements}):
+{requirements}
+"""
@@ -0,0 +1,77 @@
+"""
+Helpers for working with the numbered ``## N. TITLE`` sections of a BRD/SDR document
+"""
+
+import re
+from typing import Dict, List
+
+
+_HEADING_RE = re.compile(r"^\s*#{1,6}\s*(\d+)\.")
+_SECTION_RE = re.compile(r"^#{1,2}\s*(\d+)\.\s", re.MULTILINE)
+
+
+def normalize_section(title: str, text: str) -> str:
+    """
+    Make a section start with its canonical ``## <title>`` heading
+
+    The model may restate the heading with different casing or heading level, or omit
+    it; either way the result begins with exactly one canonical heading.
+    """
+    body = text.strip()
+    first_line, _, rest = body.partition("\n")
+    match = _HEADING_RE.match(first_line)
+    if match and title.startswith(f"{match.group(1)}."):
+        body = rest.strip()
+    return f"## {title}\n\n{body}" if body else f"## {title}"
+
+
+def merge_sections(titles: List[str], texts: List[str]) -> str:
+    """Stitch independently generated sections together in canonical order"""
+    return "\n\n".join(normalize_section(title, text) for title, text in zip(titles, texts))
+
+
+def split_sections(document: str) -> Dict[str, str]:
+    """
+    Split a BRD/SDR document into its top-level numbered sections
+
+    Returns a mapping of section number (e.g. "4") to the section text, heading
+    included. Text before the first numbered heading is dropped.
+    """
+    sections = {}
+    matches = list(_SECTION_RE.finditer(document))
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(document)
+        sections[match.group(1)] = document[match.start():end].strip()
+    return sections
+
+
+def section_number(title: str) -> str:
+    """Return the leading number of a section title ("4. DETAILED ..." -> "4")"""
+    return title.split(".", 1)[0].strip()
+
+
+def splice_sections(document: str, replacements: Dict[str, str]) -> str:
+    """
+    Replace numbered sections of a document, keeping everything else untouched
+
+    Sections in ``replacements`` (keyed by number) that the document lacks are inserted
+    in numeric order. Text before the first numbered heading is preserved.
+    """
+    matches = list(_SECTION_RE.finditer(document))
+    preamble = document[:matches[0].start()].strip() if matches else document.strip()
+
+    parts = []
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(document)
+        parts.append((match.group(1), document[match.start():end].strip()))
+
+    present = {number for number, _ in parts}
+    for number in sorted(set(replacements) - present, key=int):
+        position = next(
+            (i for i, (existing, _) in enumerate(parts) if int(existing) > int(number)),
+            len(parts)
+        )
+        parts.insert(position, (number, replacements[number]))
+
+    texts = [replacements.get(number, text).strip() for number, text in parts]
+    return "\n\n".join(([preamble] if preamble else []) + texts)
@@ -2,20 +2,56 @@
 LangGraph workflow for generating BRD/SDR from Discovery document
 """
 
+import asyncio
+import contextvars
 import json
 import os
-from typing import TypedDict, Annotated
+import re
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, TypedDict, Annotated
 from typing_extensions import TypedDict
 
+import aiosqlite
+from langgraph.config import get_config
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
+from langgraph.types import StreamWriter
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
 
-from src.prompts.brd_sdr_prompts import (
-    ANALYSIS_PROMPT,
-    REASONING_PROMPT,
-    BRD_SDR_GENERATION_PROMPT,
-    VALIDATION_PROMPT
+from src.core.context import (
+    SUMMARY_TOKEN_BUDGETS,
+    compact_discovery,
+    count_tokens,
+    summarize_output
+)
+from src.core.doc_index import DocumentIndex, open_doc_index
+from src.core.llm_clients import LLM_SETTINGS, chat_model, check_overrides
+from src.core.incremental import RunSnapshotStore, plan_regeneration
+from src.core.llm_cache import LLMCache
+from src.core.metrics import (
+    RunMetrics,
+    finish_run,
+    instrument_node,
+    record_cache_hit,
+    record_llm_call,
+    start_metrics_server,
+    track_run
+)
+from src.core.validation import ValidationReport, parse_validation_report, prevalidate
+from src.prompts.brd_sdr_prompts import BRD_SDR_SECTIONS, PARTIAL_VALIDATION_NOTE
+from src.prompts.registry import PROMPTS
+from src.utils.sections import (
+    merge_sections,
+    normalize_section,
+    section_number,
+    splice_sections,
+    split_sections
 )
 
 
@@ -29,47 +65,162 @@ class WorkflowState(TypedDict):
     validation_result: dict
     needs_revision: bool
     iteration_count: int
+    reused_sections: dict  # section number -> text carried over from the previous run
+    discovery_changes: list  # changed discovery fields when analysis/reasoning are reused
+    revised_sections: list  # section numbers changed by the last revision (re-validated)
+    context_stats: dict  # prompt tokens before/after context compaction, per step
+    prompt_stats: dict  # template and token counts of the prompt sent, per step
+    metrics: dict  # wall time, tokens, cache hits, retries and cost per node (set at the end)
+
+
+GENERATION_MODES = ("single", "sections")
+VALIDATION_MODES = ("text", "structured")
+REVISION_MODES = ("document", "sections")
+
+# Characters of a step's main input used as its reference retrieval query
+RETRIEVAL_QUERY_CHARS = 2000
 
 
 class BRDSDRWorkflow:
     """LangGraph workflow for Discovery → BRD/SDR generation with reasoning"""
 
-    def __init__(self, api_key: str = None, model: str = None):
+    def __init__(self, api_key: str = None, model: str = None, llm=None,
+                 cache: LLMCache = None, checkpoint_path: str = None,
+                 generation_mode: str = "single", snapshot_dir: str = None,
+                 validation_mode: str = "text", revision_mode: str = "document",
+                 compact_context: bool = False, doc_index: DocumentIndex = None,
+                 retrieval_k: int = 4, metrics_path: str = None):
         """
         Initialize the workflow
 
         Args:
             api_key: OpenAI API key (if None, will use OPENAI_API_KEY env var)
             model: OpenAI model to use (if None, will use OPENAI_MODEL env var or default to gpt-4o)
+            llm: Chat model to use instead of ChatOpenAI (e.g. a local stand-in);
+                must provide invoke/ainvoke, and bind() for per-run overrides
+            cache: LLM response cache (if None, one is opened at LLM_CACHE_PATH when
+                that env var is set)
+            checkpoint_path: SQLite file to persist the state after every node, so a
+                failed run can be continued with resume() (if None, uses the
+                CHECKPOINT_PATH env var; checkpointing is off when neither is set)
+            generation_mode: "single" renders the whole BRD/SDR in one LLM call;
+                "sections" renders each section concurrently and merges them in
+                canonical order, so generation takes as long as the slowest section
+            snapshot_dir: Directory where run_incremental() keeps the last input and
+                outputs per project (if None, uses SNAPSHOT_DIR or .cache/snapshots)
+            validation_mode: "text" scrapes the score from free-form LLM feedback;
+                "structured" runs local rule checks first (skipping the LLM when they
+                are decisive) and otherwise asks the LLM for a typed JSON report
+            revision_mode: "document" rewrites the whole draft once; "sections"
+                rewrites only the sections flagged by validation, splices them back and
+                loops back to validation, which re-checks just those sections (up to two
+                revisions). Falls back to a whole-document rewrite when validation did
+                not name any sections.
+            compact_context: Embed a compact canonical discovery document and
+                condensed analysis/reasoning in later prompts instead of the full
+                text; token counts before/after are recorded in state["context_stats"]
+            doc_index: Index of the base-docs reference material (see
+                src/core/doc_index.py); the analyze, reason and generate steps append
+                the retrieval_k chunks most relevant to them to their prompt (if None,
+                one is opened at DOC_INDEX_PATH when that env var is set)
+            retrieval_k: Reference chunks retrieved per step
+            metrics_path: JSON lines file every finished run appends its per-node
+                metrics to (if None, uses the METRICS_PATH env var; off when neither is
+                set). METRICS_PORT serves the aggregated metrics at /metrics on that port.
         """
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            raise ValueError("OPENAI_API_KEY must be provided or set in environment")
+        if generation_mode not in GENERATION_MODES:
+            raise ValueError(f"generation_mode must be one of {GENERATION_MODES}")
+        self.generation_mode = generation_mode
+        if validation_mode not in VALIDATION_MODES:
+            raise ValueError(f"validation_mode must be one of {VALIDATION_MODES}")
+        self.validation_mode = validation_mode
+        if revision_mode not in REVISION_MODES:
+            raise ValueError(f"revision_mode must be one of {REVISION_MODES}")
+        self.revision_mode = revision_mode
+        self.compact_context = compact_context
+        self.snapshot_dir = snapshot_dir or os.getenv("SNAPSHOT_DIR", ".cache/snapshots")
 
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o")
+        self.temperature = 0.3  # Lower temperature for more consistent output
+        self.max_tokens = 8000
 
-        self.llm = ChatOpenAI(
-            api_key=self.api_key,
-            model=self.model,
-            temperature=0.3,  # Lower temperature for more consistent output
-            max_tokens=8000
-        )
+        if llm is not None:
+            self.api_key = api_key
+            self.llm = llm
+        else:
+            self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+            if not self.api_key:
+                raise ValueError("OPENAI_API_KEY must be provided or set in environment")
+
+            # Shared per settings, on the process-wide connection pool
+            self.llm = chat_model(self.api_key, self.model, self.temperature, self.max_tokens)
+
+        if cache is None and os.getenv("LLM_CACHE_PATH"):
+            cache = LLMCache(
+                os.getenv("LLM_CACHE_PATH"),
+                bypass=os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+            )
+        self.cache = cache
+
+        if doc_index is None and os.getenv("DOC_INDEX_PATH"):
+            doc_index = open_doc_index(os.getenv("DOC_INDEX_PATH"))
+        self.doc_index = doc_index
+        self.retrieval_k = retrieval_k
 
-        # Build the graph
-        self.workflow = self._build_graph()
+        self.metrics_path = metrics_path or os.getenv("METRICS_PATH")
+        if os.getenv("METRICS_PORT"):
+            start_metrics_server(int(os.getenv("METRICS_PORT")))
 
-    def _build_graph(self) -> StateGraph:
-        """Build the LangGraph workflow"""
+        self.checkpoint_path = checkpoint_path or os.getenv("CHECKPOINT_PATH")
+        self.checkpointer = None
+        if self.checkpoint_path:
+            directory = os.path.dirname(self.checkpoint_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.checkpointer = SqliteSaver(
+                sqlite3.connect(self.checkpoint_path, check_same_thread=False)
+            )
+
+        # Build the graphs (blocking nodes for run(), coroutine nodes for arun()).
+        # The async checkpointer is bound to an event loop, so when checkpointing is
+        # enabled the async graph is compiled once per event loop with its own saver.
+        self.workflow = self._build_graph(checkpointer=self.checkpointer)
+        self.async_workflow = self._build_graph(asynchronous=True)
+        self._loop_graphs = {}  # event loop -> (holder, graph)
+
+    def _build_graph(self, asynchronous: bool = False, checkpointer=None) -> StateGraph:
+        """
+        Build the LangGraph workflow
+
+        Args:
+            asynchronous: Use the coroutine node implementations (for ainvoke)
+            checkpointer: LangGraph checkpoint saver that persists the state after
+                each node (None to disable checkpointing)
+        """
 
         # Create the graph
         workflow = StateGraph(WorkflowState)
 
         # Add nodes
-        workflow.add_node("analyze", self._analyze_discovery)
-        workflow.add_node("reason", self._reason_solution_design)
-        workflow.add_node("generate", self._generate_brd_sdr)
-        workflow.add_node("validate", self._validate_document)
-        workflow.add_node("revise", self._revise_document)
+        if asynchronous:
+            nodes = {
+                "analyze": self._aanalyze_discovery,
+                "reason": self._areason_solution_design,
+                "generate": self._agenerate_brd_sdr,
+                "validate": self._avalidate_document,
+                "revise": self._arevise_document
+            }
+        else:
+            nodes = {
+                "analyze": self._analyze_discovery,
+                "reason": self._reason_solution_design,
+                "generate": self._generate_brd_sdr,
+                "validate": self._validate_document,
+                "revise": self._revise_document
+            }
+        # Timed per node, with the LLM calls made inside attributed to it
+        for name, function in nodes.items():
+            workflow.add_node(name, instrument_node(name, function))
 
         # Define the flow
         workflow.set_entry_point("analyze")
@@ -86,74 +237,410 @@ class BRDSDRWorkflow:
                 "end": END
             }
         )
-        workflow.add_edge("revise", END)
+        if self.revision_mode == "sections":
+            workflow.add_edge("revise", "validate")
+        else:
+            workflow.add_edge("revise", END)
 
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
+
+    # ------------------------------------------------------------------
+    # LLM access
+    # ------------------------------------------------------------------
+
+    def _llm_settings(self) -> dict:
+        """
+        Model, temperature and max_tokens of the current run: the overrides passed to
+        run() and friends (carried in config["configurable"]) over the workflow defaults
+        """
+        try:
+            configurable = get_config().get("configurable", {})
+        except RuntimeError:  # called outside a graph run
+            configurable = {}
+        return {setting: configurable.get(setting, getattr(self, setting))
+                for setting in LLM_SETTINGS}
+
+    def _chat_model(self, settings: dict):
+        """The shared chat model, bound to the run's settings where they differ"""
+        changed = {k: v for k, v in settings.items() if v != getattr(self, k)}
+        return self.llm.bind(**changed) if changed else self.llm
+
+    def _cache_key(self, prompt: str, settings: dict) -> str:
+        return LLMCache.make_key(prompt, settings["model"], settings["temperature"],
+                                 settings["max_tokens"])
+
+    @staticmethod
+    def _record_call(settings: dict, prompt: str, content: str, usage: dict = None) -> None:
+        """Record a model call in the run metrics, estimating tokens the model did not report"""
+        model = settings["model"]
+        if usage:
+            record_llm_call(model, usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+        else:
+            record_llm_call(model, count_tokens(prompt, model), count_tokens(content, model))
+
+    def _invoke_llm(self, prompt: str) -> str:
+        """Send a single-message prompt to the LLM and return the response text"""
+        settings = self._llm_settings()
+        if self.cache is not None:
+            key = self._cache_key(prompt, settings)
+            cached = self.cache.get(key)
+            if cached is not None:
+                record_cache_hit()
+                return cached
+
+        response = self._chat_model(settings).invoke([HumanMessage(content=prompt)])
+        self._record_call(settings, prompt, response.content,
+                          getattr(response, "usage_metadata", None))
+
+        if self.cache is not None:
+            self.cache.set(key, response.content)
+        return response.content
+
+    async def _ainvoke_llm(self, prompt: str) -> str:
+        """Async variant of _invoke_llm"""
+        settings = self._llm_settings()
+        if self.cache is not None:
+            key = self._cache_key(prompt, settings)
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                record_cache_hit()
+                return cached
+
+        response = await self._chat_model(settings).ainvoke([HumanMessage(content=prompt)])
+        self._record_call(settings, prompt, response.content,
+                          getattr(response, "usage_metadata", None))
+
+        if self.cache is not None:
+            await self.cache.aset(key, response.content)
+        return response.content
+
+    async def _astream_llm(self, prompt: str, node: str, writer: StreamWriter) -> str:
+        """
+        Stream the LLM response, emitting each chunk as a LangGraph custom stream event
+
+        Args:
+            prompt: Rendered prompt
+            node: Name of the graph node the chunks belong to
+            writer: Stream writer injected into the calling node by LangGraph
+
+        A cache hit is emitted as a single chunk.
+        """
+        settings = self._llm_settings()
+        if self.cache is not None:
+            key = self._cache_key(prompt, settings)
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                record_cache_hit()
+                writer({"event": "token", "node": node, "text": cached})
+                return cached
+
+        parts = []
+        usage = None  # reported on the last chunk by models that support it
+        async for chunk in self._chat_model(settings).astream([HumanMessage(content=prompt)]):
+            if chunk.content:
+                parts.append(chunk.content)
+                writer({"event": "token", "node": node, "text": chunk.content})
+            usage = getattr(chunk, "usage_metadata", None) or usage
+        content = "".join(parts)
+        self._record_call(settings, prompt, content, usage)
+
+        if self.cache is not None:
+            await self.cache.aset(key, content)
+        return content
+
+    @staticmethod
+    def _thread_map(function: Callable, items: list) -> list:
+        """
+        Call function on every item in its own thread, in order
+
+        Each call runs in a copy of the caller's context, so the run config (and with
+        it the per-run LLM settings) stays visible in the worker threads.
+        """
+        with ThreadPoolExecutor(max_workers=len(items)) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, function, item)
+                       for item in items]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _stream_tokens(config: RunnableConfig) -> bool:
+        """Whether the caller asked for token streaming (see astream())"""
+        return bool(config.get("configurable", {}).get("stream_tokens"))
+
+    def _compact(self, field: str, value: str, model: str) -> str:
+        """Compact one prompt field; fields other than the shared context pass through"""
+        if field == "discovery_content":
+            return compact_discovery(value)
+        if field in SUMMARY_TOKEN_BUDGETS:
+            return summarize_output(value, SUMMARY_TOKEN_BUDGETS[field], model)
+        return value
+
+    def _render(self, state: WorkflowState, step: str, name: str, **fields) -> str:
+        """
+        Render a registered prompt (see src/prompts/registry.py), compacting the shared
+        context if enabled
+
+        The template name and token counts of the prompt are recorded under
+        state["prompt_stats"][step]. With compaction on, the token count of the full
+        and the compacted prompt is recorded under state["context_stats"][step].
+        """
+        model = self._llm_settings()["model"]
+        if self.compact_context:
+            full_prompt = PROMPTS.get(name).render(**fields)
+            fields = {k: self._compact(k, v, model) for k, v in fields.items()}
+
+        prompt, stats = PROMPTS.render(name, model, **fields)
+        state.setdefault("prompt_stats", {})[step] = stats
+
+        if self.compact_context:
+            state.setdefault("context_stats", {})[step] = {
+                "tokens_before": count_tokens(full_prompt, model),
+                "tokens_after": count_tokens(prompt, model)
+            }
+        return prompt
+
+    def _with_reference(self, state: WorkflowState, step: str, prompt: str, query: str) -> str:
+        """
+        Append the reference chunks most relevant to query to a rendered prompt
+
+        The retrieval time and the tokens added are recorded in state["prompt_stats"][step]
+        (as retrieval_ms and reference_tokens, also counted in tokens).
+        """
+        if self.doc_index is None or self.retrieval_k <= 0:
+            return prompt
+
+        start = time.perf_counter()
+        reference = self.doc_index.context(query[:RETRIEVAL_QUERY_CHARS], self.retrieval_k)
+        stats = state["prompt_stats"][step]
+        stats["retrieval_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        if not reference:
+            return prompt
+
+        note, note_stats = PROMPTS.render("reference", self._llm_settings()["model"],
+                                          reference=reference)
+        stats["reference_tokens"] = note_stats["tokens"]
+        stats["tokens"] += note_stats["tokens"]
+        return prompt + note
+
+    # ------------------------------------------------------------------
+    # Step 1: Analysis
+    # ------------------------------------------------------------------
+
+    def _analysis_prompt(self, state: WorkflowState) -> str:
+        prompt = self._render(
+            state, "analyze", "analysis",
+            discovery_content=state["discovery_content"]
+        )
+        return self._with_reference(state, "analyze", prompt, state["discovery_content"])
+
+    def _apply_analysis(self, state: WorkflowState, content: str) -> WorkflowState:
+        state["analysis"] = content
+
+        print(f"✓ Analysis complete ({len(content)} chars)")
+        return state
+
+    def _reuse_step(self, state: WorkflowState, label: str) -> WorkflowState:
+        print(f"♻️  Reusing {label} from the previous run")
+        return state
 
     def _analyze_discovery(self, state: WorkflowState) -> WorkflowState:
         """Step 1: Analyze the discovery document"""
+        if state["analysis"]:
+            return self._reuse_step(state, "analysis")
         print("📊 Step 1: Analyzing discovery document...")
 
-        prompt = ANALYSIS_PROMPT.format(
+        content = self._invoke_llm(self._analysis_prompt(state))
+        return self._apply_analysis(state, content)
+
+    async def _aanalyze_discovery(self, state: WorkflowState) -> WorkflowState:
+        """Step 1 (async): Analyze the discovery document"""
+        if state["analysis"]:
+            return self._reuse_step(state, "analysis")
+        print("📊 Step 1: Analyzing discovery document...")
+
+        content = await self._ainvoke_llm(self._analysis_prompt(state))
+        return self._apply_analysis(state, content)
+
+    # ------------------------------------------------------------------
+    # Step 2: Reasoning
+    # ------------------------------------------------------------------
+
+    def _reasoning_prompt(self, state: WorkflowState) -> str:
+        prompt = self._render(
+            state, "reason", "reasoning",
+            analysis=state["analysis"],
             discovery_content=state["discovery_content"]
         )
+        return self._with_reference(state, "reason", prompt, state["analysis"])
 
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        state["analysis"] = response.content
+    def _apply_reasoning(self, state: WorkflowState, content: str) -> WorkflowState:
+        state["reasoning"] = content
 
-        print(f"✓ Analysis complete ({len(response.content)} chars)")
+        print(f"✓ Reasoning complete ({len(content)} chars)")
         return state
 
     def _reason_solution_design(self, state: WorkflowState) -> WorkflowState:
         """Step 2: Apply Chain-of-Thought reasoning to design the solution"""
+        if state["reasoning"]:
+            return self._reuse_step(state, "reasoning")
         print("🧠 Step 2: Reasoning through solution design...")
 
-        prompt = REASONING_PROMPT.format(
+        content = self._invoke_llm(self._reasoning_prompt(state))
+        return self._apply_reasoning(state, content)
+
+    async def _areason_solution_design(self, state: WorkflowState) -> WorkflowState:
+        """Step 2 (async): Apply Chain-of-Thought reasoning to design the solution"""
+        if state["reasoning"]:
+            return self._reuse_step(state, "reasoning")
+        print("🧠 Step 2: Reasoning through solution design...")
+
+        content = await self._ainvoke_llm(self._reasoning_prompt(state))
+        return self._apply_reasoning(state, content)
+
+    # ------------------------------------------------------------------
+    # Step 3: Generation
+    # ------------------------------------------------------------------
+
+    def _generation_prompt(self, state: WorkflowState) -> str:
+        prompt = self._render(
+            state, "generate", "generation",
+            discovery_content=state["discovery_content"],
             analysis=state["analysis"],
-            discovery_content=state["discovery_content"]
+            reasoning=state["reasoning"]
         )
+        return self._with_reference(state, "generate", prompt, state["reasoning"])
 
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        state["reasoning"] = response.content
+    def _section_prompt(self, state: WorkflowState, title: str, instructions: str) -> str:
+        """
+        Prompt for one BRD/SDR section, sharing the analysis/reasoning context
 
-        print(f"✓ Reasoning complete ({len(response.content)} chars)")
+        Reference material is retrieved for the section's own title and instructions.
+        """
+        step = f"generate.{section_number(title)}"
+        prompt = self._render(
+            state, step, "section",
+            discovery_content=state["discovery_content"],
+            analysis=state["analysis"],
+            reasoning=state["reasoning"],
+            section_list="\n".join(f"## {t}" for t, _ in BRD_SDR_SECTIONS),
+            section_title=title,
+            section_instructions=instructions
+        )
+        prompt = self._with_reference(state, step, prompt, f"{title}\n{instructions}")
+        if state.get("discovery_changes"):
+            prompt += PROMPTS.get("section_changes").render(
+                changed_fields=", ".join(state["discovery_changes"])
+            )
+        return prompt
+
+    def _section_text(self, state: WorkflowState, title: str, instructions: str) -> str:
+        """Return a section carried over from the previous run, or generate it"""
+        reused = state.get("reused_sections", {}).get(section_number(title))
+        if reused is not None:
+            return reused
+        return self._invoke_llm(self._section_prompt(state, title, instructions))
+
+    async def _asection_text(self, state: WorkflowState, title: str, instructions: str) -> str:
+        """Async variant of _section_text"""
+        reused = state.get("reused_sections", {}).get(section_number(title))
+        if reused is not None:
+            return reused
+        return await self._ainvoke_llm(self._section_prompt(state, title, instructions))
+
+    def _generate_sections(self, state: WorkflowState) -> str:
+        """Render every section concurrently (threads) and merge in canonical order"""
+        texts = self._thread_map(lambda section: self._section_text(state, *section),
+                                 BRD_SDR_SECTIONS)
+        return merge_sections([title for title, _ in BRD_SDR_SECTIONS], texts)
+
+    async def _agenerate_sections(self, state: WorkflowState, writer: StreamWriter = None) -> str:
+        """
+        Render every section concurrently and merge in canonical order
+
+        When a writer is given, each section is emitted as soon as it and all the
+        sections before it are done, so the streamed text is already in final order.
+        """
+        titles = [title for title, _ in BRD_SDR_SECTIONS]
+        tasks = [
+            asyncio.ensure_future(self._asection_text(state, title, instructions))
+            for title, instructions in BRD_SDR_SECTIONS
+        ]
+
+        if writer is None:
+            texts = await asyncio.gather(*tasks)
+            return merge_sections(titles, texts)
+
+        texts = []
+        try:
+            for index, (title, task) in enumerate(zip(titles, tasks)):
+                text = normalize_section(title, await task)
+                writer({
+                    "event": "token",
+                    "node": "generate",
+                    "text": text if index == 0 else "\n\n" + text
+                })
+                texts.append(text)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return "\n\n".join(texts)
+
+    def _apply_generation(self, state: WorkflowState, content: str) -> WorkflowState:
+        state["brd_sdr_draft"] = content
+
+        print(f"✓ BRD/SDR draft generated ({len(content)} chars)")
         return state
 
     def _generate_brd_sdr(self, state: WorkflowState) -> WorkflowState:
         """Step 3: Generate the BRD/SDR document"""
         print("📝 Step 3: Generating BRD/SDR document...")
 
-        prompt = BRD_SDR_GENERATION_PROMPT.format(
-            discovery_content=state["discovery_content"],
-            analysis=state["analysis"],
-            reasoning=state["reasoning"]
-        )
+        if self.generation_mode == "sections" or state.get("reused_sections"):
+            content = self._generate_sections(state)
+        else:
+            content = self._invoke_llm(self._generation_prompt(state))
+        return self._apply_generation(state, content)
 
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        state["brd_sdr_draft"] = response.content
+    async def _agenerate_brd_sdr(self, state: WorkflowState, config: RunnableConfig,
+                                 writer: StreamWriter) -> WorkflowState:
+        """Step 3 (async): Generate the BRD/SDR document"""
+        print("📝 Step 3: Generating BRD/SDR document...")
 
-        print(f"✓ BRD/SDR draft generated ({len(response.content)} chars)")
-        return state
+        stream = self._stream_tokens(config)
+        if self.generation_mode == "sections" or state.get("reused_sections"):
+            content = await self._agenerate_sections(state, writer if stream else None)
+        elif stream:
+            content = await self._astream_llm(self._generation_prompt(state), "generate", writer)
+        else:
+            content = await self._ainvoke_llm(self._generation_prompt(state))
+        return self._apply_generation(state, content)
 
-    def _validate_document(self, state: WorkflowState) -> WorkflowState:
-        """Step 4: Validate the generated document"""
-        print("🔍 Step 4: Validating BRD/SDR document...")
+    # ------------------------------------------------------------------
+    # Step 4: Validation
+    # ------------------------------------------------------------------
 
-        prompt = VALIDATION_PROMPT.format(
-            discovery_content=state["discovery_content"],
-            brd_sdr=state["brd_sdr_draft"]
-        )
+    def _validation_target(self, state: WorkflowState) -> str:
+        """The draft to review: only the revised sections after a section-level revision"""
+        revised = state.get("revised_sections")
+        if not revised:
+            return state["brd_sdr_draft"]
 
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+        sections = split_sections(state["brd_sdr_draft"])
+        return PARTIAL_VALIDATION_NOTE + "\n\n".join(
+            sections[number] for number in revised if number in sections
+        )
 
-        # Try to extract quality score and issues
-        validation_text = response.content
+    def _validation_prompt(self, state: WorkflowState) -> str:
+        return self._render(
+            state, "validate", "validation",
+            discovery_content=state["discovery_content"],
+            brd_sdr=self._validation_target(state)
+        )
 
+    def _apply_validation(self, state: WorkflowState, validation_text: str) -> WorkflowState:
         # Simple parsing (in production, would use structured output)
         quality_score = 8  # Default
         if "quality score" in validation_text.lower():
             # Extract score if present
-            import re
             score_match = re.search(r'quality score[:\s]+(\d+)', validation_text.lower())
             if score_match:
                 quality_score = int(score_match.group(1))
@@ -177,49 +664,193 @@ class BRDSDRWorkflow:
 
         return state
 
+    def _structured_validation_prompt(self, state: WorkflowState) -> str:
+        return self._render(
+            state, "validate", "structured_validation",
+            discovery_content=state["discovery_content"],
+            brd_sdr=self._validation_target(state)
+        )
+
+    def _prevalidate(self, state: WorkflowState) -> ValidationReport:
+        """Rule-based pre-validation; returns a report only when the rules are decisive"""
+        report = prevalidate(state["brd_sdr_draft"], [title for title, _ in BRD_SDR_SECTIONS])
+        if report is not None:
+            print("⚡ Rule-based checks were decisive; skipping LLM validation")
+        return report
+
+    def _apply_report(self, state: WorkflowState, report: ValidationReport,
+                      validation_text: str) -> WorkflowState:
+        """Record a structured report, falling back to text parsing if it is missing"""
+        if report is None:
+            print("⚠️  Could not parse structured validation; falling back to text parsing")
+            return self._apply_validation(state, validation_text)
+
+        state["validation_result"] = {
+            "score": report.score,
+            "feedback": report.feedback(),
+            "issues": [issue.model_dump() for issue in report.issues],
+            "sections_affected": report.sections_affected,
+            "source": report.source
+        }
+        state["needs_revision"] = report.score < 8 and state["iteration_count"] < 2
+
+        print(f"✓ Validation complete (score: {report.score}/10, "
+              f"{len(report.issues)} issues, via {report.source})")
+
+        if not state["needs_revision"]:
+            state["brd_sdr_final"] = state["brd_sdr_draft"]
+
+        return state
+
+    def _validate_document(self, state: WorkflowState) -> WorkflowState:
+        """Step 4: Validate the generated document"""
+        print("🔍 Step 4: Validating BRD/SDR document...")
+
+        if self.validation_mode == "structured":
+            report = self._prevalidate(state)
+            if report is not None:
+                return self._apply_report(state, report, "")
+            validation_text = self._invoke_llm(self._structured_validation_prompt(state))
+            return self._apply_report(state, parse_validation_report(validation_text),
+                                      validation_text)
+
+        validation_text = self._invoke_llm(self._validation_prompt(state))
+        return self._apply_validation(state, validation_text)
+
+    async def _avalidate_document(self, state: WorkflowState) -> WorkflowState:
+        """Step 4 (async): Validate the generated document"""
+        print("🔍 Step 4: Validating BRD/SDR document...")
+
+        if self.validation_mode == "structured":
+            report = self._prevalidate(state)
+            if report is not None:
+                return self._apply_report(state, report, "")
+            validation_text = await self._ainvoke_llm(self._structured_validation_prompt(state))
+            return self._apply_report(state, parse_validation_report(validation_text),
+                                      validation_text)
+
+        validation_text = await self._ainvoke_llm(self._validation_prompt(state))
+        return self._apply_validation(state, validation_text)
+
+    # ------------------------------------------------------------------
+    # Step 5: Revision
+    # ------------------------------------------------------------------
+
+    def _revision_prompt(self, state: WorkflowState) -> str:
+        return self._render(
+            state, "revise", "revision",
+            brd_sdr=state["brd_sdr_draft"],
+            feedback=state["validation_result"]["feedback"]
+        )
+
+    def _apply_revision(self, state: WorkflowState, content: str) -> WorkflowState:
+        state["brd_sdr_final"] = content
+        if self.revision_mode == "sections":
+            # Whole-document fallback: the rewrite goes back through validation
+            state["brd_sdr_draft"] = content
+            state["revised_sections"] = []
+
+        print(f"✓ Revision complete (iteration {state['iteration_count']})")
+        return state
+
+    def _revision_targets(self, state: WorkflowState) -> list:
+        """
+        Return (section number, prompt) for every section flagged by validation
+
+        Flagged sections that are missing from the draft are generated from scratch.
+        """
+        validation_result = state["validation_result"]
+        affected = validation_result.get("sections_affected") or []
+        sections = split_sections(state["brd_sdr_draft"])
+
+        targets = []
+        for title, instructions in BRD_SDR_SECTIONS:
+            number = section_number(title)
+            if number not in affected:
+                continue
+
+            if number not in sections:
+                targets.append((number, self._section_prompt(state, title, instructions)))
+                continue
+
+            issues = [
+                f"- [{issue.get('severity', 'medium')}] {issue['description']}"
+                for issue in validation_result.get("issues", [])
+                if issue.get("section") in (number, "")
+            ]
+            targets.append((number, self._render(
+                state, f"revise.{number}", "section_revision",
+                section_text=sections[number],
+                issues="\n".join(issues) or "- See the review summary",
+                summary=validation_result.get("feedback", "")
+            )))
+        return targets
+
+    def _apply_section_revision(self, state: WorkflowState, revised: dict) -> WorkflowState:
+        """Splice revised sections (number -> text) back into the draft"""
+        titles = {section_number(title): title for title, _ in BRD_SDR_SECTIONS}
+        replacements = {
+            number: normalize_section(titles[number], text) for number, text in revised.items()
+        }
+        state["brd_sdr_draft"] = splice_sections(state["brd_sdr_draft"], replacements)
+        state["revised_sections"] = sorted(revised, key=int)
+
+        print(f"✓ Revised sections {', '.join(state['revised_sections'])} "
+              f"(iteration {state['iteration_count']})")
+        return state
+
     def _revise_document(self, state: WorkflowState) -> WorkflowState:
         """Step 5: Revise the document based on validation feedback"""
         print("✏️  Step 5: Revising document based on feedback...")
 
         state["iteration_count"] += 1
 
-        revision_prompt = f"""
-        Revise the following BRD/SDR document based on the validation feedback.
+        targets = self._revision_targets(state) if self.revision_mode == "sections" else []
+        if targets:
+            texts = self._thread_map(self._invoke_llm, [prompt for _, prompt in targets])
+            revised = dict(zip([number for number, _ in targets], texts))
+            return self._apply_section_revision(state, revised)
 
-        ORIGINAL DOCUMENT:
-        {state["brd_sdr_draft"]}
+        content = self._invoke_llm(self._revision_prompt(state))
+        return self._apply_revision(state, content)
 
-        VALIDATION FEEDBACK:
-        {state["validation_result"]["feedback"]}
+    async def _arevise_document(self, state: WorkflowState, config: RunnableConfig,
+                                writer: StreamWriter) -> WorkflowState:
+        """Step 5 (async): Revise the document based on validation feedback"""
+        print("✏️  Step 5: Revising document based on feedback...")
 
-        Provide an improved version addressing all the issues mentioned.
-        """
+        state["iteration_count"] += 1
 
-        response = self.llm.invoke([HumanMessage(content=revision_prompt)])
-        state["brd_sdr_final"] = response.content
+        targets = self._revision_targets(state) if self.revision_mode == "sections" else []
+        if targets:
+            texts = await asyncio.gather(
+                *(self._ainvoke_llm(prompt) for _, prompt in targets)
+            )
+            state = self._apply_section_revision(
+                state, dict(zip([number for number, _ in targets], texts))
+            )
+            if self._stream_tokens(config):
+                writer({"event": "token", "node": "revise", "text": state["brd_sdr_draft"]})
+            return state
 
-        print(f"✓ Revision complete (iteration {state['iteration_count']})")
-        return state
+        prompt = self._revision_prompt(state)
+        if self._stream_tokens(config):
+            content = await self._astream_llm(prompt, "revise", writer)
+        else:
+            content = await self._ainvoke_llm(prompt)
+        return self._apply_revision(state, content)
 
     def _should_revise(self, state: WorkflowState) -> str:
         """Determine if document needs revision"""
         return "revise" if state.get("needs_revision", False) else "end"
 
-    def run(self, discovery_content: str) -> dict:
-        """
-        Run the workflow
-
-        Args:
-            discovery_content: Discovery document content (string or dict)
-
-        Returns:
-            Final state with generated BRD/SDR
-        """
+    def _initial_state(self, discovery_content) -> WorkflowState:
+        """Build the initial graph state from a discovery document (string or dict)"""
         # Convert dict to formatted string if needed
         if isinstance(discovery_content, dict):
             discovery_content = json.dumps(discovery_content, indent=2)
 
-        initial_state = {
+        return {
             "discovery_content": discovery_content,
             "analysis": "",
             "reasoning": "",
@@ -227,12 +858,377 @@ class BRDSDRWorkflow:
             "brd_sdr_final": "",
             "validation_result": {},
             "needs_revision": False,
-            "iteration_count": 0
+            "iteration_count": 0,
+            "reused_sections": {},
+            "discovery_changes": [],
+            "revised_sections": [],
+            "context_stats": {},
+            "prompt_stats": {},
+            "metrics": {}
         }
 
+    @staticmethod
+    def _run_config(run_id: str, overrides: dict = None) -> dict:
+        return {"configurable": {"thread_id": run_id, **check_overrides(overrides)}}
+
+    def _start_run(self, run_id: str = None, overrides: dict = None):
+        """
+        Return (run_id, graph config); run_id is None unless checkpointing is on, and
+        the config is None when there is neither a checkpoint nor an override
+        """
+        overrides = check_overrides(overrides)
+        if not self.checkpoint_path:
+            return None, ({"configurable": overrides} if overrides else None)
+
+        run_id = run_id or uuid.uuid4().hex
+        print(f"💾 Checkpointing run {run_id} to {self.checkpoint_path}")
+        return run_id, self._run_config(run_id, overrides)
+
+    def _report_interrupted(self, run_id: str) -> None:
+        if run_id:
+            print(f"\n💾 Progress saved. Continue with resume('{run_id}')")
+
+    def _run_metrics(self, run_id: str, config: dict) -> RunMetrics:
+        model = ((config or {}).get("configurable") or {}).get("model", self.model)
+        return RunMetrics("brd_sdr", model, run_id)
+
+    def _finish_metrics(self, metrics: RunMetrics, final_state: dict = None,
+                        status: str = "succeeded") -> None:
+        """Export the run's metrics and attach their breakdown to the final state"""
+        data = finish_run(metrics, status, self.metrics_path)
+        print(metrics.summary())
+        if final_state is not None:
+            final_state["metrics"] = data
+
+    def run(self, discovery_content: str, run_id: str = None, overrides: dict = None) -> dict:
+        """
+        Run the workflow
+
+        Args:
+            discovery_content: Discovery document content (string or dict)
+            run_id: Checkpoint id to save progress under (generated if None);
+                ignored when checkpointing is disabled
+            overrides: Per-run LLM settings ("model", "temperature", "max_tokens") over
+                the workflow defaults; the compiled graph and chat client are reused
+
+        Returns:
+            Final state with generated BRD/SDR; state["metrics"] holds the run's timing
+            breakdown (wall time, tokens, cache hits, retries and estimated cost, in
+            total and per node)
+        """
+        return self._execute(self._initial_state(discovery_content), run_id, overrides)
+
+    def _execute(self, initial_state: WorkflowState, run_id: str = None,
+                 overrides: dict = None) -> dict:
+        run_id, config = self._start_run(run_id, overrides)
+
         print("🚀 Starting BRD/SDR generation workflow...\n")
 
-        final_state = self.workflow.invoke(initial_state)
+        metrics = self._run_metrics(run_id, config)
+        try:
+            with track_run(metrics):
+                final_state = self.workflow.invoke(initial_state, config)
+        except Exception:
+            self._finish_metrics(metrics, status="failed")
+            self._report_interrupted(run_id)
+            raise
+
+        print("\n✅ Workflow completed successfully!")
+        self._finish_metrics(metrics, final_state)
+        return final_state
+
+    def _incremental_state(self, discovery: dict, previous: dict) -> WorkflowState:
+        """
+        Build the initial state for a revised discovery document
+
+        Analysis, reasoning and the sections a change does not touch are seeded from
+        the previous run's snapshot; the graph nodes skip work that is already present.
+        """
+        initial_state = self._initial_state(discovery)
+        if previous is None:
+            print("🆕 No previous run found; generating everything")
+            return initial_state
+
+        plan = plan_regeneration(previous["discovery"], discovery)
+        print(f"🔎 Changed discovery fields: {', '.join(sorted(plan.changed_fields))}")
+        if plan.rerun_analysis:
+            print("🔁 Strategy-level change; regenerating everything")
+            return initial_state
+
+        previous_state = previous["state"]
+        document = previous_state.get("brd_sdr_final") or previous_state["brd_sdr_draft"]
+        sections = split_sections(document)
+
+        initial_state["analysis"] = previous_state["analysis"]
+        initial_state["reasoning"] = previous_state["reasoning"]
+        initial_state["discovery_changes"] = sorted(plan.changed_fields)
+        initial_state["reused_sections"] = {
+            number: text for number, text in sections.items()
+            if number not in plan.stale_sections
+        }
+        print(f"♻️  Reusing {len(initial_state['reused_sections'])} of "
+              f"{len(BRD_SDR_SECTIONS)} sections")
+        return initial_state
+
+    def run_incremental(self, discovery: dict, project_id: str, run_id: str = None,
+                        overrides: dict = None) -> dict:
+        """
+        Run the workflow, regenerating only what a revised discovery document affects
+
+        The discovery dict is diffed against the input of the last run for project_id.
+        Stages and BRD/SDR sections whose inputs are unchanged are reused from that
+        run, and the new input and outputs become the snapshot for the next call.
+
+        Args:
+            discovery: Discovery document as a dict
+            project_id: Key under which the last run is stored (e.g. the client name)
+            run_id: Checkpoint id (see run())
+            overrides: Per-run LLM settings (see run())
+
+        Returns:
+            Final state with generated BRD/SDR
+        """
+        store = RunSnapshotStore(self.snapshot_dir)
+        previous = store.load(project_id)
+        if previous is not None and previous["discovery"] == discovery:
+            print("✅ Discovery unchanged; returning the previous result")
+            return previous["state"]
+
+        final_state = self._execute(self._incremental_state(discovery, previous), run_id,
+                                    overrides)
+        store.save(project_id, {"discovery": discovery, "state": final_state})
+        return final_state
+
+    def resume(self, run_id: str, overrides: dict = None) -> dict:
+        """
+        Continue a checkpointed run from the last node that completed
+
+        Args:
+            run_id: Id of the run to resume
+            overrides: Per-run LLM settings for the remaining nodes (see run())
+
+        Returns:
+            Final state with generated BRD/SDR
+        """
+        if self.checkpointer is None:
+            raise ValueError("Checkpointing is disabled; pass checkpoint_path to resume runs")
+
+        config = self._run_config(run_id, overrides)
+        snapshot = self.workflow.get_state(config)
+        if not snapshot.values:
+            raise ValueError(f"No checkpoint found for run '{run_id}'")
+
+        if not snapshot.next:
+            print(f"✅ Run {run_id} already completed")
+            return snapshot.values
+
+        print(f"🔁 Resuming run {run_id} at '{snapshot.next[0]}'...\n")
+
+        metrics = self._run_metrics(run_id, config)
+        try:
+            with track_run(metrics):
+                final_state = self.workflow.invoke(None, config)
+        except Exception:
+            self._finish_metrics(metrics, status="failed")
+            self._report_interrupted(run_id)
+            raise
+
+        print("\n✅ Workflow completed successfully!")
+        self._finish_metrics(metrics, final_state)
+        return final_state
+
+    async def _hold_checkpointed_graph(self):
+        """
+        Async generator owning one saver connection and the graph compiled with it
+
+        Kept suspended while the graph is in use; closing it (aclose(), or the event
+        loop's shutdown_asyncgens() at the end of asyncio.run) closes the connection.
+        """
+        # Not AsyncSqliteSaver.from_conn_string: shutdown_asyncgens() would close that
+        # context manager's own generator concurrently with this one
+        connection = await aiosqlite.connect(self.checkpoint_path)
+        try:
+            yield self._build_graph(asynchronous=True,
+                                    checkpointer=AsyncSqliteSaver(connection))
+        finally:
+            await connection.close()
+
+    @asynccontextmanager
+    async def _async_graph(self):
+        """Yield the async graph; when checkpointing, the one shared by this event loop"""
+        if not self.checkpoint_path:
+            yield self.async_workflow
+            return
+
+        for closed in [loop for loop in self._loop_graphs if loop.is_closed()]:
+            del self._loop_graphs[closed]  # their holders were closed with the loop
+
+        loop = asyncio.get_running_loop()
+        entry = self._loop_graphs.get(loop)
+        if entry is None:
+            holder = self._hold_checkpointed_graph()
+            graph = await holder.__anext__()
+            entry = self._loop_graphs.setdefault(loop, (holder, graph))
+            if entry[0] is not holder:  # another run on this loop got there first
+                await holder.aclose()
+        yield entry[1]
+
+    async def aclose(self) -> None:
+        """Close the checkpoint connection the async graph holds on the running loop"""
+        entry = self._loop_graphs.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[0].aclose()
+
+    async def arun(self, discovery_content: str, run_id: str = None,
+                   overrides: dict = None) -> dict:
+        """
+        Run the workflow without blocking the event loop
+
+        Every node awaits the LLM (``ainvoke``), so many discovery documents can be
+        processed concurrently from a single event loop, e.g. with ``asyncio.gather``.
+
+        Args:
+            discovery_content: Discovery document content (string or dict)
+            run_id: Checkpoint id to save progress under (generated if None);
+                ignored when checkpointing is disabled
+            overrides: Per-run LLM settings (see run())
+
+        Returns:
+            Final state with generated BRD/SDR (same shape as run())
+        """
+        return await self._aexecute(self._initial_state(discovery_content), run_id, overrides)
+
+    async def _aexecute(self, initial_state: WorkflowState, run_id: str = None,
+                        overrides: dict = None) -> dict:
+        run_id, config = self._start_run(run_id, overrides)
+
+        print("🚀 Starting BRD/SDR generation workflow (async)...\n")
+
+        metrics = self._run_metrics(run_id, config)
+        try:
+            async with self._async_graph() as graph:
+                with track_run(metrics):
+                    final_state = await graph.ainvoke(initial_state, config)
+        except Exception:
+            self._finish_metrics(metrics, status="failed")
+            self._report_interrupted(run_id)
+            raise
 
         print("\n✅ Workflow completed successfully!")
+        self._finish_metrics(metrics, final_state)
         return final_state
+
+    async def arun_incremental(self, discovery: dict, project_id: str,
+                               run_id: str = None, overrides: dict = None) -> dict:
+        """Async variant of run_incremental()"""
+        store = RunSnapshotStore(self.snapshot_dir)
+        previous = store.load(project_id)
+        if previous is not None and previous["discovery"] == discovery:
+            print("✅ Discovery unchanged; returning the previous result")
+            return previous["state"]
+
+        final_state = await self._aexecute(
+            self._incremental_state(discovery, previous), run_id, overrides
+        )
+        store.save(project_id, {"discovery": discovery, "state": final_state})
+        return final_state
+
+    async def aresume(self, run_id: str, overrides: dict = None) -> dict:
+        """Async variant of resume()"""
+        if not self.checkpoint_path:
+            raise ValueError("Checkpointing is disabled; pass checkpoint_path to resume runs")
+
+        config = self._run_config(run_id, overrides)
+        async with self._async_graph() as graph:
+            snapshot = await graph.aget_state(config)
+            if not snapshot.values:
+                raise ValueError(f"No checkpoint found for run '{run_id}'")
+
+            if not snapshot.next:
+                print(f"✅ Run {run_id} already completed")
+                return snapshot.values
+
+            print(f"🔁 Resuming run {run_id} at '{snapshot.next[0]}'...\n")
+
+            metrics = self._run_metrics(run_id, config)
+            try:
+                with track_run(metrics):
+                    final_state = await graph.ainvoke(None, config)
+            except Exception:
+                self._finish_metrics(metrics, status="failed")
+                self._report_interrupted(run_id)
+                raise
+
+        print("\n✅ Workflow completed successfully!")
+        self._finish_metrics(metrics, final_state)
+        return final_state
+
+    async def astream(self, discovery_content: str, output_path: str = None,
+                      run_id: str = None, tokens: bool = True,
+                      overrides: dict = None) -> AsyncIterator[dict]:
+        """
+        Run the workflow, yielding BRD/SDR text as the generate and revise steps produce it
+
+        Yields dict events:
+            {"event": "token", "node": "generate" | "revise", "text": str}
+            {"event": "node_end", "node": str}      after every graph node
+            {"event": "end", "state": WorkflowState} once, with the final state (and
+                its "metrics")
+
+        Args:
+            discovery_content: Discovery document content (string or dict)
+            output_path: Markdown file the document is written to as chunks arrive;
+                it is restarted whenever a revision begins, so it always holds the
+                latest version
+            run_id: Checkpoint id (see run())
+            tokens: Stream the document text; with False only node_end and end events
+                are yielded (progress reporting) and the LLM is not called in streaming
+                mode
+            overrides: Per-run LLM settings (see run())
+        """
+        initial_state = self._initial_state(discovery_content)
+        run_id, config = self._start_run(run_id, overrides)
+        config = config or {"configurable": {}}
+        config["configurable"]["stream_tokens"] = tokens
+
+        print("🚀 Starting BRD/SDR generation workflow (streaming)...\n")
+
+        output_file = open(output_path, "w", encoding="utf-8") if output_path else None
+        restart_output = False
+        final_state = None
+        metrics = self._run_metrics(run_id, config)
+
+        try:
+            async with self._async_graph() as graph:
+                # The run is tracked in the context the graph is iterated from
+                with track_run(metrics):
+                    async for mode, payload in graph.astream(
+                        initial_state, config, stream_mode=["custom", "updates", "values"]
+                    ):
+                        if mode == "custom":
+                            if output_file is not None:
+                                if restart_output:
+                                    output_file.seek(0)
+                                    output_file.truncate()
+                                    restart_output = False
+                                output_file.write(payload["text"])
+                                output_file.flush()
+                            yield payload
+                        elif mode == "updates":
+                            for node in payload:
+                                # Any text streamed after validation is a new version
+                                restart_output = restart_output or node == "validate"
+                                yield {"event": "node_end", "node": node}
+                        else:
+                            final_state = payload
+        except Exception:
+            self._finish_metrics(metrics, status="failed")
+            self._report_interrupted(run_id)
+            raise
+        finally:
+            if output_file is not None:
+                output_file.close()
+
+        print("\n✅ Workflow completed successfully!")
+        self._finish_metrics(metrics, final_state)
+        yield {"event": "end", "state": final_state}
@@ -0,0 +1,54 @@
+"""
+Process-wide workflow factory
+
+Building a BRDSDRWorkflow compiles two LangGraph graphs and opens its cache and
+checkpoint connections. get_workflow() builds one instance per distinct set of options
+and hands the same instance to every caller and thread afterwards; the chat model behind
+it already shares the process-wide connection pool (see src/core/llm_clients.py). Runs
+do not keep state on the instance, so per-run LLM settings are passed to run() as
+overrides instead of building another workflow:
+
+    workflow = get_workflow(generation_mode="sections")
+    state = workflow.run(discovery, overrides={"model": "gpt-4o-mini", "temperature": 0})
+"""
+
+import threading
+from typing import Dict, Tuple
+
+from src.workflows.brd_sdr_workflow import BRDSDRWorkflow
+from src.workflows.sdr_workflow import SDRWorkflow
+
+
+_lock = threading.Lock()
+_workflows: Dict[Tuple, object] = {}
+
+
+def _shared(workflow_class, options: dict):
+    key = (workflow_class.__name__, tuple(sorted(options.items())))
+    workflow = _workflows.get(key)
+    if workflow is None:
+        with _lock:
+            workflow = _workflows.get(key)
+            if workflow is None:
+                workflow = _workflows[key] = workflow_class(**options)
+    return workflow
+
+
+def get_workflow(**options) -> BRDSDRWorkflow:
+    """
+    The shared BRDSDRWorkflow for these constructor options (built on first use)
+
+    Options must be hashable (pass a cache or doc_index object, not a dict).
+    """
+    return _shared(BRDSDRWorkflow, options)
+
+
+def get_sdr_workflow(**options) -> SDRWorkflow:
+    """The shared SDRWorkflow for these constructor options (built on first use)"""
+    return _shared(SDRWorkflow, options)
+
+
+def clear_workflows() -> None:
+    """Forget the shared workflows (e.g. after changing environment settings)"""
+    with _lock:
+        _workflows.clear()
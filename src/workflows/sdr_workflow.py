@@ -0,0 +1,529 @@
+"""
+LangGraph workflow for generating an SDR from BRD requirements
+
+Runs the BRD → SDR conversion of the n8n workflow in-process as a map-reduce:
+requirement rows are grouped by category into batches, the batches are mapped
+concurrently to partial SDRs (one LLM call each), and the partials are reduced into
+the {evars, props, events} structure that write_sdr_to_excel
+(n8n-cloud/v0.4/json_to_excel.py) writes to the template. The reduce step merges
+variables by Business Name and numbers them itself, so the SDR size is not bounded by
+one completion's output budget and the numbering does not depend on batch timing.
+"""
+
+import asyncio
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional, Tuple
+from typing_extensions import TypedDict
+
+from langgraph.graph import StateGraph, END
+from langchain_core.messages import HumanMessage
+
+from src.core.llm_cache import LLMCache
+from src.core.llm_clients import chat_model
+from src.core.slot_allocator import (
+    SDR_KINDS,
+    SlotAllocator,
+    SlotError,
+    merge_requirement_ids,
+    name_key
+)
+from src.processors.brd_workbook import REQUIREMENTS_SHEET, read_brd_requirements
+from src.processors.sdr_workbook import read_sdr_workbook
+from src.prompts.registry import PROMPTS
+from src.prompts.sdr_prompts import SDR_FIELDS
+
+
+# Variables every SDR starts with, in slot order:
+# (Business Name, Business Description, Expected Values, Implementation Trigger, Example Value)
+MANDATORY_VARIABLES = {
+    "evars": [
+        ("Page Name", "Name of the current page", "string, lowercase", "every page load",
+         "home"),
+        ("Site Section", "Site section of the current page", "string, lowercase",
+         "every page load", "products"),
+        ("ECID", "Experience Cloud ID of the visitor", "string", "every page load",
+         "12345678901234567890123456789012345678"),
+    ],
+    "props": [
+        ("Page Name", "Name of the current page", "string, lowercase", "every page load",
+         "home"),
+        ("Site Section", "Site section of the current page", "string, lowercase",
+         "every page load", "products"),
+        ("ECID", "Experience Cloud ID of the visitor", "string", "every page load",
+         "12345678901234567890123456789012345678"),
+    ],
+    "events": [
+        ("Custom Page View", "Counts every page view", "Counter", "every page load", "1"),
+    ],
+}
+
+
+class SDRState(TypedDict):
+    """State definition for the SDR generation workflow"""
+    client_name: str
+    requirements: list  # requirement dicts, see read_brd_requirements
+    batches: list  # requirement lists, one LLM call each
+    partial_sdrs: list  # {evars, props, events} per batch
+    existing_sdr: str  # SDR workbook whose slot numbers are kept ("" for none)
+    existing_slots: dict  # {evars, props, events} rows read from existing_sdr
+    slot_conflicts: list  # rows of existing_sdr that reuse a slot or name
+    sdr: dict  # merged {evars, props, events}
+    stats: dict
+
+
+def parse_sdr_json(text: str) -> dict:
+    """Parse an {evars, props, events} response, tolerating code fences and preamble"""
+    fenced = re.search(r"```(?:json)?\s*(\{.*\})\s*```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    else:
+        start, end = text.find("{"), text.rfind("}")
+        text = text[start:end + 1] if start != -1 and end > start else text
+
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("SDR response is not a JSON object")
+    return {key: [_normalize_row(row) for row in data.get(key) or []] for key in SDR_KINDS}
+
+
+def _normalize_row(row: dict) -> dict:
+    """Keep the SDR fields, as strings, in column order"""
+    return {
+        field: "" if row.get(field) is None else str(row.get(field)).strip()
+        for field in SDR_FIELDS
+    }
+
+
+def _row_name(row: dict) -> str:
+    """Name a variable is merged and allocated by: its Business Name"""
+    return row["Business Name"] or row["Business Description"] or row["Analytics Variable"]
+
+
+def _merge_row(kept: dict, row: dict) -> None:
+    """Add the requirement IDs of row to kept and fill fields kept leaves empty"""
+    kept["Requirement ID"] = merge_requirement_ids(kept["Requirement ID"], row["Requirement ID"])
+    for field in SDR_FIELDS:
+        if not kept[field] and row[field]:
+            kept[field] = row[field]
+
+
+def reduce_sdrs(partials: List[dict],
+                allocator: SlotAllocator = None) -> Tuple[dict, dict, dict]:
+    """
+    Reduce partial SDRs into one with deterministic slot numbers
+
+    Variables with the same Business Name are merged. The mandatory variables take
+    their fixed slots, then every other variable gets the lowest free slot in order of
+    first appearance (batch order, then row order), whatever numbers the partials used.
+    Variables that find no free slot are dropped.
+
+    Args:
+        partials: {evars, props, events} per batch, in batch order
+        allocator: Slot index to allocate from, e.g. SlotAllocator.from_workbook() of
+            the production SDR so existing variables keep their numbers (default: empty)
+
+    Returns:
+        Tuple of (SDR, {kind: number of merged duplicates}, {kind: dropped Business Names})
+    """
+    allocator = allocator or SlotAllocator()
+    sdr, duplicates, overflow = {}, {}, {}
+    for key, prefix in SDR_KINDS.items():
+        rows = {}
+        mandatory = []
+        for name, description, expected, trigger, example in MANDATORY_VARIABLES[key]:
+            row = _normalize_row({
+                "Business Name": name, "Business Description": description,
+                "Expected Values": expected, "Implementation Trigger": trigger,
+                "Example Value": example
+            })
+            rows[name_key(name)] = row
+            mandatory.append(row)
+
+        duplicates[key] = 0
+        for partial in partials:
+            for row in partial.get(key, []):
+                name = name_key(_row_name(row))
+                if name in rows:
+                    _merge_row(rows[name], row)
+                    duplicates[key] += 1
+                else:
+                    rows[name] = dict(row)
+
+        for number, row in enumerate(mandatory, start=1):
+            if allocator.slot_of(key, row["Business Name"]) is None:
+                try:
+                    allocator.claim(key, number, row["Business Name"])
+                except SlotError:
+                    pass  # slot taken in an existing SDR; assigned below
+
+        numbered, overflow[key] = [], []
+        for row in rows.values():
+            try:
+                number = allocator.assign(key, _row_name(row))
+            except SlotError:
+                overflow[key].append(_row_name(row))
+                continue
+            row["Analytics Variable"] = f"{prefix}{number}"
+            numbered.append((number, row))
+        sdr[key] = [row for _, row in sorted(numbered, key=lambda item: item[0])]
+    return sdr, duplicates, overflow
+
+
+class SDRWorkflow:
+    """LangGraph workflow for BRD requirements → SDR generation"""
+
+    def __init__(self, api_key: str = None, model: str = None, llm=None,
+                 cache: LLMCache = None, batch_size: int = 20, max_concurrency: int = 4):
+        """
+        Initialize the workflow
+
+        Args:
+            api_key: OpenAI API key (if None, will use OPENAI_API_KEY env var)
+            model: OpenAI model to use (if None, will use OPENAI_MODEL env var or default to gpt-4o)
+            llm: Chat model to use instead of ChatOpenAI; must provide invoke/ainvoke
+            cache: LLM response cache (if None, one is opened at LLM_CACHE_PATH when
+                that env var is set)
+            batch_size: Maximum requirements mapped by one LLM call. Requirements are
+                grouped by category; a category larger than this is split.
+            max_concurrency: Maximum batches mapped at once
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+
+        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o")
+        self.temperature = 0.2  # same as the n8n SDR agent
+        self.max_tokens = 8000
+
+        if llm is not None:
+            self.api_key = api_key
+            self.llm = llm
+        else:
+            self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+            if not self.api_key:
+                raise ValueError("OPENAI_API_KEY must be provided or set in environment")
+
+            self.llm = chat_model(self.api_key, self.model, self.temperature, self.max_tokens)
+
+        if cache is None and os.getenv("LLM_CACHE_PATH"):
+            cache = LLMCache(
+                os.getenv("LLM_CACHE_PATH"),
+                bypass=os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+            )
+        self.cache = cache
+
+        self.workflow = self._build_graph()
+        self.async_workflow = self._build_graph(asynchronous=True)
+
+    def _build_graph(self, asynchronous: bool = False) -> StateGraph:
+        """
+        Build the LangGraph workflow
+
+        Args:
+            asynchronous: Use the coroutine node implementations (for ainvoke)
+        """
+        workflow = StateGraph(SDRState)
+
+        workflow.add_node("slots", self._load_slots)
+        workflow.add_node("batch", self._batch_requirements)
+        if asynchronous:
+            workflow.add_node("map", self._amap_batches)
+        else:
+            workflow.add_node("map", self._map_batches)
+        workflow.add_node("reduce", self._reduce_partials)
+
+        workflow.set_entry_point("slots")
+        workflow.add_edge("slots", "batch")
+        workflow.add_edge("batch", "map")
+        workflow.add_edge("map", "reduce")
+        workflow.add_edge("reduce", END)
+
+        return workflow.compile()
+
+    # ------------------------------------------------------------------
+    # LLM access
+    # ------------------------------------------------------------------
+
+    def _invoke_llm(self, prompt: str) -> str:
+        """Send a single-message prompt to the LLM and return the response text"""
+        if self.cache is not None:
+            key = LLMCache.make_key(prompt, self.model, self.temperature, self.max_tokens)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = self.llm.invoke([HumanMessage(content=prompt)])
+
+        if self.cache is not None:
+            self.cache.set(key, response.content)
+        return response.content
+
+    async def _ainvoke_llm(self, prompt: str) -> str:
+        """Async variant of _invoke_llm"""
+        if self.cache is not None:
+            key = LLMCache.make_key(prompt, self.model, self.temperature, self.max_tokens)
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+
+        if self.cache is not None:
+            await self.cache.aset(key, response.content)
+        return response.content
+
+    # ------------------------------------------------------------------
+    # Step 0: Existing slots
+    # ------------------------------------------------------------------
+
+    def _load_slots(self, state: SDRState) -> SDRState:
+        """
+        Index the slots of the existing SDR before any LLM call
+
+        An unreadable workbook fails the run here, before the map step is paid for.
+        Conflicting rows in the workbook are reported, not raised (see
+        SlotAllocator.from_sdr).
+        """
+        state["existing_slots"], state["slot_conflicts"] = {}, []
+        if not state.get("existing_sdr"):
+            return state
+
+        state["existing_slots"] = read_sdr_workbook(state["existing_sdr"])
+        state["slot_conflicts"] = SlotAllocator.from_sdr(state["existing_slots"]).conflicts
+        print(f"🔢 Reconciling slots with {state['existing_sdr']}")
+        for conflict in state["slot_conflicts"]:
+            print(f"⚠️  Existing SDR: {conflict}")
+        return state
+
+    # ------------------------------------------------------------------
+    # Step 1: Batching
+    # ------------------------------------------------------------------
+
+    def _batch_requirements(self, state: SDRState) -> SDRState:
+        """Group requirements by category and pack the groups into batches"""
+        print("📦 Batching requirements...")
+
+        groups = {}
+        for requirement in state["requirements"]:
+            groups.setdefault(requirement.get("category") or "General", []).append(requirement)
+
+        batches, current = [], []
+        for group in groups.values():
+            for start in range(0, len(group), self.batch_size):
+                chunk = group[start:start + self.batch_size]
+                if current and len(current) + len(chunk) > self.batch_size:
+                    batches.append(current)
+                    current = []
+                current = current + chunk
+        if current:
+            batches.append(current)
+
+        state["batches"] = batches
+        print(f"✓ {len(state['requirements'])} requirements in {len(batches)} batches")
+        return state
+
+    # ------------------------------------------------------------------
+    # Step 2: Mapping
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _format_requirements(batch: list) -> str:
+        lines = []
+        for requirement in batch:
+            lines.append(f"[{requirement['id']}] ({requirement.get('category', '')}) "
+                         f"{requirement.get('requirement', '')}")
+            if requirement.get("notes"):
+                lines.append(f"    Notes: {requirement['notes']}")
+        return "\n".join(lines)
+
+    def _mapping_prompt(self, state: SDRState, batch: list) -> str:
+        prompt, _ = PROMPTS.render(
+            "sdr_mapping", self.model,
+            client_name=state.get("client_name") or "(not specified)",
+            requirement_count=len(batch),
+            total_requirements=len(state["requirements"]),
+            requirements=self._format_requirements(batch)
+        )
+        return prompt
+
+    @staticmethod
+    def _parse_partial(content: str, index: int) -> dict:
+        try:
+            return parse_sdr_json(content)
+        except ValueError as e:
+            raise ValueError(f"Batch {index + 1} did not return valid SDR JSON: {e}") from e
+
+    def _map_batch(self, state: SDRState, index: int) -> dict:
+        batch = state["batches"][index]
+        partial = self._parse_partial(self._invoke_llm(self._mapping_prompt(state, batch)), index)
+        print(f"   ✓ Batch {index + 1}/{len(state['batches'])} ({len(batch)} requirements)")
+        return partial
+
+    async def _amap_batch(self, state: SDRState, index: int,
+                          semaphore: asyncio.Semaphore) -> dict:
+        batch = state["batches"][index]
+        async with semaphore:
+            content = await self._ainvoke_llm(self._mapping_prompt(state, batch))
+        partial = self._parse_partial(content, index)
+        print(f"   ✓ Batch {index + 1}/{len(state['batches'])} ({len(batch)} requirements)")
+        return partial
+
+    def _map_batches(self, state: SDRState) -> SDRState:
+        """Map the batches concurrently (threads); partials are kept in batch order"""
+        print(f"🧭 Mapping {len(state['batches'])} batches to SDR variables...")
+
+        workers = max(1, min(self.max_concurrency, len(state["batches"])))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            state["partial_sdrs"] = list(executor.map(
+                lambda index: self._map_batch(state, index), range(len(state["batches"]))
+            ))
+        return state
+
+    async def _amap_batches(self, state: SDRState) -> SDRState:
+        """Async variant of _map_batches"""
+        print(f"🧭 Mapping {len(state['batches'])} batches to SDR variables...")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        state["partial_sdrs"] = list(await asyncio.gather(
+            *(self._amap_batch(state, index, semaphore)
+              for index in range(len(state["batches"])))
+        ))
+        return state
+
+    # ------------------------------------------------------------------
+    # Step 3: Reduce
+    # ------------------------------------------------------------------
+
+    def _reduce_partials(self, state: SDRState) -> SDRState:
+        """Reduce the partial SDRs and report requirements no variable covers"""
+        allocator = None
+        if state.get("existing_slots"):
+            allocator = SlotAllocator.from_sdr(state["existing_slots"])
+        sdr, duplicates, overflow = reduce_sdrs(state["partial_sdrs"], allocator)
+
+        covered = {
+            requirement_id.strip()
+            for key in SDR_KINDS for row in sdr[key]
+            for requirement_id in row["Requirement ID"].split(",")
+        }
+        unmapped = [r["id"] for r in state["requirements"] if r["id"] not in covered]
+
+        state["sdr"] = sdr
+        state["stats"] = {key: len(rows) for key, rows in sdr.items()}
+        state["stats"].update(
+            batches=len(state["batches"]),
+            duplicates_merged=duplicates,
+            overflow=overflow,
+            unmapped_requirements=unmapped,
+            existing_sdr_conflicts=state.get("slot_conflicts", [])
+        )
+
+        print(f"✓ SDR complete: {state['stats']['evars']} eVars, {state['stats']['props']} props, "
+              f"{state['stats']['events']} events "
+              f"({sum(duplicates.values())} duplicates merged)")
+        for key, names in overflow.items():
+            if names:
+                print(f"⚠️  {len(names)} {key} dropped, no free slot: "
+                      f"{', '.join(names)}")
+        if unmapped:
+            print(f"⚠️  Requirements without a variable: {', '.join(unmapped)}")
+        return state
+
+    # ------------------------------------------------------------------
+    # Entry points
+    # ------------------------------------------------------------------
+
+    def _initial_state(self, requirements: list, client_name: str,
+                       existing_sdr: Optional[str]) -> SDRState:
+        return {
+            "client_name": client_name or "",
+            "requirements": list(requirements),
+            "batches": [],
+            "partial_sdrs": [],
+            "existing_sdr": existing_sdr or "",
+            "existing_slots": {},
+            "slot_conflicts": [],
+            "sdr": {},
+            "stats": {}
+        }
+
+    def run(self, requirements: list, client_name: str = "",
+            existing_sdr: Optional[str] = None) -> dict:
+        """
+        Generate an SDR from BRD requirements
+
+        Args:
+            requirements: Requirement dicts with id, category, requirement and notes
+                (see read_brd_requirements)
+            client_name: Client name used in the prompt
+            existing_sdr: SDR workbook of the report suite; its variables keep their
+                slots and new variables take free ones
+
+        Returns:
+            Final workflow state; state["sdr"] holds {evars, props, events}
+        """
+        print("=" * 80)
+        print("🚀 Starting SDR Generation Workflow")
+        print("=" * 80)
+
+        final_state = self.workflow.invoke(
+            self._initial_state(requirements, client_name, existing_sdr)
+        )
+
+        print("=" * 80)
+        print("✅ Workflow Complete!")
+        print("=" * 80)
+
+        return final_state
+
+    async def arun(self, requirements: list, client_name: str = "",
+                   existing_sdr: Optional[str] = None) -> dict:
+        """Async variant of run()"""
+        print("=" * 80)
+        print("🚀 Starting SDR Generation Workflow (async)")
+        print("=" * 80)
+
+        final_state = await self.async_workflow.ainvoke(
+            self._initial_state(requirements, client_name, existing_sdr)
+        )
+
+        print("=" * 80)
+        print("✅ Workflow Complete!")
+        print("=" * 80)
+
+        return final_state
+
+    async def astream(self, requirements: list, client_name: str = "",
+                      existing_sdr: Optional[str] = None) -> AsyncIterator[dict]:
+        """
+        Run the workflow asynchronously, reporting each graph node as it completes
+
+        Yields dict events:
+            {"event": "node_end", "node": str}    after every graph node
+            {"event": "end", "state": SDRState}   once, with the final state
+        """
+        final_state = None
+        async for mode, payload in self.async_workflow.astream(
+            self._initial_state(requirements, client_name, existing_sdr),
+            stream_mode=["updates", "values"]
+        ):
+            if mode == "updates":
+                for node in payload:
+                    yield {"event": "node_end", "node": node}
+            else:
+                final_state = payload
+        yield {"event": "end", "state": final_state}
+
+    def run_workbook(self, path: str, client_name: str = "",
+                     sheet_name: Optional[str] = None,
+                     existing_sdr: Optional[str] = None) -> dict:
+        """Generate an SDR from the requirements sheet of a BRD workbook"""
+        requirements = read_brd_requirements(path, sheet_name or REQUIREMENTS_SHEET)
+        print(f"📂 Read {len(requirements)} requirements from {path}")
+        return self.run(requirements, client_name, existing_sdr)